@@ -2,11 +2,15 @@
 Rotas da API REST
 """
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Any
+import json
 import logging
 
 from app.models import FactCheckRequest, FactCheckResponse, ErrorResponse
 from app.services.factcheck_service import factcheck_service
+from app.services.llm_client import LLMUnavailableError
+from app.services.llm_scheduler import LLMOverloadedError
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +72,10 @@ async def check_facts(request: FactCheckRequest):
             detail=str(e)
         )
     
+    except (LLMOverloadedError, LLMUnavailableError) as e:
+        logger.warning(f"⏳ LLM sobrecarregado ou indisponível: {e}")
+        raise llm_error_exception(e)
+    
     except NotImplementedError as e:
         logger.error(f"Funcionalidade não implementada: {e}")
         raise HTTPException(
@@ -83,6 +91,107 @@ async def check_facts(request: FactCheckRequest):
         )
 
 
+@router.post(
+    "/factcheck/stream",
+    status_code=status.HTTP_200_OK,
+    tags=["Fact-Checking"],
+    summary="Verificar fatos com resultados progressivos (SSE)",
+    description="""
+    Realiza a mesma verificação de `/factcheck`, mas responde com
+    Server-Sent Events (`text/event-stream`) à medida que cada etapa conclui:
+    
+    - **red_flags**: sinais de alerta detectados localmente (imediato)
+    - **claim**: cada afirmação assim que a análise do Gemini a produz
+    - **source**: cada fonte externa encontrada
+    - **result**: resposta completa (mesmo formato de `/factcheck`)
+    - **error**: erro que interrompeu a verificação
+    """
+)
+async def check_facts_stream(request: FactCheckRequest):
+    """
+    Endpoint de fact-checking em streaming (SSE)
+    
+    Args:
+        request: Requisição com conteúdo a ser verificado
+        
+    Returns:
+        Stream de eventos SSE
+    """
+    logger.info(f"📥 Nova requisição de fact-checking (streaming): {request.content_type}")
+    
+    if not request.content or len(request.content.strip()) < 10:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Conteúdo muito curto ou vazio. Mínimo de 10 caracteres."
+        )
+    
+    async def event_stream():
+        try:
+            async for event in factcheck_service.check_content_stream(request):
+                yield _format_sse(event["event"], event["data"])
+        except ValueError as e:
+            logger.error(f"Erro de validação: {e}")
+            yield _format_sse("error", {"error": str(e), "status_code": 400})
+        except (LLMOverloadedError, LLMUnavailableError) as e:
+            logger.warning(f"⏳ LLM sobrecarregado ou indisponível: {e}")
+            http_error = llm_error_exception(e)
+            yield _format_sse("error", {
+                "error": http_error.detail,
+                "status_code": http_error.status_code,
+                "retry_after": int(e.retry_after)
+            })
+        except Exception as e:
+            logger.error(f"Erro interno: {e}", exc_info=True)
+            yield _format_sse("error", {
+                "error": "Erro ao processar requisição. Tente novamente.",
+                "status_code": 500
+            })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def llm_error_exception(error: Exception) -> HTTPException:
+    """
+    Converte erros de capacidade do LLM em resposta HTTP com Retry-After
+    
+    Args:
+        error: LLMOverloadedError (429) ou LLMUnavailableError (503)
+        
+    Returns:
+        HTTPException com cabeçalho Retry-After
+    """
+    if isinstance(error, LLMOverloadedError):
+        status_code = status.HTTP_429_TOO_MANY_REQUESTS
+        detail = "Serviço sobrecarregado. Tente novamente em instantes."
+    else:
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        detail = "Serviço de análise temporariamente indisponível. Tente novamente em instantes."
+    
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(int(getattr(error, "retry_after", 1)))}
+    )
+
+
+def _format_sse(event: str, data: Any) -> str:
+    """
+    Formata um evento no padrão Server-Sent Events
+    
+    Args:
+        event: Tipo do evento
+        data: Conteúdo serializável em JSON
+        
+    Returns:
+        Evento SSE
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.post(
     "/factcheck/quick",
     response_model=FactCheckResponse,
@@ -207,6 +316,7 @@ async def get_api_info():
         "endpoints": {
             "factcheck": "/api/factcheck",
             "quick_check": "/api/factcheck/quick",
+            "stream": "/api/factcheck/stream",
             "trusted_sources": "/api/sources/trusted",
             "health": "/health",
             "docs": "/docs"
@@ -10,7 +10,10 @@ from typing import Optional
 
 from app.models import FactCheckResponse, ContentType
 from app.services.factcheck_service import factcheck_service
+from app.services.llm_client import LLMUnavailableError
+from app.services.llm_scheduler import LLMOverloadedError
 from app.models import FactCheckRequest
+from app.api.routes import llm_error_exception
 
 logger = logging.getLogger(__name__)
 
@@ -120,6 +123,9 @@ async def factcheck_upload(
         
     except HTTPException:
         raise
+    except (LLMOverloadedError, LLMUnavailableError) as e:
+        logger.warning(f"⏳ LLM sobrecarregado ou indisponível: {e}")
+        raise llm_error_exception(e)
     except Exception as e:
         logger.error(f"❌ Erro ao processar upload: {e}", exc_info=True)
         raise HTTPException(
@@ -14,9 +14,51 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     ALLOWED_ORIGINS: str = "http://localhost:4200,http://localhost:3000"
     
+    # Provedor de LLM: "gemini" ou "fake" (simulado, para testes de carga offline)
+    LLM_PROVIDER: str = "gemini"
+    FAKE_LLM_LATENCY_MS: float = 400.0
+    FAKE_LLM_LATENCY_DISTRIBUTION: str = "lognormal"
+    FAKE_LLM_LATENCY_SPREAD: float = 0.5
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_QUOTA_ERROR_RATE: float = 0.0
+    FAKE_LLM_SEED: int = 42
+    
     # Gemini API
     GEMINI_API_KEY: str = ""
     GEMINI_MODEL: str = "gemini-2.0-flash-exp"
+    GEMINI_VISION_MODEL: str = "gemini-2.0-flash-exp"
+    
+    # Cascata de modelos: modelo rápido primeiro, principal só para resultados incertos
+    MODEL_CASCADE_ENABLED: bool = False
+    GEMINI_FAST_MODEL: str = "gemini-2.0-flash-lite"
+    CASCADE_UNCERTAIN_MIN: float = 0.35
+    CASCADE_UNCERTAIN_MAX: float = 0.65
+    CASCADE_MIN_CLAIM_CONFIDENCE: float = 0.6
+    
+    # Saída JSON restrita a schema e novas tentativas em respostas inválidas
+    GEMINI_JSON_MODE: bool = True
+    LLM_PARSE_RETRIES: int = 1
+    
+    # Escalonador do LLM: concorrência, cota por minuto (0 = sem limite) e fila
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_REQUESTS_PER_MINUTE: int = 1000
+    LLM_TOKENS_PER_MINUTE: int = 1000000
+    LLM_MAX_QUEUE_SIZE: int = 256
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    LLM_ESTIMATED_OUTPUT_TOKENS: int = 1024
+    
+    # Resiliência do LLM: prazos, novas tentativas, hedging e circuit breaker
+    LLM_TIMEOUT_SECONDS: float = 20.0
+    LLM_DEADLINE_SECONDS: float = 45.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BACKOFF_SECONDS: float = 0.5
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGING_MIN_SAMPLES: int = 20
+    LLM_CIRCUIT_FAILURE_RATE: float = 0.5
+    LLM_CIRCUIT_MIN_CALLS: int = 10
+    LLM_CIRCUIT_WINDOW_SECONDS: float = 60.0
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+    LLM_DEGRADE_TO_HEURISTICS: bool = True
     
     # Google Search API (opcional)
     GOOGLE_SEARCH_API_KEY: str = ""
@@ -25,6 +67,108 @@ class Settings(BaseSettings):
     # News API (opcional)
     NEWS_API_KEY: str = ""
     
+    # Google Fact Check Tools API (opcional)
+    GOOGLE_FACTCHECK_API_KEY: str = ""
+    
+    # Busca paralela nos provedores
+    SEARCH_TIMEOUT_SECONDS: float = 8.0
+    SEARCH_MIN_RELEVANCE: float = 0.7
+    
+    # Cache de buscas por provedor (economiza cota das APIs pagas)
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL_SECONDS: float = 3600.0
+    SEARCH_CACHE_STALE_SECONDS: float = 21600.0
+    SEARCH_CACHE_NEGATIVE_TTL_SECONDS: float = 120.0
+    SEARCH_CACHE_MAX_ITEMS: int = 4096
+    
+    # Registro de credibilidade de domínios (recarregado quando o arquivo muda)
+    CREDIBILITY_REGISTRY_PATH: str = "app/data/credibility_domains.txt"
+    CREDIBILITY_REGISTRY_RELOAD_SECONDS: float = 60.0
+    
+    # Índice local de checagens publicadas (BM25): cobertura mínima para responder
+    # direto com a checagem ou apenas citá-la como fonte
+    FACTCHECK_INDEX_ENABLED: bool = True
+    FACTCHECK_INDEX_PATH: str = "data/factchecks.db"
+    FACTCHECK_INDEX_MATCH_THRESHOLD: float = 0.8
+    FACTCHECK_INDEX_CITE_THRESHOLD: float = 0.5
+    FACTCHECK_INDEX_MAX_CITATIONS: int = 3
+    
+    # Cache de resultados de fact-checking
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_PATH: str = "data/factcheck_cache.db"
+    RESULT_CACHE_TTL_SECONDS: int = 86400
+    RESULT_CACHE_MAX_ITEMS: int = 1024
+    
+    # Cache de páginas baixadas (texto extraído + ETag/Last-Modified)
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_PATH: str = "data/pages.db"
+    PAGE_CACHE_TTL_SECONDS: float = 3600.0
+    PAGE_CACHE_MAX_AGE_SECONDS: float = 604800.0
+    PAGE_CACHE_MAX_ITEMS: int = 512
+    
+    # Índice de quase-duplicatas (MinHash + LSH)
+    NEAR_DUPLICATE_ENABLED: bool = True
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8
+    NEAR_DUPLICATE_NUM_PERM: int = 64
+    NEAR_DUPLICATE_BANDS: int = 16
+    NEAR_DUPLICATE_SHINGLE_SIZE: int = 3
+    NEAR_DUPLICATE_MAX_ITEMS: int = 200000
+    
+    # Repositório de afirmações já verificadas
+    CLAIM_STORE_ENABLED: bool = True
+    CLAIM_STORE_PATH: str = "data/claims.db"
+    CLAIM_STORE_TTL_SECONDS: int = 604800
+    CLAIM_STORE_MIN_CONFIDENCE: float = 0.7
+    CLAIM_STORE_SEMANTIC_MATCHING: bool = False
+    CLAIM_STORE_SIMILARITY_THRESHOLD: float = 0.85
+    
+    # Índice vetorial de afirmações (vizinho mais próximo por embeddings)
+    CLAIM_VECTOR_INDEX_ENABLED: bool = False
+    CLAIM_VECTOR_INDEX_PATH: str = "data/claim_vectors.f32"
+    CLAIM_VECTOR_INDEX_THRESHOLD: float = 0.95
+    CLAIM_VECTOR_INDEX_IVF_MIN_VECTORS: int = 50000
+    CLAIM_VECTOR_INDEX_NPROBE: int = 8
+    EMBEDDING_BACKEND: str = "hashing"
+    EMBEDDING_MODEL: str = "paraphrase-multilingual-MiniLM-L12-v2"
+    EMBEDDING_DIM: int = 256
+    
+    # Análise de conteúdo longo em trechos paralelos (map-reduce)
+    CHUNKED_ANALYSIS_ENABLED: bool = True
+    CHUNK_MAX_TOKENS: int = 3000
+    CHUNK_MAX_COUNT: int = 12
+    URL_CONTENT_MAX_CHARS: int = 50000
+    URL_CONTENT_MAX_BYTES: int = 2000000
+    URL_HEAD_PREFETCH_ENABLED: bool = True
+    URL_HEAD_MAX_BYTES: int = 262144
+    
+    # Micro-batching de textos curtos numa única chamada ao Gemini (opt-in)
+    MICRO_BATCH_ENABLED: bool = False
+    MICRO_BATCH_MAX_SIZE: int = 8
+    MICRO_BATCH_MAX_WAIT_MS: int = 20
+    MICRO_BATCH_MAX_CHARS: int = 500
+    
+    # Verificação de cada afirmação em paralelo com evidências da busca
+    CLAIM_VERIFICATION_ENABLED: bool = True
+    CLAIM_VERIFICATION_MAX_CLAIMS: int = 8
+    CLAIM_VERIFICATION_SOURCES: int = 3
+    CLAIM_VERIFICATION_TIMEOUT_SECONDS: float = 15.0
+    
+    # Verificação de consistência interna em paralelo com a análise (chamada extra ao LLM)
+    CONSISTENCY_CHECK_ENABLED: bool = False
+    
+    # Orçamento de tempo por requisição (deadline_ms): tempo mínimo restante para cada etapa
+    DEADLINE_MIN_STRONG_MODEL_SECONDS: float = 6.0
+    DEADLINE_MIN_CONSISTENCY_SECONDS: float = 8.0
+    DEADLINE_MIN_VERIFICATION_SECONDS: float = 2.0
+    DEADLINE_RESPONSE_RESERVE_SECONDS: float = 0.2
+    
+    # Pool HTTP compartilhado (buscas, páginas e downloads)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP2_ENABLED: bool = True
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
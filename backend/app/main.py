@@ -11,6 +11,9 @@ from app.config import settings
 from app.models import HealthResponse, ErrorResponse
 from app.api.routes import router as api_router
 from app.api.upload_routes import router as upload_router
+from app.services.http_pool import http_pool
+from app.services.llm_client import llm_client
+from app.utils.metrics import metrics
 
 # Configurar logging
 logging.basicConfig(
@@ -28,14 +31,19 @@ async def lifespan(app: FastAPI):
     logger.info(f"🔧 Debug mode: {settings.DEBUG}")
     
     # Verificar configurações essenciais
-    if not settings.GEMINI_API_KEY:
+    if settings.LLM_PROVIDER != "gemini":
+        logger.warning(f"🧪 Provedor de LLM: {settings.LLM_PROVIDER}")
+    elif not settings.GEMINI_API_KEY:
         logger.warning("⚠️  GEMINI_API_KEY não configurada!")
     else:
         logger.info("✅ Gemini API configurada")
     
+    await http_pool.start()
+    
     yield
     
     logger.info("👋 Encerrando FactCheck Backend API...")
+    await http_pool.close()
 
 
 # Criar aplicação FastAPI
@@ -76,9 +84,11 @@ async def root():
 async def health_check():
     """Health check da API"""
     services = {
-        "gemini": bool(settings.GEMINI_API_KEY),
+        "gemini": llm_client.provider.name == "gemini" and llm_client.available,
+        "llm": llm_client.available,
         "google_search": bool(settings.GOOGLE_SEARCH_API_KEY),
-        "news_api": bool(settings.NEWS_API_KEY)
+        "news_api": bool(settings.NEWS_API_KEY),
+        "factcheck_tools": bool(settings.GOOGLE_FACTCHECK_API_KEY)
     }
     
     return HealthResponse(
@@ -88,6 +98,12 @@ async def health_check():
     )
 
 
+@app.get("/metrics", tags=["Health"])
+async def get_metrics():
+    """Métricas internas do processo (contadores, gauges e histogramas)"""
+    return metrics.snapshot()
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handler para exceções HTTP"""
@@ -96,7 +112,8 @@ async def http_exception_handler(request, exc):
         content=ErrorResponse(
             error=exc.detail,
             detail=str(exc)
-        ).model_dump()
+        ).model_dump(mode="json"),
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -109,7 +126,7 @@ async def general_exception_handler(request, exc):
         content=ErrorResponse(
             error="Erro interno do servidor",
             detail=str(exc) if settings.DEBUG else None
-        ).model_dump()
+        ).model_dump(mode="json")
     )
 
 
@@ -30,6 +30,10 @@ class FactCheckRequest(BaseModel):
     content_type: ContentType = Field(default=ContentType.TEXT, description="Tipo de conteúdo")
     check_sources: bool = Field(default=True, description="Se deve buscar fontes externas")
     language: str = Field(default="pt", description="Idioma do conteúdo (pt, en, es, etc)")
+    deadline_ms: Optional[int] = Field(
+        default=None, ge=100, le=120000,
+        description="Prazo total em milissegundos; etapas são reduzidas ou puladas para cumpri-lo"
+    )
     
     class Config:
         json_schema_extra = {
@@ -37,7 +41,8 @@ class FactCheckRequest(BaseModel):
                 "content": "O Brasil é o maior produtor de café do mundo.",
                 "content_type": "text",
                 "check_sources": True,
-                "language": "pt"
+                "language": "pt",
+                "deadline_ms": None
             }
         }
 
@@ -72,6 +77,14 @@ class FactCheckResponse(BaseModel):
     red_flags: List[str] = Field(default_factory=list, description="Sinais de alerta encontrados")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Timestamp da verificação")
     processing_time: float = Field(..., description="Tempo de processamento em segundos")
+    cached: bool = Field(default=False, description="Se o resultado veio do cache")
+    cache_age_seconds: Optional[float] = Field(None, description="Idade do veredito em cache (segundos)")
+    cache_similarity: Optional[float] = Field(None, description="Similaridade com o conteúdo em cache (1.0 = idêntico)")
+    degraded: bool = Field(default=False, description="Se o resultado usa apenas heurísticas locais (IA indisponível)")
+    degraded_stages: List[str] = Field(
+        default_factory=list,
+        description="Etapas puladas ou reduzidas para cumprir o deadline_ms (analysis, sources, consistency)"
+    )
     
     class Config:
         json_schema_extra = {
@@ -93,7 +106,12 @@ class FactCheckResponse(BaseModel):
                 "sources_checked": [],
                 "red_flags": [],
                 "timestamp": "2025-10-17T12:00:00",
-                "processing_time": 2.5
+                "processing_time": 2.5,
+                "cached": False,
+                "cache_age_seconds": None,
+                "cache_similarity": None,
+                "degraded": False,
+                "degraded_stages": []
             }
         }
 
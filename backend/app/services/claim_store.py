@@ -0,0 +1,333 @@
+"""
+Repositório de afirmações já verificadas, reaproveitadas entre documentos
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.services.dedup_index import NearDuplicateIndex
+from app.services.embeddings import create_embedder
+from app.services.preprocessing import preprocessing_service
+from app.services.vector_index import VectorIndex
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Veredictos que não vale a pena reaproveitar
+_UNRESOLVED_VERACITY = {"nao verificavel", "unverifiable", "desconhecido"}
+
+
+class ClaimStore:
+    """
+    Vereditos por afirmação, indexados pelo idioma e pelo texto normalizado
+    (um veredito em português não responde a uma verificação em inglês).
+
+    Opcionalmente usa um índice MinHash para casar afirmações com pequenas
+    variações de redação (casamento semântico aproximado) e um índice
+    vetorial com os vereditos fundamentados em evidências para casar
+    paráfrases ("vacina tem chip" / "chip nas vacinas").
+    """
+
+    def __init__(
+        self,
+        path: str = settings.CLAIM_STORE_PATH,
+        ttl: float = settings.CLAIM_STORE_TTL_SECONDS,
+        min_confidence: float = settings.CLAIM_STORE_MIN_CONFIDENCE,
+        semantic_matching: bool = settings.CLAIM_STORE_SEMANTIC_MATCHING,
+        similarity_threshold: float = settings.CLAIM_STORE_SIMILARITY_THRESHOLD,
+        vector_matching: bool = settings.CLAIM_VECTOR_INDEX_ENABLED,
+        vector_path: str = settings.CLAIM_VECTOR_INDEX_PATH
+    ):
+        """
+        Inicializa o repositório
+
+        Args:
+            path: Caminho do arquivo SQLite
+            ttl: Validade de um veredito em segundos
+            min_confidence: Confiança mínima para guardar um veredito
+            semantic_matching: Se deve casar afirmações parecidas (MinHash)
+            similarity_threshold: Jaccard mínimo para o casamento aproximado
+            vector_matching: Se deve casar paráfrases pelo índice vetorial
+            vector_path: Arquivo da matriz de embeddings do índice vetorial
+        """
+        self.path = path
+        self.ttl = ttl
+        self.min_confidence = min_confidence
+        self._memory = TTLCache(max_items=4096, ttl=ttl)
+        self._similar: Optional[NearDuplicateIndex] = None
+        self._vectors: Optional[VectorIndex] = None
+
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._init_db()
+        except Exception as e:
+            logger.error(f"Erro ao inicializar repositório de afirmações ({path}): {e}")
+            self.path = None
+
+        if semantic_matching:
+            self._similar = NearDuplicateIndex(
+                shingle_size=2,
+                threshold=similarity_threshold,
+                path=self.path,
+                table="claim_signatures"
+            )
+
+        if vector_matching:
+            self._vectors = VectorIndex(create_embedder(), path=vector_path, db_path=self.path)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normaliza o texto de uma afirmação
+
+        Args:
+            text: Texto da afirmação
+
+        Returns:
+            Texto normalizado usado como chave
+        """
+        return preprocessing_service.normalize_for_matching(text)
+
+    @staticmethod
+    def _key(normalized: str, language: str) -> str:
+        """Chave hexadecimal (sha256) do idioma e do texto normalizado"""
+        return hashlib.sha256(f"{language}\n{normalized}".encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre uma conexão com o banco"""
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self) -> None:
+        """Cria a tabela de afirmações se necessário"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS claims (
+                    key TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    veracity TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    explanation TEXT NOT NULL,
+                    sources TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    async def lookup_many(
+        self,
+        texts: List[str],
+        language: str,
+        grounded_only: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Busca vereditos para várias afirmações
+
+        Args:
+            texts: Textos das afirmações
+            language: Idioma do conteúdo
+            grounded_only: Se deve considerar só vereditos com fontes
+
+        Returns:
+            Lista alinhada com `texts` contendo o veredito ou None
+        """
+        def usable(record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            return record if record and (record["sources"] or not grounded_only) else None
+
+        keys = [self._key(self.normalize(text), language) for text in texts]
+        results: List[Optional[Dict[str, Any]]] = [usable(self._memory.get(key)) for key in keys]
+
+        missing = [key for key, result in zip(keys, results) if result is None]
+        if missing and self.path:
+            try:
+                found = await asyncio.to_thread(self._db_get_many, missing)
+            except Exception as e:
+                logger.error(f"Erro ao consultar repositório de afirmações: {e}")
+                found = {}
+
+            for i, key in enumerate(keys):
+                if results[i] is None and key in found:
+                    results[i] = usable(found[key])
+                    self._memory.set(key, found[key])
+
+        # Casamento aproximado para o que não bateu exatamente
+        if self._similar is not None:
+            for i, text in enumerate(texts):
+                if results[i] is not None:
+                    continue
+                match = await self._similar.find(self.normalize(text), language)
+                if match:
+                    similar = await self._get_by_keys([match[0]])
+                    results[i] = usable(similar.get(match[0]))
+
+        # Paráfrases: vizinho mais próximo no índice vetorial (só vereditos com fontes)
+        pending = [i for i, result in enumerate(results) if result is None]
+        if self._vectors is not None and pending:
+            matches = await self._vectors.search_many([texts[i] for i in pending], language)
+            found = await self._get_by_keys([match[0] for match in matches if match])
+            for i, match in zip(pending, matches):
+                if match:
+                    results[i] = usable(found.get(match[0]))
+
+        return results
+
+    async def _get_by_keys(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Busca vereditos pelas chaves
+
+        Args:
+            keys: Chaves das afirmações
+
+        Returns:
+            Dicionário chave -> veredito
+        """
+        found = {key: self._memory.get(key) for key in keys}
+        found = {key: value for key, value in found.items() if value is not None}
+
+        missing = [key for key in keys if key not in found]
+        if missing and self.path:
+            try:
+                found.update(await asyncio.to_thread(self._db_get_many, missing))
+            except Exception as e:
+                logger.error(f"Erro ao consultar repositório de afirmações: {e}")
+
+        return found
+
+    async def save(self, claims: List[Dict[str, Any]], language: str) -> int:
+        """
+        Guarda os vereditos confiáveis de uma análise
+
+        Args:
+            claims: Afirmações no formato retornado pelo Gemini
+            language: Idioma do conteúdo
+
+        Returns:
+            Número de afirmações guardadas
+        """
+        rows = []
+        for claim in claims:
+            text = (claim.get("text") or "").strip()
+            normalized = self.normalize(text)
+            veracity = claim.get("veracity") or ""
+            try:
+                confidence = float(claim.get("confidence", 0))
+            except (TypeError, ValueError):
+                continue
+
+            if (
+                not normalized
+                or confidence < self.min_confidence
+                or self.normalize(veracity) in _UNRESOLVED_VERACITY
+            ):
+                continue
+
+            record = {
+                "text": text,
+                "veracity": veracity,
+                "confidence": confidence,
+                "explanation": claim.get("explanation", ""),
+                "sources": [
+                    source.model_dump() if hasattr(source, "model_dump") else source
+                    for source in claim.get("sources", [])
+                ],
+            }
+            rows.append((self._key(normalized, language), normalized, record, language))
+
+        # Um veredito sem fontes (só da análise) não substitui um fundamentado
+        unsourced = [key for key, _, record, _ in rows if not record["sources"]]
+        if unsourced:
+            existing = await self._get_by_keys(unsourced)
+            rows = [
+                row for row in rows
+                if row[2]["sources"] or not existing.get(row[0], {}).get("sources")
+            ]
+
+        if not rows:
+            return 0
+
+        for key, _, record, _ in rows:
+            self._memory.set(key, record)
+
+        if self.path:
+            try:
+                await asyncio.to_thread(self._db_save, rows)
+            except Exception as e:
+                logger.error(f"Erro ao gravar repositório de afirmações: {e}")
+
+        if self._similar is not None:
+            for key, normalized, _, _ in rows:
+                await self._similar.add(normalized, key, language)
+
+        if self._vectors is not None:
+            await self._vectors.add_many([
+                (key, record["text"]) for key, _, record, _ in rows if record["sources"]
+            ], language)
+
+        return len(rows)
+
+    def _db_get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Lê vereditos válidos do SQLite"""
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" for _ in keys)
+            rows = conn.execute(
+                "SELECT key, text, veracity, confidence, explanation, sources, updated_at "
+                f"FROM claims WHERE key IN ({placeholders})",
+                keys
+            ).fetchall()
+        finally:
+            conn.close()
+
+        now = time.time()
+        return {
+            row[0]: {
+                "text": row[1],
+                "veracity": row[2],
+                "confidence": row[3],
+                "explanation": row[4],
+                "sources": json.loads(row[5]),
+            }
+            for row in rows
+            if now - row[6] <= self.ttl
+        }
+
+    def _db_save(self, rows: List[tuple]) -> None:
+        """Grava vereditos no SQLite"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO claims "
+                "(key, text, veracity, confidence, explanation, sources, language, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        key, record["text"], record["veracity"], record["confidence"],
+                        record["explanation"], json.dumps(record["sources"]),
+                        language, now
+                    )
+                    for key, _, record, language in rows
+                ]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# Instância global do repositório
+claim_store = ClaimStore()
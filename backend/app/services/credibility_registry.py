@@ -0,0 +1,138 @@
+"""
+Registro de credibilidade de domínios (arquivo recarregável sem reinício)
+"""
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from app.config import settings
+from app.utils.domain_trie import DomainTrie
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+RATINGS = ("high", "medium", "low")
+
+
+class CredibilityRegistry:
+    """
+    Credibilidade das fontes pelo domínio.
+
+    Lê um arquivo com uma linha "<domínio> <high|medium|low>" por domínio
+    ("*.sufixo" para os sites hospedados sob um sufixo público) e compila
+    tudo numa `DomainTrie`. O arquivo é verificado a cada
+    `reload_interval` segundos e, se mudou, recompilado em segundo plano;
+    as consultas continuam usando a versão anterior até a troca.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.CREDIBILITY_REGISTRY_PATH,
+        reload_interval: float = settings.CREDIBILITY_REGISTRY_RELOAD_SECONDS
+    ):
+        """
+        Inicializa o registro e carrega o arquivo
+
+        Args:
+            path: Caminho do arquivo de domínios
+            reload_interval: Intervalo entre verificações do arquivo (0 = não recarregar)
+        """
+        self.path = path
+        self.reload_interval = reload_interval
+        self._trie = DomainTrie()
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._reloading = False
+        self.reload()
+
+    def rate(self, url: str, default: str = "medium") -> str:
+        """
+        Avalia a credibilidade de uma fonte pelo domínio
+
+        Args:
+            url: URL da fonte
+            default: Nível para domínios fora do registro
+
+        Returns:
+            Nível de credibilidade (high, medium, low)
+        """
+        self._check_for_changes()
+        if not url:
+            return default
+        return self._trie.lookup(url) or default
+
+    def reload(self) -> int:
+        """
+        Recompila o registro a partir do arquivo
+
+        Em caso de erro a versão anterior é mantida.
+
+        Returns:
+            Número de domínios carregados
+        """
+        with self._lock:
+            started = time.monotonic()
+            try:
+                mtime = os.path.getmtime(self.path)
+                trie = self._compile()
+            except Exception as e:
+                logger.error(f"Erro ao carregar registro de credibilidade ({self.path}): {e}")
+                return len(self._trie)
+
+            self._trie = trie
+            self._mtime = mtime
+            metrics.set_gauge("credibility_registry_domains", len(trie))
+            metrics.observe("credibility_registry_load_seconds", time.monotonic() - started)
+            logger.info(f"🏛️ Registro de credibilidade carregado: {len(trie)} domínios")
+            return len(trie)
+
+    def _compile(self) -> DomainTrie:
+        """Lê o arquivo linha a linha e monta a trie"""
+        trie = DomainTrie()
+        with open(self.path, encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                parts = line.split()
+                if len(parts) != 2 or parts[1].lower() not in RATINGS:
+                    logger.warning(f"⚠️ Linha {number} ignorada no registro de credibilidade: {line}")
+                    continue
+                try:
+                    trie.insert(parts[0].lower(), parts[1].lower())
+                except ValueError as e:
+                    logger.warning(f"⚠️ Linha {number} ignorada no registro de credibilidade: {e}")
+        return trie
+
+    def _check_for_changes(self) -> None:
+        """Dispara a recarga em segundo plano se o arquivo mudou"""
+        if not self.reload_interval or time.monotonic() < self._next_check:
+            return
+        self._next_check = time.monotonic() + self.reload_interval
+
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime or self._reloading:
+            return
+
+        self._reloading = True
+        threading.Thread(target=self._background_reload, daemon=True).start()
+
+    def _background_reload(self) -> None:
+        """Recarga fora do event loop (arquivos grandes levam alguns segundos)"""
+        try:
+            self.reload()
+        finally:
+            self._reloading = False
+
+    def __len__(self) -> int:
+        return len(self._trie)
+
+
+# Instância global do registro
+credibility_registry = CredibilityRegistry()
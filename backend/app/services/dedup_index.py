@@ -0,0 +1,388 @@
+"""
+Índice de quase-duplicatas (MinHash + LSH) sobre conteúdos já verificados
+"""
+import asyncio
+import logging
+import os
+import random
+import re
+import sqlite3
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Primo de Mersenne usado nas permutações do MinHash
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = 0xFFFFFFFF
+# Fração de max_items entre limpezas das assinaturas antigas no SQLite
+_PRUNE_FRACTION = 0.1
+
+
+def _mod_mersenne(values: np.ndarray, scratch: np.ndarray) -> np.ndarray:
+    """Resto da divisão por 2^61 - 1 de inteiros sem sinal de 64 bits (no lugar)"""
+    prime = np.uint64(_MERSENNE_PRIME)
+    np.right_shift(values, np.uint64(61), out=scratch)
+    np.bitwise_and(values, prime, out=values)
+    values += scratch
+    np.subtract(values, prime, out=values, where=values >= prime)
+    return values
+
+
+class NearDuplicateIndex:
+    """
+    Índice MinHash com LSH por bandas.
+
+    As assinaturas têm largura fixa e ficam num único `array('I')`; as chaves
+    ficam num `bytearray` de 32 bytes por entrada. Cada banda mapeia o hash
+    das suas linhas para os ids das entradas (o próprio id quando o bucket
+    tem uma entrada só, o caso comum), então a consulta só compara a
+    assinatura com os candidatos que colidiram em alguma banda.
+
+    As permutações são calculadas com NumPy (aritmética exata módulo
+    2^61 - 1) e fora do event loop. O índice guarda no máximo `max_items`
+    entradas num buffer circular: ao encher, cada nova entrada ocupa a
+    posição da mais antiga, que sai dos seus buckets (custo O(bands)).
+    """
+
+    def __init__(
+        self,
+        num_perm: int = settings.NEAR_DUPLICATE_NUM_PERM,
+        bands: int = settings.NEAR_DUPLICATE_BANDS,
+        shingle_size: int = settings.NEAR_DUPLICATE_SHINGLE_SIZE,
+        threshold: float = settings.NEAR_DUPLICATE_THRESHOLD,
+        path: Optional[str] = settings.RESULT_CACHE_PATH,
+        table: str = "near_duplicate_signatures",
+        max_items: int = settings.NEAR_DUPLICATE_MAX_ITEMS,
+        enabled: bool = True
+    ):
+        """
+        Inicializa o índice
+
+        Args:
+            num_perm: Número de permutações (largura da assinatura)
+            bands: Número de bandas do LSH (deve dividir num_perm)
+            shingle_size: Tamanho dos shingles em palavras
+            threshold: Similaridade de Jaccard mínima para considerar duplicata
+            path: Arquivo SQLite para persistir as assinaturas (None = só memória)
+            table: Nome da tabela de assinaturas
+            max_items: Máximo de entradas no índice
+            enabled: Se o índice está habilitado (desabilitado, não abre o SQLite)
+        """
+        if num_perm % bands != 0:
+            raise ValueError("num_perm deve ser múltiplo de bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = max(1, shingle_size)
+        self.threshold = threshold
+        self.path = path
+        self.table = table
+        self.max_items = max(1, max_items)
+        self.enabled = enabled
+
+        rng = random.Random(42)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        # a = a_hi·2^29 + a_lo: cada produto com um hash de 32 bits cabe em 64 bits
+        a = np.array([a for a, _ in self._perms], dtype=np.uint64)
+        self._a_hi = (a >> np.uint64(29))[:, None]
+        self._a_lo = (a & np.uint64((1 << 29) - 1))[:, None]
+        self._b = np.array([b for _, b in self._perms], dtype=np.uint64)[:, None]
+
+        self._signatures = array("I")
+        self._keys = bytearray()
+        self._namespaces: List[str] = []
+        self._ids: Dict[bytes, int] = {}
+        self._buckets: List[Dict[int, Union[int, array]]] = [dict() for _ in range(bands)]
+        # Próxima posição do buffer circular (a entrada mais antiga quando cheio)
+        self._next = 0
+        self._loaded = path is None
+        self._load_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._namespaces)
+
+    def shingles(self, text: str) -> set:
+        """
+        Gera os shingles de palavras do texto
+
+        Args:
+            text: Texto normalizado
+
+        Returns:
+            Conjunto de hashes de 32 bits dos shingles
+        """
+        tokens = re.findall(r"\w+", text.lower())
+        k = self.shingle_size
+        if len(tokens) <= k:
+            return {zlib.crc32(" ".join(tokens).encode("utf-8"))} if tokens else set()
+
+        return {
+            zlib.crc32(" ".join(tokens[i:i + k]).encode("utf-8"))
+            for i in range(len(tokens) - k + 1)
+        }
+
+    def signature(self, text: str) -> Optional[array]:
+        """
+        Calcula a assinatura MinHash do texto
+
+        Args:
+            text: Texto normalizado
+
+        Returns:
+            Assinatura com num_perm inteiros de 32 bits ou None se vazio
+        """
+        hashes = self.shingles(text)
+        if not hashes:
+            return None
+
+        h = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))[None, :]
+        # (a·h + b) mod p, com a·h = a_hi·h·2^29 + a_lo·h
+        values = np.multiply(self._a_hi, h)
+        scratch = np.empty_like(values)
+        _mod_mersenne(values, scratch)
+        # x·2^29 mod p = (x >> 32) + (x mod 2^32)·2^29, pois 2^61 ≡ 1
+        np.bitwise_and(values, np.uint64(_MAX_HASH), out=scratch)
+        scratch <<= np.uint64(29)
+        values >>= np.uint64(32)
+        values += scratch
+        np.multiply(self._a_lo, h, out=scratch)
+        values += scratch
+        values += self._b
+        _mod_mersenne(values, scratch)
+
+        sig = array("I")
+        sig.frombytes((values.min(axis=1) & np.uint64(_MAX_HASH)).astype(np.uint32).tobytes())
+        return sig
+
+    def _band_keys(self, sig: array, namespace: str) -> List[int]:
+        """Hash de cada banda da assinatura, separado por namespace"""
+        data = sig.tobytes()
+        width = self.rows * sig.itemsize
+        return [
+            hash((namespace, data[i * width:(i + 1) * width]))
+            for i in range(self.bands)
+        ]
+
+    def _insert(self, sig: array, key: bytes, namespace: str) -> bool:
+        """
+        Insere uma assinatura já calculada no índice em memória
+
+        Returns:
+            False se a chave já estava indexada
+        """
+        if key in self._ids:
+            return False
+
+        entry_id = self._next
+        self._next = (entry_id + 1) % self.max_items
+        if entry_id < len(self):
+            self._evict(entry_id)
+            offset = entry_id * self.num_perm
+            self._signatures[offset:offset + self.num_perm] = sig
+            self._keys[entry_id * 32:(entry_id + 1) * 32] = key
+            self._namespaces[entry_id] = namespace
+        else:
+            self._signatures.extend(sig)
+            self._keys.extend(key)
+            self._namespaces.append(namespace)
+        self._ids[key] = entry_id
+
+        for buckets, band_key in zip(self._buckets, self._band_keys(sig, namespace)):
+            ids = buckets.get(band_key)
+            if ids is None:
+                buckets[band_key] = entry_id
+            elif isinstance(ids, int):
+                buckets[band_key] = array("I", (ids, entry_id))
+            else:
+                ids.append(entry_id)
+        return True
+
+    def _evict(self, entry_id: int) -> None:
+        """Tira dos buckets a entrada mais antiga, cuja posição será reaproveitada"""
+        offset = entry_id * self.num_perm
+        sig = self._signatures[offset:offset + self.num_perm]
+        for buckets, band_key in zip(self._buckets, self._band_keys(sig, self._namespaces[entry_id])):
+            ids = buckets.get(band_key)
+            if isinstance(ids, int):
+                del buckets[band_key]
+            elif ids is not None:
+                ids.remove(entry_id)
+                if len(ids) == 1:
+                    buckets[band_key] = ids[0]
+        del self._ids[bytes(self._keys[entry_id * 32:(entry_id + 1) * 32])]
+
+    def _similarity(self, sig: array, entry_id: int) -> float:
+        """Estimativa de Jaccard entre a assinatura e uma entrada do índice"""
+        offset = entry_id * self.num_perm
+        stored = self._signatures[offset:offset + self.num_perm]
+        matches = sum(1 for x, y in zip(sig, stored) if x == y)
+        return matches / self.num_perm
+
+    def query_signature(
+        self,
+        sig: array,
+        namespace: str
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Busca a entrada mais parecida com a assinatura
+
+        Args:
+            sig: Assinatura MinHash
+            namespace: Partição do índice (ex: parâmetros da requisição)
+
+        Returns:
+            Tupla (chave, similaridade) ou None se nada acima do limiar
+        """
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(sig, namespace)):
+            ids = buckets.get(band_key)
+            if isinstance(ids, int):
+                candidates.add(ids)
+            elif ids is not None:
+                candidates.update(ids)
+
+        best_id, best_score = -1, 0.0
+        for entry_id in candidates:
+            score = self._similarity(sig, entry_id)
+            if score > best_score:
+                best_id, best_score = entry_id, score
+
+        if best_id < 0 or best_score < self.threshold:
+            return None
+
+        key = bytes(self._keys[best_id * 32:(best_id + 1) * 32]).hex()
+        return key, best_score
+
+    async def find(self, text: str, namespace: str = "") -> Optional[Tuple[str, float]]:
+        """
+        Busca um conteúdo já indexado parecido com o texto
+
+        Args:
+            text: Texto normalizado
+            namespace: Partição do índice
+
+        Returns:
+            Tupla (chave, similaridade) ou None
+        """
+        if not self.enabled:
+            return None
+        await self._ensure_loaded()
+        sig = await asyncio.to_thread(self.signature, text)
+        if sig is None:
+            return None
+        return self.query_signature(sig, namespace)
+
+    async def add(self, text: str, key: str, namespace: str = "") -> None:
+        """
+        Indexa um conteúdo verificado
+
+        Args:
+            text: Texto normalizado
+            key: Chave hexadecimal de 32 bytes (sha256) do resultado
+            namespace: Partição do índice
+        """
+        if not self.enabled:
+            return
+        await self._ensure_loaded()
+        key_bytes = bytes.fromhex(key)
+        if key_bytes in self._ids:
+            return
+
+        sig = await asyncio.to_thread(self.signature, text)
+        if sig is None or not self._insert(sig, key_bytes, namespace):
+            return
+
+        if self.path:
+            try:
+                await asyncio.to_thread(self._db_add, key, namespace, sig.tobytes())
+            except Exception as e:
+                logger.error(f"Erro ao persistir assinatura MinHash: {e}")
+
+    async def _ensure_loaded(self) -> None:
+        """Carrega as assinaturas persistidas na primeira utilização"""
+        if self._loaded:
+            return
+
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                # Leitura e montagem dos buckets fora do event loop (centenas de milhares de linhas)
+                await asyncio.to_thread(self._load)
+                logger.info(f"📇 Índice de quase-duplicatas carregado: {len(self)} entradas")
+            except Exception as e:
+                logger.error(f"Erro ao carregar índice de quase-duplicatas: {e}")
+            self._loaded = True
+
+    def _load(self) -> None:
+        """Reconstrói o índice em memória a partir das assinaturas persistidas"""
+        for key, namespace, blob in self._db_load():
+            sig = array("I")
+            sig.frombytes(blob)
+            if len(sig) == self.num_perm:
+                self._insert(sig, bytes.fromhex(key), namespace)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre conexão com o banco e garante a tabela"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                signature BLOB NOT NULL
+            )
+            """
+        )
+        return conn
+
+    def _db_load(self) -> List[Tuple[str, str, bytes]]:
+        """Lê as assinaturas persistidas mais recentes (da mais antiga para a mais nova)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT key, namespace, signature FROM {self.table} ORDER BY rowid DESC LIMIT ?",
+                (self.max_items,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return rows[::-1]
+
+    def _db_add(self, key: str, namespace: str, blob: bytes) -> None:
+        """Persiste uma assinatura e descarta as que não cabem mais no índice"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, namespace, signature) "
+                "VALUES (?, ?, ?)",
+                (key, namespace, blob)
+            )
+            if cursor.lastrowid % max(1, int(self.max_items * _PRUNE_FRACTION)) == 0:
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE rowid <= "
+                    f"(SELECT rowid FROM {self.table} ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                    (self.max_items,)
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# Instância global do índice
+near_duplicate_index = NearDuplicateIndex(
+    enabled=settings.RESULT_CACHE_ENABLED and settings.NEAR_DUPLICATE_ENABLED
+)
@@ -0,0 +1,174 @@
+"""
+Backends de embeddings de texto (vetores float32 normalizados)
+"""
+import logging
+import zlib
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from app.config import settings
+from app.services.preprocessing import STOPWORDS, preprocessing_service
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Negações mudam o sentido da afirmação: ficam fora das stopwords e com peso alto
+NEGATIONS = frozenset({"nao", "nem", "nunca", "jamais", "not", "no", "never"})
+_STOPWORDS = STOPWORDS - NEGATIONS
+
+
+class EmbeddingBackend(ABC):
+    """
+    Interface dos backends de embeddings.
+
+    `embed` é síncrono (roda em `asyncio.to_thread`) e devolve uma matriz
+    float32 (n, dim) com linhas de norma 1, de modo que o produto interno
+    é a similaridade de cosseno.
+    """
+
+    name = "base"
+    dim = 0
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Calcula os embeddings de vários textos
+
+        Args:
+            texts: Textos livres
+
+        Returns:
+            Matriz float32 (len(texts), dim) normalizada
+        """
+
+
+class HashingEmbedder(EmbeddingBackend):
+    """
+    Modelo local leve, sem dependências além do NumPy.
+
+    Cada palavra (sem acento, sem stopwords e com plural simples reduzido)
+    e cada trigrama de caracteres dela são projetados por hashing com sinal
+    em `dim` posições; negações e números pesam mais, porque invertem ou
+    mudam a afirmação. Casa reordenações e variações de flexão ("vacina tem
+    chip" / "chip nas vacinas"); sinônimos de verdade pedem um modelo
+    treinado como o `sentence-transformers`.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = settings.EMBEDDING_DIM):
+        """
+        Inicializa o modelo
+
+        Args:
+            dim: Dimensão dos vetores
+        """
+        self.dim = dim
+
+    def features(self, text: str) -> Dict[str, float]:
+        """
+        Atributos ponderados de um texto
+
+        Args:
+            text: Texto livre
+
+        Returns:
+            Dicionário atributo -> peso
+        """
+        weights: Dict[str, float] = {}
+        for word in preprocessing_service.normalize_for_matching(text).split():
+            if word in NEGATIONS:
+                weights["!neg"] = 3.0
+                continue
+            if word.isdigit():
+                # Números decidem a afirmação ("subiu 5%" ≠ "subiu 10%")
+                weights[word] = 3.0
+                continue
+            if len(word) < 2 or word in _STOPWORDS:
+                continue
+            if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+                word = word[:-1]
+
+            weights[word] = weights.get(word, 0.0) + 1.0
+            padded = f"<{word}>"
+            grams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+            for gram in grams:
+                weights["#" + gram] = weights.get("#" + gram, 0.0) + 1.0 / len(grams)
+        return weights
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self.features(text).items():
+                digest = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                vectors[row, digest % self.dim] += sign * weight
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder(EmbeddingBackend):
+    """Modelo `sentence-transformers` rodando localmente na CPU"""
+
+    name = "sentence-transformers"
+
+    def __init__(self, model_name: str = settings.EMBEDDING_MODEL):
+        """
+        Carrega o modelo
+
+        Args:
+            model_name: Nome ou caminho do modelo
+        """
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.model_name = model_name
+        self.dim = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = self._model.encode(texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False)
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+
+# Backends disponíveis por nome (registre novos aqui)
+EMBEDDING_BACKENDS: Dict[str, Callable[[], EmbeddingBackend]] = {
+    HashingEmbedder.name: HashingEmbedder,
+    SentenceTransformerEmbedder.name: SentenceTransformerEmbedder,
+}
+
+
+def create_embedder(name: str = settings.EMBEDDING_BACKEND) -> EmbeddingBackend:
+    """
+    Instancia o backend configurado, recorrendo ao modelo por hashing
+
+    Args:
+        name: Nome do backend (hashing, sentence-transformers)
+
+    Returns:
+        Backend de embeddings
+    """
+    if name == SentenceTransformerEmbedder.name and not SENTENCE_TRANSFORMERS_AVAILABLE:
+        logger.warning("sentence-transformers não disponível. Usando embeddings por hashing.")
+        return HashingEmbedder()
+
+    factory = EMBEDDING_BACKENDS.get(name)
+    if factory is None:
+        logger.warning(f"⚠️ Backend de embeddings desconhecido ({name}); usando hashing")
+        return HashingEmbedder()
+
+    try:
+        return factory()
+    except Exception as e:
+        logger.error(f"Erro ao carregar backend de embeddings {name}: {e}")
+        return HashingEmbedder()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Normaliza as linhas para norma 1 (linhas nulas continuam nulas)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
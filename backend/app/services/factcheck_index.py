@@ -0,0 +1,695 @@
+"""
+Índice local (BM25) de checagens já publicadas por agências de fact-checking
+
+Uso pela linha de comando (a partir de backend/):
+
+    python -m app.services.factcheck_index import checagens.jsonl
+    python -m app.services.factcheck_index rebuild checagens.jsonl
+    python -m app.services.factcheck_index search "vacina tem chip"
+    python -m app.services.factcheck_index remove https://exemplo.org/checagem
+    python -m app.services.factcheck_index stats
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import sqlite3
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.models import Source
+from app.services.credibility_registry import credibility_registry
+from app.services.preprocessing import STOPWORDS, preprocessing_service
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros do BM25
+_K1 = 1.2
+_B = 0.75
+
+# Termos mais raros da consulta usados na busca (limita o custo de textos longos)
+_MAX_QUERY_TERMS = 32
+
+# Máximo de variáveis por consulta SQL
+_SQL_CHUNK = 500
+
+# Tabelas do índice e sufixos usados por `rebuild` (novo índice e índice substituído)
+_TABLES = ("factchecks", "postings", "terms", "index_stats")
+_STAGING = "_new"
+_RETIRED = "_old"
+
+
+def _schema(suffix: str = "") -> str:
+    """Script que cria as tabelas do índice (com sufixo, para o `rebuild`)"""
+    return f"""
+        CREATE TABLE IF NOT EXISTS factchecks{suffix} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL UNIQUE,
+            claim TEXT NOT NULL,
+            title TEXT,
+            rating TEXT NOT NULL,
+            publisher TEXT,
+            published_at TEXT,
+            language TEXT,
+            terms TEXT NOT NULL,
+            length INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS postings{suffix} (
+            term TEXT NOT NULL,
+            doc_id INTEGER NOT NULL,
+            tf INTEGER NOT NULL,
+            doc_length INTEGER NOT NULL,
+            PRIMARY KEY (term, doc_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS postings_doc{suffix} ON postings{suffix} (doc_id);
+        CREATE TABLE IF NOT EXISTS terms{suffix} (
+            term TEXT PRIMARY KEY,
+            df INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS index_stats{suffix} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            doc_count INTEGER NOT NULL,
+            total_length INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO index_stats{suffix} (id, doc_count, total_length) VALUES (1, 0, 0);
+    """
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokeniza texto em português ou inglês para o índice
+
+    Minúsculas, sem acentos nem pontuação, sem stopwords e com plural
+    simples reduzido ("vacinas" → "vacina").
+
+    Args:
+        text: Texto livre
+
+    Returns:
+        Lista de termos (com repetições)
+    """
+    tokens = []
+    for token in preprocessing_service.normalize_for_matching(text).split():
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def veracity_from_rating(rating: str) -> str:
+    """
+    Converte a classificação textual de uma agência para o veredito da API
+
+    Args:
+        rating: Classificação publicada (ex: "Falso", "Mostly true", "Sem contexto")
+
+    Returns:
+        verdadeiro, falso, parcialmente verdadeiro ou não verificável
+    """
+    text = preprocessing_service.normalize_for_matching(rating)
+    if any(term in text for term in ("nao e verdade", "not true", "nao procede")):
+        return "falso"
+    if any(term in text for term in (
+        "parcial", "partly", "half", "mostly", "mixture", "misto", "distorcido",
+        "exagerado", "impreciso", "sem contexto", "contexto", "missing context"
+    )):
+        return "parcialmente verdadeiro"
+    if any(term in text for term in (
+        "falso", "false", "fake", "enganoso", "misleading", "mentira", "boato",
+        "insustentavel", "pants on fire", "incorrect", "incorreto"
+    )):
+        return "falso"
+    if any(term in text for term in ("verdadeiro", "verdade", "true", "correto", "correct", "comprovado")):
+        return "verdadeiro"
+    return "não verificável"
+
+
+class FactCheckMatch:
+    """Checagem publicada encontrada no índice"""
+
+    def __init__(
+        self,
+        row: Tuple[Any, ...],
+        score: float,
+        coverage: float,
+        query_coverage: float
+    ):
+        """
+        Inicializa o resultado
+
+        Args:
+            row: Linha da tabela factchecks (url, claim, title, rating,
+                publisher, published_at, language)
+            score: Pontuação BM25
+            coverage: Fração (ponderada por IDF) dos termos da checagem
+                presentes no conteúdo
+            query_coverage: Fração dos termos do conteúdo presentes na checagem
+        """
+        self.url, self.claim, self.title, self.rating, self.publisher, self.published_at, self.language = row
+        self.score = score
+        self.coverage = coverage
+        self.query_coverage = query_coverage
+
+    @property
+    def veracity(self) -> str:
+        return veracity_from_rating(self.rating)
+
+    def to_source(self) -> Source:
+        """Fonte citável, no mesmo formato do provedor Fact Check Tools"""
+        publisher = self.publisher or "Agência de checagem"
+        return Source(
+            title=self.title or f"{publisher}: {self.claim}",
+            url=self.url,
+            credibility=credibility_registry.rate(self.url, default="high"),
+            relevance=round(min(1.0, self.coverage), 3),
+            summary=f"{publisher} classificou como \"{self.rating}\": {self.claim}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url, "claim": self.claim, "title": self.title, "rating": self.rating,
+            "publisher": self.publisher, "published_at": self.published_at, "language": self.language,
+            "score": round(self.score, 3), "coverage": round(self.coverage, 3),
+            "query_coverage": round(self.query_coverage, 3)
+        }
+
+
+def parse_record(data: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+    """
+    Normaliza um registro do dump de checagens
+
+    Aceita registros planos (url, claim, rating, title, publisher,
+    published_at, language), objetos schema.org ClaimReview e afirmações
+    no formato da Google Fact Check Tools API (com `claimReview`).
+
+    Args:
+        data: Objeto lido do dump
+
+    Returns:
+        Checagens normalizadas (vazia se o registro for inválido)
+    """
+    if "claimReview" in data:
+        return [
+            record
+            for review in data.get("claimReview", [])
+            for record in parse_record({
+                "url": review.get("url"),
+                "claim": data.get("text"),
+                "title": review.get("title"),
+                "rating": review.get("textualRating"),
+                "publisher": (review.get("publisher") or {}).get("name"),
+                "published_at": review.get("reviewDate"),
+                "language": review.get("languageCode")
+            })
+        ]
+
+    if "claimReviewed" in data:
+        author = data.get("author") or {}
+        if isinstance(author, list):
+            author = author[0] if author else {}
+        data = {
+            "url": data.get("url"),
+            "claim": data.get("claimReviewed"),
+            "title": data.get("name") or data.get("headline"),
+            "rating": (data.get("reviewRating") or {}).get("alternateName"),
+            "publisher": author.get("name") if isinstance(author, dict) else author,
+            "published_at": data.get("datePublished"),
+            "language": data.get("inLanguage")
+        }
+
+    url = (data.get("url") or "").strip()
+    claim = (data.get("claim") or data.get("text") or "").strip()
+    rating = (data.get("rating") or data.get("textualRating") or "").strip()
+    if not url or not claim or not rating:
+        return []
+
+    return [{
+        "url": url,
+        "claim": claim,
+        "title": (data.get("title") or "").strip() or None,
+        "rating": rating,
+        "publisher": (data.get("publisher") or "").strip() or None,
+        "published_at": data.get("published_at") or data.get("date"),
+        "language": data.get("language")
+    }]
+
+
+def iter_dump(path: str) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Lê um dump de checagens (JSON Lines ou um array JSON)
+
+    Args:
+        path: Caminho do arquivo
+
+    Yields:
+        Checagens normalizadas
+    """
+    with open(path, encoding="utf-8") as file:
+        first = file.read(1)
+        file.seek(0)
+        if first == "[":
+            items: Iterable[Any] = json.load(file)
+        else:
+            items = (json.loads(line) for line in file if line.strip())
+
+        for item in items:
+            if isinstance(item, dict):
+                yield from parse_record(item)
+
+
+class FactCheckIndex:
+    """
+    Índice invertido BM25 das checagens publicadas, persistido em SQLite.
+
+    As postings (termo, checagem, frequência) ficam em disco e só os termos
+    da consulta são lidos, então o índice pode crescer sem ocupar memória
+    do processo. Importações são incrementais: uma checagem com a mesma URL
+    substitui a anterior.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.FACTCHECK_INDEX_PATH,
+        enabled: bool = settings.FACTCHECK_INDEX_ENABLED
+    ):
+        """
+        Inicializa o índice
+
+        Args:
+            path: Caminho do arquivo SQLite
+            enabled: Se o índice está habilitado
+        """
+        self.path = path
+        self.enabled = enabled
+
+        if self.enabled:
+            try:
+                self._init_db()
+            except Exception as e:
+                logger.error(f"Erro ao inicializar índice de checagens ({path}): {e}")
+                self.enabled = False
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 5,
+        language: Optional[str] = None
+    ) -> List[FactCheckMatch]:
+        """
+        Busca checagens publicadas parecidas com o conteúdo
+
+        Args:
+            query: Conteúdo ou afirmação
+            limit: Número máximo de resultados
+            language: Idioma do conteúdo (pt, en, pt-BR...); se informado, só
+                entram checagens no mesmo idioma ou sem idioma registrado
+
+        Returns:
+            Checagens ordenadas pela pontuação BM25 (vazia se desabilitado
+            ou em caso de erro)
+        """
+        if not self.enabled:
+            return []
+
+        started = time.monotonic()
+        try:
+            return await asyncio.to_thread(self.search_sync, query, limit, language)
+        except Exception as e:
+            logger.error(f"Erro ao consultar índice de checagens: {e}")
+            return []
+        finally:
+            metrics.observe("factcheck_index_search_seconds", time.monotonic() - started)
+
+    def search_sync(self, query: str, limit: int = 5, language: Optional[str] = None) -> List[FactCheckMatch]:
+        """Versão síncrona de `search` (usada pela linha de comando)"""
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return []
+
+        conn = self._connect()
+        try:
+            doc_count, total_length = self._stats(conn)
+            if not doc_count:
+                return []
+            avg_length = total_length / doc_count
+
+            df = self._document_frequencies(conn, query_terms)
+            idf = {term: self._idf(df.get(term, 0), doc_count) for term in query_terms}
+
+            # Só os termos mais raros: termos comuns pouco mudam o ranking
+            terms = sorted((term for term in query_terms if df.get(term)), key=idf.get, reverse=True)
+            terms = terms[:_MAX_QUERY_TERMS]
+            if not terms:
+                return []
+
+            scores: Dict[int, float] = {}
+            for chunk in _chunks(terms):
+                rows = conn.execute(
+                    f"SELECT term, doc_id, tf, doc_length FROM postings WHERE term IN ({_placeholders(chunk)})",
+                    chunk
+                )
+                for term, doc_id, tf, doc_length in rows:
+                    norm = tf + _K1 * (1 - _B + _B * doc_length / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf[term] * tf * (_K1 + 1) / norm
+
+            # Candidatos em ordem de pontuação; o filtro de idioma pode descartar
+            # alguns, então as linhas são lidas em lotes até completar o limite
+            ranked = sorted(scores, key=scores.get, reverse=True)
+            language_filter, language_params = _language_filter(language)
+            rows: Dict[int, Tuple[Any, ...]] = {}
+            top: List[int] = []
+            batch = min(_SQL_CHUNK, limit * 4) if language else limit
+            for start in range(0, len(ranked), batch):
+                candidates = ranked[start:start + batch]
+                found = {
+                    row[0]: row[1:]
+                    for row in conn.execute(
+                        "SELECT id, url, claim, title, rating, publisher, published_at, language, terms "
+                        f"FROM factchecks WHERE id IN ({_placeholders(candidates)}){language_filter}",
+                        candidates + language_params
+                    )
+                }
+                for doc_id in candidates:
+                    if doc_id in found and len(top) < limit:
+                        top.append(doc_id)
+                        rows[doc_id] = found[doc_id]
+                if len(top) >= limit:
+                    break
+            if not top:
+                return []
+
+            doc_terms = {doc_id: set(row[-1].split()) for doc_id, row in rows.items()}
+            all_terms = set().union(*doc_terms.values()) - set(idf)
+            df.update(self._document_frequencies(conn, all_terms))
+            idf.update({term: self._idf(df.get(term, 0), doc_count) for term in all_terms})
+        finally:
+            conn.close()
+
+        query_mass = sum(idf[term] for term in query_terms)
+        matches = []
+        for doc_id in top:
+            matched = doc_terms[doc_id] & query_terms
+            matched_mass = sum(idf[term] for term in matched)
+            doc_mass = sum(idf[term] for term in doc_terms[doc_id]) or 1.0
+            matches.append(FactCheckMatch(
+                rows[doc_id][:-1], scores[doc_id], matched_mass / doc_mass, matched_mass / query_mass
+            ))
+        return matches
+
+    def add(self, records: Iterable[Dict[str, Optional[str]]], batch_size: int = 1000) -> int:
+        """
+        Adiciona ou atualiza checagens (pela URL)
+
+        Args:
+            records: Checagens normalizadas (ver `parse_record`)
+            batch_size: Checagens por transação
+
+        Returns:
+            Número de checagens gravadas
+        """
+        return self._add(records, batch_size)
+
+    def remove(self, url: str) -> bool:
+        """
+        Remove uma checagem do índice
+
+        Args:
+            url: URL da checagem
+
+        Returns:
+            True se a checagem existia
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                return self._delete(conn, url)
+        finally:
+            conn.close()
+
+    def rebuild(self, records: Iterable[Dict[str, Optional[str]]]) -> int:
+        """
+        Recria o índice do zero
+
+        O novo índice é montado em tabelas temporárias (sufixo _new) enquanto
+        o atual continua respondendo às buscas; a troca acontece numa única
+        transação com ALTER TABLE ... RENAME.
+
+        Args:
+            records: Checagens normalizadas
+
+        Returns:
+            Número de checagens gravadas
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._drop_tables(conn, _STAGING)
+            conn.executescript(_schema(_STAGING))
+        finally:
+            conn.close()
+
+        total = self._add(records, suffix=_STAGING)
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._drop_tables(conn, _RETIRED)
+                for table in _TABLES:
+                    conn.execute(f"ALTER TABLE {table} RENAME TO {table}{_RETIRED}")
+                    conn.execute(f"ALTER TABLE {table}{_STAGING} RENAME TO {table}")
+                self._drop_tables(conn, _RETIRED)
+                # Índices não podem ser renomeados: recria o de postings com o nome usual
+                conn.execute(f"DROP INDEX IF EXISTS postings_doc{_STAGING}")
+                conn.execute("CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id)")
+        finally:
+            conn.close()
+        return total
+
+    def stats(self) -> Dict[str, Any]:
+        """Tamanho do índice (checagens, termos e comprimento médio)"""
+        conn = self._connect()
+        try:
+            doc_count, total_length = self._stats(conn)
+            terms = conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            "factchecks": doc_count,
+            "terms": terms,
+            "avg_length": round(total_length / doc_count, 2) if doc_count else 0
+        }
+
+    def _add(
+        self,
+        records: Iterable[Dict[str, Optional[str]]],
+        batch_size: int = 1000,
+        suffix: str = ""
+    ) -> int:
+        """Grava checagens em lotes nas tabelas com o sufixo indicado"""
+        total = 0
+        batch: List[Dict[str, Optional[str]]] = []
+        conn = self._connect()
+        try:
+            for record in records:
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    total += self._write_batch(conn, batch, suffix)
+                    batch = []
+            if batch:
+                total += self._write_batch(conn, batch, suffix)
+        finally:
+            conn.close()
+        return total
+
+    def _write_batch(
+        self,
+        conn: sqlite3.Connection,
+        batch: List[Dict[str, Optional[str]]],
+        suffix: str = ""
+    ) -> int:
+        """Grava um lote de checagens numa transação (retorna quantas foram inseridas)"""
+        inserted = 0
+        with conn:
+            for record in batch:
+                self._delete(conn, record["url"], suffix)
+                tokens = tokenize(" ".join(filter(None, (record.get("title"), record["claim"]))))
+                if not tokens:
+                    continue
+                counts = Counter(tokens)
+                cursor = conn.execute(
+                    f"INSERT INTO factchecks{suffix} (url, claim, title, rating, publisher, published_at, language, terms, length) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        record["url"], record["claim"], record.get("title"), record["rating"],
+                        record.get("publisher"), record.get("published_at"), record.get("language"),
+                        " ".join(counts), len(tokens)
+                    )
+                )
+                doc_id = cursor.lastrowid
+                conn.executemany(
+                    f"INSERT INTO postings{suffix} (term, doc_id, tf, doc_length) VALUES (?, ?, ?, ?)",
+                    [(term, doc_id, tf, len(tokens)) for term, tf in counts.items()]
+                )
+                conn.executemany(
+                    f"INSERT INTO terms{suffix} (term, df) VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                    [(term,) for term in counts]
+                )
+                self._update_stats(conn, 1, len(tokens), suffix)
+                inserted += 1
+        return inserted
+
+    def _delete(self, conn: sqlite3.Connection, url: str, suffix: str = "") -> bool:
+        """Remove uma checagem e suas postings (dentro da transação corrente)"""
+        row = conn.execute(f"SELECT id, terms, length FROM factchecks{suffix} WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return False
+
+        doc_id, terms, length = row
+        conn.execute(f"DELETE FROM postings{suffix} WHERE doc_id = ?", (doc_id,))
+        conn.executemany(
+            f"UPDATE terms{suffix} SET df = df - 1 WHERE term = ?", [(term,) for term in terms.split()]
+        )
+        conn.execute(f"DELETE FROM terms{suffix} WHERE df <= 0")
+        conn.execute(f"DELETE FROM factchecks{suffix} WHERE id = ?", (doc_id,))
+        self._update_stats(conn, -1, -length, suffix)
+        return True
+
+    @staticmethod
+    def _drop_tables(conn: sqlite3.Connection, suffix: str) -> None:
+        """Remove as tabelas do índice com o sufixo indicado"""
+        for table in _TABLES:
+            conn.execute(f"DROP TABLE IF EXISTS {table}{suffix}")
+
+    @staticmethod
+    def _update_stats(conn: sqlite3.Connection, documents: int, length: int, suffix: str = "") -> None:
+        """Atualiza o número de checagens e o comprimento total"""
+        conn.execute(
+            f"UPDATE index_stats{suffix} SET doc_count = doc_count + ?, total_length = total_length + ? WHERE id = 1",
+            (documents, length)
+        )
+
+    @staticmethod
+    def _stats(conn: sqlite3.Connection) -> Tuple[int, int]:
+        """Número de checagens e soma dos comprimentos"""
+        row = conn.execute("SELECT doc_count, total_length FROM index_stats WHERE id = 1").fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    @staticmethod
+    def _document_frequencies(conn: sqlite3.Connection, terms: Iterable[str]) -> Dict[str, int]:
+        """Em quantas checagens cada termo aparece"""
+        df: Dict[str, int] = {}
+        for chunk in _chunks(list(terms)):
+            df.update(conn.execute(
+                f"SELECT term, df FROM terms WHERE term IN ({_placeholders(chunk)})", chunk
+            ).fetchall())
+        return df
+
+    @staticmethod
+    def _idf(df: int, doc_count: int) -> float:
+        """IDF do BM25 (sempre positivo)"""
+        return math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre uma conexão com o banco do índice"""
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self) -> None:
+        """Cria o diretório e as tabelas do índice se necessário"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.executescript(_schema())
+        finally:
+            conn.close()
+
+
+def _language_filter(language: Optional[str]) -> Tuple[str, List[Any]]:
+    """
+    Cláusula SQL que restringe as checagens ao idioma do conteúdo
+
+    Compara só o idioma principal ("pt" aceita "pt", "pt-BR" e "pt_PT");
+    checagens sem idioma registrado são sempre aceitas.
+
+    Args:
+        language: Idioma do conteúdo (None desativa o filtro)
+
+    Returns:
+        Trecho para o WHERE (começando com AND) e seus parâmetros
+    """
+    code = (language or "").strip().lower().replace("_", "-").split("-")[0]
+    if not code:
+        return "", []
+    return (
+        " AND (language IS NULL OR language = '' OR lower(replace(language, '_', '-')) = ? "
+        "OR lower(replace(language, '_', '-')) LIKE ?)",
+        [code, f"{code}-%"]
+    )
+
+
+def _chunks(items: List[Any]) -> Iterator[List[Any]]:
+    """Divide uma lista em partes de até _SQL_CHUNK itens"""
+    for start in range(0, len(items), _SQL_CHUNK):
+        yield items[start:start + _SQL_CHUNK]
+
+
+def _placeholders(items: List[Any]) -> str:
+    return ", ".join("?" * len(items))
+
+
+# Instância global do índice
+factcheck_index = FactCheckIndex()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Linha de comando para importar, reconstruir e consultar o índice"""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.factcheck_index",
+        description="Índice local de checagens publicadas (BM25)"
+    )
+    parser.add_argument("--path", default=settings.FACTCHECK_INDEX_PATH, help="Arquivo SQLite do índice")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("import", help="Adiciona/atualiza checagens de um dump").add_argument("dump")
+    commands.add_parser("rebuild", help="Recria o índice a partir de um dump").add_argument("dump")
+    search = commands.add_parser("search", help="Busca checagens parecidas com um texto")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=5)
+    search.add_argument("--language", help="Só checagens neste idioma (ex.: pt)")
+    commands.add_parser("remove", help="Remove uma checagem pela URL").add_argument("url")
+    commands.add_parser("stats", help="Mostra o tamanho do índice")
+    args = parser.parse_args(argv)
+
+    index = FactCheckIndex(path=args.path, enabled=True)
+    started = time.monotonic()
+    if args.command == "import":
+        result: Any = {"imported": index.add(iter_dump(args.dump))}
+    elif args.command == "rebuild":
+        result = {"imported": index.rebuild(iter_dump(args.dump))}
+    elif args.command == "search":
+        result = [match.to_dict() for match in index.search_sync(args.query, args.limit, args.language)]
+    elif args.command == "remove":
+        result = {"removed": index.remove(args.url)}
+    else:
+        result = index.stats()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print(f"({time.monotonic() - started:.3f}s)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
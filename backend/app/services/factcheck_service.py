@@ -1,18 +1,31 @@
 """
 Serviço principal de fact-checking
 """
+import asyncio
+import hashlib
 import logging
 import time
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
+from app.config import settings
 from app.models import (
     FactCheckRequest, FactCheckResponse, ContentType,
     CredibilityLevel, Claim, Source
 )
-from app.services.gemini_service import gemini_service
+from app.services.claim_store import claim_store
+from app.services.factcheck_index import FactCheckMatch, factcheck_index
+from app.services.gemini_service import gemini_service, PROMPT_VERSION
+from app.services.llm_client import LLMUnavailableError
+from app.services.llm_scheduler import LLMOverloadedError
 from app.services.search_service import search_service
 from app.services.preprocessing import preprocessing_service
 from app.services.media_service import media_service
+from app.services.result_cache import result_cache
+from app.services.dedup_index import near_duplicate_index
+from app.utils.deadline import Deadline, deadline_scope
+from app.utils.metrics import metrics
+from app.utils.pipeline import Pipeline, PipelineRun
+from app.utils.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +33,50 @@ logger = logging.getLogger(__name__)
 class FactCheckService:
     """Serviço principal para coordenar fact-checking"""
     
+    def __init__(self):
+        """Inicializa o serviço"""
+        self._inflight = SingleFlight()
+    
     async def check_content(self, request: FactCheckRequest) -> FactCheckResponse:
         """
         Realiza fact-checking completo do conteúdo
         
+        Requisições idênticas em andamento são coalescidas em uma única
+        execução do pipeline.
+        
+        Args:
+            request: Requisição de fact-checking
+            
+        Returns:
+            Resposta com análise completa
+        """
+        return await self._inflight.do(
+            self._request_key(request),
+            lambda: self._check_content(request)
+        )
+    
+    @staticmethod
+    def _request_key(request: FactCheckRequest) -> str:
+        """
+        Monta a chave canônica de uma requisição
+        
+        Args:
+            request: Requisição de fact-checking
+            
+        Returns:
+            Chave usada para coalescer requisições idênticas
+        """
+        content = " ".join(request.content.split())
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return "|".join([
+            request.content_type.value, request.language,
+            "1" if request.check_sources else "0", str(request.deadline_ms or ""), content_hash
+        ])
+    
+    async def _check_content(self, request: FactCheckRequest) -> FactCheckResponse:
+        """
+        Executa o pipeline de fact-checking
+        
         Args:
             request: Requisição de fact-checking
             
@@ -31,56 +84,501 @@ class FactCheckService:
             Resposta com análise completa
         """
         start_time = time.time()
+        deadline = self._make_deadline(request)
         
+        head = head_search = None
         try:
-            # 1. Pré-processar conteúdo
-            logger.info("📝 Pré-processando conteúdo...")
-            content = await self._preprocess_content(request)
+            with deadline_scope(deadline):
+                # 1-2. Pré-processar e validar conteúdo (URLs: metadados e busca já começam)
+                head, head_search = self._prefetch_url_head(request)
+                content, cache_namespace, cache_key = await self._prepare_content(request, head)
+                
+                # 3. Consultar cache de resultados (exato e quase-duplicatas)
+                cached_response = await self._lookup_cache(content, cache_key, cache_namespace, start_time)
+                if cached_response:
+                    return cached_response
+                
+                # 4. Checagens já publicadas (índice local): resposta direta ou citação
+                published = await self._published_factchecks(content, request.language)
+                response = await self._answer_from_factchecks(request, content, published, start_time)
+                
+                # 5-8. Executar o pipeline (etapas independentes em paralelo)
+                if response is None:
+                    pipeline = self._build_pipeline(
+                        request, content, start_time, deadline, head_search, published
+                    )
+                    results = await pipeline.run()
+                    response = results["response"]
             
-            # 2. Validar conteúdo
-            if not preprocessing_service.is_valid_content(content):
-                raise ValueError("Conteúdo inválido ou muito curto para análise")
+            await self._store_result(content, cache_key, cache_namespace, response)
             
-            # 3. Detectar red flags iniciais
-            logger.info("🚩 Detectando sinais de alerta...")
-            red_flags = preprocessing_service.detect_red_flags(content)
+            processing_time = time.time() - start_time
+            logger.info(f"✅ Fact-checking concluído em {processing_time:.2f}s")
             
-            # 4. Analisar com Gemini
-            logger.info("🤖 Analisando com Gemini AI...")
-            gemini_analysis = await gemini_service.analyze_content(content, request.language)
+            return response
             
-            # 5. Buscar fontes externas (se solicitado)
-            sources_checked = []
-            if request.check_sources:
-                logger.info("🔍 Buscando fontes externas...")
-                sources_checked = await self._search_external_sources(content, gemini_analysis)
+        except Exception as e:
+            logger.error(f"❌ Erro no fact-checking: {e}", exc_info=True)
+            raise
+        finally:
+            for task in (head, head_search):
+                if task is not None:
+                    task.cancel()
+    
+    async def check_content_stream(self, request: FactCheckRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Realiza fact-checking entregando resultados parciais conforme ficam prontos
+        
+        Usa o mesmo pipeline de `check_content`, com as etapas emitindo
+        eventos ao concluir: red_flags (heurísticas locais e, depois, as
+        inconsistências), claim (uma por afirmação), claim_verified
+        (afirmação reavaliada com evidências), source (uma por fonte) e
+        result (resposta completa, igual à do endpoint sem streaming).
+        
+        Args:
+            request: Requisição de fact-checking
             
-            # 6. Consolidar análise
+        Yields:
+            Eventos no formato {"event": tipo, "data": conteúdo}
+        """
+        start_time = time.time()
+        deadline = self._make_deadline(request)
+        
+        # O gerador roda na tarefa de quem consome o stream: o prazo vale entre os eventos
+        with deadline_scope(deadline):
+            head, head_search = self._prefetch_url_head(request)
+            run_task = None
+            try:
+                content, cache_namespace, cache_key = await self._prepare_content(request, head)
+                
+                response = await self._lookup_cache(content, cache_key, cache_namespace, start_time)
+                if response is None:
+                    published = await self._published_factchecks(content, request.language)
+                    response = await self._answer_from_factchecks(request, content, published, start_time)
+                    if response is not None:
+                        await self._store_result(content, cache_key, cache_namespace, response)
+                if response is not None:
+                    for event in self._response_events(response):
+                        yield event
+                    return
+                
+                for match in published:
+                    yield {"event": "source", "data": match.to_source().model_dump(mode="json")}
+                
+                # Etapas do pipeline publicam eventos na fila; None marca o fim da execução
+                events: asyncio.Queue = asyncio.Queue()
+                pipeline = self._build_pipeline(
+                    request, content, start_time, deadline, head_search, published,
+                    emit=lambda event, data: events.put_nowait({"event": event, "data": data})
+                )
+                run_task = asyncio.ensure_future(pipeline.run())
+                run_task.add_done_callback(lambda _: events.put_nowait(None))
+                while True:
+                    event = await events.get()
+                    if event is None:
+                        break
+                    yield event
+                response = run_task.result()["response"]
+            finally:
+                for task in (head, head_search, run_task):
+                    if task is not None:
+                        task.cancel()
+            
+            await self._store_result(content, cache_key, cache_namespace, response)
+            
+            logger.info(f"✅ Fact-checking (streaming) concluído em {response.processing_time:.2f}s")
+            yield {"event": "result", "data": response.model_dump(mode="json")}
+    
+    @staticmethod
+    def _response_events(response: FactCheckResponse) -> List[Dict[str, Any]]:
+        """Eventos de streaming de uma resposta já pronta (cache ou checagem publicada)"""
+        events: List[Dict[str, Any]] = [{"event": "red_flags", "data": response.red_flags}]
+        events.extend({"event": "claim", "data": claim.model_dump(mode="json")} for claim in response.claims)
+        events.extend(
+            {"event": "source", "data": source.model_dump(mode="json")} for source in response.sources_checked
+        )
+        events.append({"event": "result", "data": response.model_dump(mode="json")})
+        return events
+    
+    def _build_pipeline(
+        self,
+        request: FactCheckRequest,
+        content: str,
+        start_time: float,
+        deadline: Optional[Deadline] = None,
+        head_search: Optional[asyncio.Task] = None,
+        published: Optional[List[FactCheckMatch]] = None,
+        emit: Optional[Callable[[str, Any], None]] = None
+    ) -> Pipeline:
+        """
+        Monta o grafo de etapas da verificação
+        
+        Etapas sem dependência começam juntas: heurísticas locais, análise
+        do Gemini, busca especulativa (metadados da URL ou primeiras
+        palavras do conteúdo) e verificação de consistência. A busca por afirmações espera a
+        análise e cancela a busca especulativa quando não precisa dela.
+        
+        Com prazo (deadline_ms), etapas sem tempo suficiente são puladas ou
+        encurtadas e registradas em `deadline.degraded`.
+        
+        Args:
+            request: Requisição de fact-checking
+            content: Conteúdo normalizado
+            start_time: Timestamp de início
+            deadline: Prazo da requisição (None = sem prazo)
+            head_search: Busca iniciada com os metadados da URL (ver
+                _prefetch_url_head), reaproveitada pela busca especulativa
+            published: Checagens publicadas citadas como primeiras fontes
+            emit: Recebe (evento, dados) conforme as etapas concluem; com
+                ele, a análise é feita em streaming (usado pelo SSE)
+            
+        Returns:
+            Pipeline cujo resultado "response" é a resposta final
+        """
+        language = request.language
+        pipeline = Pipeline("factcheck")
+        notify = emit or (lambda event, data: None)
+        
+        async def red_flags(run: PipelineRun) -> List[str]:
+            logger.info("🚩 Detectando sinais de alerta...")
+            flags = preprocessing_service.detect_red_flags(content)
+            notify("red_flags", flags)
+            return flags
+        
+        async def analysis(run: PipelineRun) -> Dict[str, Any]:
+            logger.info("🤖 Analisando com Gemini AI...")
+            if emit is None:
+                result = await gemini_service.analyze_content(content, language)
+            else:
+                result = {}
+                async for kind, payload in gemini_service.analyze_content_stream(content, language):
+                    if kind == "claim":
+                        notify("claim", self._to_claim(payload).model_dump(mode="json"))
+                    else:
+                        result = payload
+            if deadline is not None and result.get("degraded") and deadline.expired:
+                # Prazo esgotado durante a análise: só heurísticas locais
+                deadline.degrade("analysis")
+            return result
+        
+        async def speculative_search(run: PipelineRun) -> List[Source]:
+            return await self._speculative_search(content, language, head_search)
+        
+        async def consistency(run: PipelineRun) -> List[str]:
+            result = await gemini_service.check_consistency(content)
+            issues = result.get("inconsistencies", []) + result.get("logical_issues", [])
+            flags = [f"Inconsistência: {issue}" for issue in issues if issue]
+            if flags:
+                notify("red_flags", flags)
+            return flags
+        
+        def verified(index: int, claim: Dict[str, Any]) -> None:
+            notify("claim_verified", {"index": index, **self._to_claim(claim).model_dump(mode="json")})
+        
+        async def sources(run: PipelineRun) -> List[Source]:
+            logger.info("🔍 Buscando fontes externas...")
+            found = []
+            if self._can_verify(deadline):
+                found = await self._search_claim_sources(run.value("analysis"), language, deadline, verified)
+            if found:
+                run.cancel("speculative_search")
+            else:
+                found = await self._speculative_sources(run.task("speculative_search"), deadline)
+            cited = len(published or [])
+            for source in self._with_citations(published or [], found)[cited:]:
+                notify("source", source.model_dump(mode="json"))
+            return found
+        
+        async def response(run: PipelineRun) -> FactCheckResponse:
             logger.info("📊 Consolidando análise...")
-            response = await self._build_response(
+            flags = run.value("red_flags")
+            if "consistency" in pipeline.stages:
+                flags = flags + (run.value("consistency") or [])
+            return await self._build_response(
                 request=request,
                 content=content,
-                gemini_analysis=gemini_analysis,
-                sources_checked=sources_checked,
-                red_flags=red_flags,
-                start_time=start_time
+                gemini_analysis=run.value("analysis"),
+                sources_checked=self._with_citations(
+                    published or [], run.value("sources") if "sources" in pipeline.stages else []
+                ),
+                red_flags=flags,
+                start_time=start_time,
+                degraded_stages=deadline.degraded if deadline else None
             )
+        
+        pipeline.add("red_flags", red_flags)
+        pipeline.add("analysis", analysis)
+        if request.check_sources:
+            pipeline.add("speculative_search", speculative_search, optional=True)
+            pipeline.add("sources", sources, depends_on=["analysis"])
+        if settings.CONSISTENCY_CHECK_ENABLED:
+            if deadline is None or deadline.allows(settings.DEADLINE_MIN_CONSISTENCY_SECONDS):
+                pipeline.add("consistency", consistency, optional=True)
+            else:
+                deadline.degrade("consistency")
+        pipeline.add(
+            "response", response,
+            depends_on=[name for name in pipeline.stages if name != "speculative_search"]
+        )
+        return pipeline
+    
+    @staticmethod
+    def _make_deadline(request: FactCheckRequest) -> Optional[Deadline]:
+        """
+        Cria o prazo da requisição a partir de deadline_ms
+        
+        Args:
+            request: Requisição de fact-checking
             
-            processing_time = time.time() - start_time
-            logger.info(f"✅ Fact-checking concluído em {processing_time:.2f}s")
+        Returns:
+            Prazo da requisição ou None se não houver
+        """
+        if not request.deadline_ms:
+            return None
+        return Deadline(request.deadline_ms / 1000)
+    
+    @staticmethod
+    def _stage_budget(deadline: Deadline) -> float:
+        """Tempo restante para uma etapa, descontada a reserva da resposta"""
+        return max(0.0, deadline.remaining() - settings.DEADLINE_RESPONSE_RESERVE_SECONDS)
+    
+    @staticmethod
+    def _can_verify(deadline: Optional[Deadline]) -> bool:
+        """
+        Indica se há tempo para verificar as afirmações (senão registra a etapa)
+        
+        Args:
+            deadline: Prazo da requisição
             
-            return response
+        Returns:
+            True se não há prazo ou ainda resta tempo suficiente
+        """
+        if deadline is None or deadline.allows(settings.DEADLINE_MIN_VERIFICATION_SECONDS):
+            return True
+        deadline.degrade("sources")
+        return False
+    
+    async def _speculative_sources(
+        self,
+        task: asyncio.Task,
+        deadline: Optional[Deadline]
+    ) -> list[Source]:
+        """
+        Aguarda a busca especulativa, limitada ao prazo da requisição
+        
+        Args:
+            task: Tarefa da busca geral iniciada junto com a análise
+            deadline: Prazo da requisição
             
-        except Exception as e:
-            logger.error(f"❌ Erro no fact-checking: {e}", exc_info=True)
-            raise
+        Returns:
+            Fontes encontradas (vazia se a busca não terminou a tempo)
+        """
+        timeout = None if deadline is None else self._stage_budget(deadline)
+        await asyncio.wait({task}, timeout=timeout)
+        if not task.done():
+            task.cancel()
+            deadline.degrade("sources")
+            return []
+        if task.cancelled():
+            return []
+        return task.result() or []
     
-    async def _preprocess_content(self, request: FactCheckRequest) -> str:
+    async def _published_factchecks(self, content: str, language: str = "pt") -> List[FactCheckMatch]:
+        """
+        Checagens publicadas que cobrem o conteúdo (índice local BM25)
+        
+        Args:
+            content: Conteúdo normalizado
+            language: Idioma do conteúdo (checagens em outro idioma são ignoradas)
+            
+        Returns:
+            Checagens com cobertura mínima para citação, da mais relevante
+            para a menos relevante
+        """
+        matches = await factcheck_index.search(
+            content, limit=settings.FACTCHECK_INDEX_MAX_CITATIONS, language=language
+        )
+        matches = [match for match in matches if match.coverage >= settings.FACTCHECK_INDEX_CITE_THRESHOLD]
+        if matches:
+            logger.info(f"📰 {len(matches)} checagens publicadas encontradas no índice local")
+        return matches
+    
+    async def _answer_from_factchecks(
+        self,
+        request: FactCheckRequest,
+        content: str,
+        published: List[FactCheckMatch],
+        start_time: float
+    ) -> Optional[FactCheckResponse]:
+        """
+        Responde com uma checagem publicada quando ela cobre o conteúdo todo
+        
+        O conteúdo e a checagem precisam compartilhar quase todos os termos
+        relevantes (FACTCHECK_INDEX_MATCH_THRESHOLD nos dois sentidos); a
+        resposta sai sem chamar o Gemini nem as APIs de busca.
+        
+        Args:
+            request: Requisição de fact-checking
+            content: Conteúdo normalizado
+            published: Checagens encontradas no índice
+            start_time: Timestamp de início
+            
+        Returns:
+            Resposta baseada na checagem ou None
+        """
+        threshold = settings.FACTCHECK_INDEX_MATCH_THRESHOLD
+        match = next(
+            (m for m in published if m.coverage >= threshold and m.query_coverage >= threshold),
+            None
+        )
+        if match is None:
+            return None
+        
+        publisher = match.publisher or "Uma agência de checagem"
+        date = f" em {match.published_at[:10]}" if match.published_at else ""
+        claim = {
+            "text": match.claim,
+            "veracity": match.veracity,
+            "confidence": round(min(match.coverage, match.query_coverage), 3),
+            "explanation": f"{publisher} classificou esta afirmação como \"{match.rating}\"{date}.",
+            "sources": [match.to_source()]
+        }
+        metrics.inc("factcheck_index_answers_total")
+        logger.info(f"📰 Conteúdo já checado por {publisher}: {match.rating}")
+        return await self._build_response(
+            request=request,
+            content=content,
+            gemini_analysis={
+                "claims": [claim],
+                "credibility_score": gemini_service.claims_credibility([claim]),
+                "summary": f"Este conteúdo já foi checado por {publisher}{date}: \"{match.rating}\".",
+                "red_flags": []
+            },
+            sources_checked=[m.to_source() for m in published],
+            red_flags=preprocessing_service.detect_red_flags(content),
+            start_time=start_time
+        )
+    
+    @staticmethod
+    def _with_citations(published: List[FactCheckMatch], sources: List[Source]) -> List[Source]:
+        """Checagens publicadas primeiro, seguidas das demais fontes sem URLs repetidas"""
+        citations = [match.to_source() for match in published]
+        seen = {source.url for source in citations}
+        return citations + [source for source in sources if not source.url or source.url not in seen]
+    
+    async def _prepare_content(
+        self,
+        request: FactCheckRequest,
+        head: Optional[asyncio.Task] = None
+    ) -> Tuple[str, str, str]:
+        """
+        Pré-processa e valida o conteúdo e calcula as chaves de cache
+        
+        Args:
+            request: Requisição de fact-checking
+            head: Leitura dos metadados da URL em andamento (ver _prefetch_url_head)
+            
+        Returns:
+            Tupla (conteúdo normalizado, namespace do cache, chave do cache)
+        """
+        logger.info("📝 Pré-processando conteúdo...")
+        content = await self._preprocess_content(request, head)
+        
+        if not preprocessing_service.is_valid_content(content):
+            raise ValueError("Conteúdo inválido ou muito curto para análise")
+        
+        cache_namespace = result_cache.make_namespace(
+            content_type=request.content_type.value,
+            language=request.language,
+            check_sources=request.check_sources,
+            model_name=gemini_service.model_signature,
+            prompt_version=PROMPT_VERSION
+        )
+        cache_key = result_cache.make_key(content, cache_namespace)
+        return content, cache_namespace, cache_key
+    
+    async def _store_result(
+        self,
+        content: str,
+        cache_key: str,
+        cache_namespace: str,
+        response: FactCheckResponse
+    ) -> None:
+        """
+        Guarda a resposta no cache e no índice de quase-duplicatas
+        (exceto respostas degradadas ou reduzidas pelo prazo)
+        
+        Args:
+            content: Conteúdo normalizado
+            cache_key: Chave exata do cache
+            cache_namespace: Parâmetros da análise
+            response: Resposta de fact-checking
+        """
+        if response.degraded or response.degraded_stages:
+            # Resultado provisório (IA indisponível ou prazo curto) não deve ser reaproveitado
+            return
+        
+        await result_cache.set(cache_key, response)
+        await near_duplicate_index.add(content, cache_key, cache_namespace)
+    
+    async def _lookup_cache(
+        self,
+        content: str,
+        cache_key: str,
+        cache_namespace: str,
+        start_time: float
+    ) -> Optional[FactCheckResponse]:
+        """
+        Busca um veredito já calculado para o conteúdo
+        
+        Tenta primeiro a chave exata e, em seguida, o índice de
+        quase-duplicatas (textos levemente editados).
+        
+        Args:
+            content: Conteúdo normalizado
+            cache_key: Chave exata do cache
+            cache_namespace: Parâmetros da análise
+            start_time: Timestamp de início
+            
+        Returns:
+            Resposta em cache ou None
+        """
+        similarity = 1.0
+        cached = await result_cache.get(cache_key)
+        
+        if not cached:
+            match = await near_duplicate_index.find(content, cache_namespace)
+            if match:
+                similar_key, similarity = match
+                cached = await result_cache.get(similar_key)
+        
+        if not cached:
+            return None
+        
+        cached_response, age = cached
+        logger.info(
+            f"⚡ Resultado servido do cache (idade: {age:.0f}s, similaridade: {similarity:.2f})"
+        )
+        return cached_response.model_copy(update={
+            "content": content[:500],
+            "cached": True,
+            "cache_age_seconds": round(age, 2),
+            "cache_similarity": round(similarity, 3),
+            "processing_time": round(time.time() - start_time, 2)
+        })
+    
+    async def _preprocess_content(
+        self,
+        request: FactCheckRequest,
+        head: Optional[asyncio.Task] = None
+    ) -> str:
         """
         Pré-processa o conteúdo baseado no tipo
         
         Args:
             request: Requisição de fact-checking
+            head: Leitura dos metadados da URL em andamento; se o corpo da
+                página não puder ser obtido, os metadados são analisados
             
         Returns:
             Conteúdo processado
@@ -92,6 +590,12 @@ class FactCheckService:
             logger.info(f"🌐 Buscando conteúdo da URL: {content}")
             url_content = await search_service.fetch_url_content(content)
             
+            if not url_content and head is not None:
+                page = await head
+                if page is not None and page.search_query:
+                    logger.warning("⚠️ Corpo da página indisponível; analisando apenas os metadados")
+                    url_content = page.as_content()
+            
             if not url_content:
                 raise ValueError(f"Não foi possível buscar conteúdo da URL: {content}")
             
@@ -132,52 +636,305 @@ class FactCheckService:
                 for i, frame in enumerate(frames_content, 1):
                     content += f"{i}. {frame.get('description', 'N/A')}\n"
         
-        # Limpar texto
-        content = preprocessing_service.clean_text(content)
+        # Limpar texto (o conteúdo de URLs já vem sem HTML do extrator)
+        content = preprocessing_service.clean_text(
+            content, strip_html=request.content_type != ContentType.URL
+        )
         
         return content
     
-    async def _search_external_sources(
+    async def _search_claim_sources(
         self,
-        content: str,
-        gemini_analysis: Dict[str, Any]
+        gemini_analysis: Dict[str, Any],
+        language: str = "pt",
+        deadline: Optional[Deadline] = None,
+        on_verified: Optional[Callable[[int, Dict[str, Any]], None]] = None
     ) -> list[Source]:
         """
-        Busca fontes externas para verificação
+        Busca fontes externas para as afirmações da análise
+        
+        Com CLAIM_VERIFICATION_ENABLED, cada afirmação é verificada em
+        paralelo com as próprias evidências; caso contrário, busca apenas
+        a primeira afirmação.
         
         Args:
-            content: Conteúdo a ser verificado
-            gemini_analysis: Análise do Gemini
+            gemini_analysis: Análise do Gemini (afirmações atualizadas no lugar)
+            language: Idioma do conteúdo
+            deadline: Prazo da requisição (limita a verificação)
+            on_verified: Chamado com (índice, afirmação) a cada verificação concluída
             
         Returns:
-            Lista de fontes encontradas
+            Lista de fontes encontradas (vazia se nenhuma afirmação teve fontes)
         """
-        sources = []
+        verified: Dict[int, Tuple[Dict[str, Any], bool]] = {}
+        if settings.CLAIM_VERIFICATION_ENABLED:
+            async for index, claim, grounded in self._verify_claims(gemini_analysis, language, deadline):
+                verified[index] = (claim, grounded)
+                if on_verified is not None:
+                    on_verified(index, claim)
         
-        # Extrair principais afirmações para buscar
-        claims = gemini_analysis.get("claims", [])
+        return await self._collect_sources(gemini_analysis, verified, language)
+    
+    async def _collect_sources(
+        self,
+        gemini_analysis: Dict[str, Any],
+        verified: Dict[int, Tuple[Dict[str, Any], bool]],
+        language: str
+    ) -> list[Source]:
+        """
+        Aplica as verificações na análise e reúne as fontes consultadas
         
-        if claims:
+        Args:
+            gemini_analysis: Análise do Gemini (afirmações atualizadas no lugar)
+            verified: Afirmações verificadas por índice, com indicação de
+                veredito fundamentado nas evidências
+            language: Idioma do conteúdo
+            
+        Returns:
+            Lista de fontes encontradas (sem URLs repetidas)
+        """
+        sources: List[Source] = []
+        
+        if verified:
+            await self._apply_verifications(gemini_analysis, verified, language)
+            seen = set()
+            for index in sorted(verified):
+                for source in verified[index][0].get("sources", []):
+                    key = source.url or source.title
+                    if key not in seen:
+                        seen.add(key)
+                        sources.append(source)
+        elif not settings.CLAIM_VERIFICATION_ENABLED:
             # Buscar fontes para a primeira afirmação (mais relevante)
-            main_claim = claims[0].get("text", "")
+            claims = gemini_analysis.get("claims", [])
+            main_claim = claims[0].get("text", "") if claims else ""
             if main_claim:
                 try:
-                    claim_sources = await search_service.search_sources(main_claim, max_results=3)
+                    claim_sources = await search_service.search_sources(main_claim, max_results=3, language=language)
                     sources.extend(claim_sources)
                 except Exception as e:
                     logger.error(f"Erro ao buscar fontes para afirmação: {e}")
         
-        # Se não encontrou fontes, buscar com o conteúdo geral (primeiras palavras)
-        if not sources:
-            query = " ".join(content.split()[:10])  # Primeiras 10 palavras
-            try:
-                general_sources = await search_service.search_sources(query, max_results=5)
-                sources.extend(general_sources)
-            except Exception as e:
-                logger.error(f"Erro ao buscar fontes gerais: {e}")
-        
         return sources
     
+    def _prefetch_url_head(
+        self,
+        request: FactCheckRequest
+    ) -> Tuple[Optional[asyncio.Task], Optional[asyncio.Task]]:
+        """
+        Começa a ler os metadados de uma URL em paralelo com o download do corpo
+        
+        Só o <head> é lido (og:title, JSON-LD NewsArticle...), o que costuma
+        terminar bem antes do corpo; com o título em mãos a busca de fontes
+        já pode começar enquanto a página ainda é baixada e analisada.
+        
+        Args:
+            request: Requisição de fact-checking
+            
+        Returns:
+            Tupla (leitura dos metadados, busca com os metadados), ou None
+            em cada posição quando não se aplica
+        """
+        if request.content_type != ContentType.URL or not settings.URL_HEAD_PREFETCH_ENABLED:
+            return None, None
+        
+        head = asyncio.ensure_future(search_service.fetch_page(request.content, head_only=True))
+        head_search = None
+        if request.check_sources:
+            head_search = asyncio.ensure_future(self._search_page_head(head, request.language))
+        return head, head_search
+    
+    async def _search_page_head(self, head: asyncio.Task, language: str = "pt") -> list[Source]:
+        """
+        Busca fontes com o título (ou descrição) da página
+        
+        Args:
+            head: Leitura dos metadados da URL
+            language: Idioma do conteúdo
+            
+        Returns:
+            Lista de fontes encontradas (vazia se não houver metadados)
+        """
+        page = await asyncio.shield(head)
+        if page is None or not page.search_query:
+            return []
+        logger.info(f"🏷️ Buscando fontes pelos metadados da página: {page.search_query[:80]}")
+        return await self._search_general_sources(page.search_query, language)
+    
+    async def _speculative_search(
+        self,
+        content: str,
+        language: str = "pt",
+        head_search: Optional[asyncio.Task] = None
+    ) -> list[Source]:
+        """
+        Busca geral que não depende da análise
+        
+        Usa a busca pelos metadados da URL quando houver resultado; senão
+        busca pelas primeiras palavras do conteúdo.
+        
+        Args:
+            content: Conteúdo normalizado
+            language: Idioma do conteúdo
+            head_search: Busca iniciada com os metadados da URL
+            
+        Returns:
+            Lista de fontes encontradas
+        """
+        if head_search is not None:
+            sources = await head_search
+            if sources:
+                return sources
+        return await self._search_general_sources(content, language)
+    
+    async def _search_general_sources(self, content: str, language: str = "pt") -> list[Source]:
+        """
+        Busca fontes com o conteúdo geral (primeiras palavras)
+        
+        Não depende da análise, então pode começar junto com ela e servir
+        de reserva quando as afirmações não trouxerem fontes.
+        
+        Args:
+            content: Conteúdo a ser verificado
+            language: Idioma do conteúdo
+            
+        Returns:
+            Lista de fontes encontradas
+        """
+        query = " ".join(content.split()[:10])  # Primeiras 10 palavras
+        try:
+            return await search_service.search_sources(query, max_results=5, language=language)
+        except Exception as e:
+            logger.error(f"Erro ao buscar fontes gerais: {e}")
+            return []
+    
+    async def _verify_claims(
+        self,
+        gemini_analysis: Dict[str, Any],
+        language: str,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any], bool]]:
+        """
+        Verifica as afirmações em paralelo, cada uma com sua própria busca
+        
+        Todas as verificações compartilham um único prazo
+        (CLAIM_VERIFICATION_TIMEOUT_SECONDS); as que não terminarem a
+        tempo são canceladas e a afirmação mantém o veredito original.
+        
+        Args:
+            gemini_analysis: Análise do Gemini
+            language: Idioma do conteúdo
+            deadline: Prazo da requisição (encurta o prazo das verificações)
+            
+        Yields:
+            Tuplas (índice da afirmação, afirmação verificada, veredito
+            fundamentado), na ordem em que ficam prontas
+        """
+        targets = [
+            (index, claim)
+            for index, claim in enumerate(gemini_analysis.get("claims", []))
+            if claim.get("text") and not claim.get("sources")
+        ][:settings.CLAIM_VERIFICATION_MAX_CLAIMS]
+        if not targets:
+            return
+        
+        logger.info(f"🔎 Verificando {len(targets)} afirmações com evidências...")
+        timeout = settings.CLAIM_VERIFICATION_TIMEOUT_SECONDS
+        if deadline is not None and self._stage_budget(deadline) < timeout:
+            timeout = self._stage_budget(deadline)
+        else:
+            deadline = None  # O prazo da requisição não limita esta etapa
+        
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + timeout
+        tasks = {
+            asyncio.ensure_future(self._verify_claim(claim, language)): index
+            for index, claim in targets
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = expires_at - loop.time()
+                if remaining <= 0:
+                    logger.warning(f"⏱️ Prazo de verificação esgotado; {len(pending)} afirmações sem evidências")
+                    if deadline is not None:
+                        deadline.degrade("sources")
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.error(f"Erro ao verificar afirmação: {e}")
+                        continue
+                    if result is not None:
+                        yield (tasks[task], *result)
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _verify_claim(
+        self,
+        claim: Dict[str, Any],
+        language: str
+    ) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """
+        Busca evidências para uma afirmação e reavalia o veredito
+        
+        Args:
+            claim: Afirmação da análise do Gemini
+            language: Idioma do conteúdo
+            
+        Returns:
+            Tupla (afirmação com fontes, veredito fundamentado) ou None se
+            nenhuma evidência foi encontrada
+        """
+        evidence = await search_service.search_evidence(
+            claim["text"], max_results=settings.CLAIM_VERIFICATION_SOURCES, language=language
+        )
+        if not evidence:
+            return None
+        
+        try:
+            return await gemini_service.verify_claim(claim, evidence, language), True
+        except (LLMOverloadedError, LLMUnavailableError) as e:
+            # Sem IA disponível: mantém o veredito original com as evidências
+            logger.warning(f"⚠️ Afirmação não reavaliada ({e}); mantendo veredito original")
+            return {**claim, "sources": evidence}, False
+    
+    async def _apply_verifications(
+        self,
+        gemini_analysis: Dict[str, Any],
+        verified: Dict[int, Tuple[Dict[str, Any], bool]],
+        language: str
+    ) -> None:
+        """
+        Substitui as afirmações verificadas e recalcula o score
+        
+        Args:
+            gemini_analysis: Análise do Gemini (atualizada no lugar)
+            verified: Afirmações verificadas por índice
+            language: Idioma do conteúdo
+        """
+        claims = list(gemini_analysis.get("claims", []))
+        for index, (claim, _) in verified.items():
+            claims[index] = claim
+        gemini_analysis["claims"] = claims
+        
+        grounded = [claim for claim, is_grounded in verified.values() if is_grounded]
+        if not grounded:
+            return
+        
+        # Vereditos fundamentados em evidências pesam metade do score final
+        score = gemini_analysis.get("credibility_score", 0.5)
+        gemini_analysis["credibility_score"] = round(
+            (score + gemini_service.claims_credibility(claims)) / 2, 3
+        )
+        if settings.CLAIM_STORE_ENABLED:
+            await claim_store.save(grounded, language)
+    
     async def _build_response(
         self,
         request: FactCheckRequest,
@@ -185,7 +942,8 @@ class FactCheckService:
         gemini_analysis: Dict[str, Any],
         sources_checked: list[Source],
         red_flags: list[str],
-        start_time: float
+        start_time: float,
+        degraded_stages: Optional[List[str]] = None
     ) -> FactCheckResponse:
         """
         Constrói a resposta final de fact-checking
@@ -197,21 +955,13 @@ class FactCheckService:
             sources_checked: Fontes verificadas
             red_flags: Sinais de alerta detectados
             start_time: Timestamp de início
+            degraded_stages: Etapas reduzidas para cumprir o prazo da requisição
             
         Returns:
             Resposta completa
         """
         # Converter claims do Gemini para modelo Claim
-        claims = []
-        for claim_data in gemini_analysis.get("claims", []):
-            claim = Claim(
-                text=claim_data.get("text", ""),
-                veracity=claim_data.get("veracity", "não verificável"),
-                confidence=claim_data.get("confidence", 0.5),
-                explanation=claim_data.get("explanation", ""),
-                sources=[]  # Fontes específicas por claim poderiam ser adicionadas
-            )
-            claims.append(claim)
+        claims = [self._to_claim(claim_data) for claim_data in gemini_analysis.get("claims", [])]
         
         # Determinar credibilidade geral
         credibility_score = gemini_analysis.get("credibility_score", 0.5)
@@ -233,11 +983,32 @@ class FactCheckService:
             claims=claims,
             sources_checked=sources_checked,
             red_flags=all_red_flags,
-            processing_time=round(processing_time, 2)
+            processing_time=round(processing_time, 2),
+            degraded=gemini_analysis.get("degraded", False),
+            degraded_stages=list(degraded_stages or [])
         )
         
         return response
     
+    @staticmethod
+    def _to_claim(claim_data: Dict[str, Any]) -> Claim:
+        """
+        Converte uma afirmação da análise do Gemini para o modelo Claim
+        
+        Args:
+            claim_data: Afirmação no formato retornado pelo Gemini
+            
+        Returns:
+            Afirmação validada
+        """
+        return Claim(
+            text=claim_data.get("text", ""),
+            veracity=claim_data.get("veracity", "não verificável"),
+            confidence=claim_data.get("confidence", 0.5),
+            explanation=claim_data.get("explanation", ""),
+            sources=claim_data.get("sources", [])
+        )
+    
     def _determine_credibility_level(self, score: float) -> CredibilityLevel:
         """
         Determina o nível de credibilidade baseado no score
@@ -1,38 +1,104 @@
 """
 Serviço de integração com Google Gemini API
 """
-import google.generativeai as genai
+import asyncio
 import logging
-import json
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 
 from app.config import settings
+from app.models import Claim, FactCheckResponse, Source
+from app.services.claim_store import claim_store
+from app.services.llm_client import LLMUnavailableError, llm_client
+from app.services.llm_scheduler import LLMOverloadedError, Priority
+from app.services.preprocessing import preprocessing_service
+from app.utils.batching import MicroBatcher
+from app.utils.deadline import current_deadline
+from app.utils.json_parser import LLMResponseError, parse_llm_json
+from app.utils.llm_schema import model_response_schema
+from app.utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+# Versão do prompt de fact-checking (altere ao mudar o prompt para invalidar o cache)
+PROMPT_VERSION = "2"
+
+# Schema da análise derivado do modelo de resposta (sem fontes, que vêm da busca)
+ANALYSIS_SCHEMA = model_response_schema(
+    FactCheckResponse,
+    fields=["credibility_score", "summary", "claims", "red_flags"],
+    exclude={"sources"}
+)
+ANALYSIS_SCHEMA["properties"]["recommendations"] = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": "Recomendações de fontes confiáveis para verificar as informações"
+}
+
+# Lote de análises: um objeto por conteúdo, identificado pelo índice
+BATCH_ANALYSIS_SCHEMA = {
+    "type": "array",
+    "items": {
+        **ANALYSIS_SCHEMA,
+        "properties": {"index": {"type": "integer"}, **ANALYSIS_SCHEMA["properties"]},
+        "required": ["index", *ANALYSIS_SCHEMA["required"]]
+    }
+}
+
+CLAIMS_SCHEMA = {"type": "array", "items": {"type": "string"}}
+
+# Veredito de uma única afirmação com base nas evidências encontradas
+VERIFICATION_SCHEMA = model_response_schema(
+    Claim,
+    fields=["veracity", "confidence", "explanation"],
+    exclude={"sources"}
+)
+
+CONSISTENCY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "is_consistent": {"type": "boolean"},
+        "inconsistencies": {"type": "array", "items": {"type": "string"}},
+        "logical_issues": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["is_consistent", "inconsistencies", "logical_issues"]
+}
+
+
+LANGUAGE_NAMES = {
+    "pt": "português",
+    "en": "inglês",
+    "es": "espanhol"
+}
+
 
 class GeminiService:
     """Serviço para interação com Gemini API"""
     
     def __init__(self):
         """Inicializa o serviço Gemini"""
-        if not settings.GEMINI_API_KEY:
+        self.model_name = settings.GEMINI_MODEL
+        self._batcher = MicroBatcher(
+            "analyze",
+            self._analyze_batch,
+            max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+            max_wait_ms=settings.MICRO_BATCH_MAX_WAIT_MS
+        )
+        
+        if not llm_client.available:
             logger.warning("GEMINI_API_KEY não configurada!")
-            self.model = None
             return
         
-        try:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel(settings.GEMINI_MODEL)
-            logger.info(f"✅ Gemini API inicializada com modelo: {settings.GEMINI_MODEL}")
-        except Exception as e:
-            logger.error(f"Erro ao inicializar Gemini API: {e}")
-            self.model = None
+        logger.info(f"✅ LLM ({llm_client.provider.name}) inicializado com modelo: {self.model_name}")
     
     async def analyze_content(self, content: str, language: str = "pt") -> Dict[str, Any]:
         """
         Analisa o conteúdo usando Gemini para fact-checking
         
+        Afirmações já verificadas anteriormente (repositório de afirmações)
+        são resolvidas localmente e removidas do prompt; apenas o restante
+        do conteúdo é enviado ao Gemini.
+        
         Args:
             content: Texto a ser analisado
             language: Idioma do conteúdo
@@ -40,37 +106,658 @@ class GeminiService:
         Returns:
             Dicionário com análise estruturada
         """
-        if not self.model:
+        known_claims: List[Dict[str, Any]] = []
+        pending_content = content
+        pending_sentences = 0
+        
+        if settings.CLAIM_STORE_ENABLED:
+            known_claims, pending_content, pending_sentences = await self._resolve_known_claims(content, language)
+            if known_claims and not pending_content:
+                logger.info(f"♻️ {len(known_claims)} afirmações já verificadas; análise local")
+                return self._analysis_from_known_claims(known_claims)
+        
+        if not llm_client.available:
             raise Exception("Gemini API não está configurada")
         
         try:
-            prompt = self._build_factcheck_prompt(content, language)
+            chunks = self._split_content(pending_content)
             
-            logger.info("🤖 Enviando requisição para Gemini API...")
-            response = self.model.generate_content(prompt)
+            if len(chunks) > 1:
+                # Conteúdo longo: trechos analisados em paralelo e combinados
+                logger.info(f"🧩 Conteúdo longo: análise em {len(chunks)} trechos paralelos")
+                outcomes = await asyncio.gather(
+                    *[
+                        self._analyze_chunk(chunk, language, (index, len(chunks)))
+                        for index, chunk in enumerate(chunks, 1)
+                    ],
+                    return_exceptions=True
+                )
+                result = self._reduce_chunk_analyses(chunks, outcomes)
+            elif settings.MICRO_BATCH_ENABLED and len(pending_content) <= settings.MICRO_BATCH_MAX_CHARS:
+                # Texto curto: agrupado com outros numa única chamada
+                try:
+                    result = await self._batcher.submit(pending_content, key=language)
+                except asyncio.TimeoutError as e:
+                    raise LLMUnavailableError("Prazo da requisição esgotado aguardando o lote") from e
+            else:
+                logger.info("🤖 Enviando requisição para Gemini API...")
+                result = await self._analyze_chunk(pending_content, language)
             
-            # Extrair e parsear resposta
-            result = self._parse_gemini_response(response.text)
             logger.info("✅ Análise do Gemini concluída")
             
-            return result
-            
+        except LLMOverloadedError:
+            raise
+        except LLMUnavailableError as e:
+            if not settings.LLM_DEGRADE_TO_HEURISTICS:
+                raise
+            logger.warning(f"⚠️ Gemini indisponível, respondendo com heurísticas locais: {e}")
+            return self._degraded_analysis(pending_content, known_claims, pending_sentences)
         except Exception as e:
             logger.error(f"Erro ao analisar conteúdo com Gemini: {e}")
             raise Exception(f"Erro na análise com Gemini: {str(e)}")
+        
+        if settings.CLAIM_STORE_ENABLED:
+            await claim_store.save(result["claims"], language)
+            if known_claims:
+                result = self._merge_known_claims(result, known_claims, pending_sentences)
+        
+        return result
     
-    def _build_factcheck_prompt(self, content: str, language: str) -> str:
-        """Constrói o prompt para fact-checking"""
+    async def analyze_content_stream(
+        self,
+        content: str,
+        language: str = "pt"
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Analisa o conteúdo em streaming, entregando cada afirmação assim que
+        a saída parcial do Gemini permite parseá-la
+        
+        Args:
+            content: Texto a ser analisado
+            language: Idioma do conteúdo
+            
+        Yields:
+            Tuplas ("claim", afirmação) e, por último, ("analysis", análise completa)
+        """
+        known_claims: List[Dict[str, Any]] = []
+        pending_content = content
+        pending_sentences = 0
+        
+        if settings.CLAIM_STORE_ENABLED:
+            known_claims, pending_content, pending_sentences = await self._resolve_known_claims(content, language)
+            for claim in known_claims:
+                yield "claim", dict(claim)
+            if known_claims and not pending_content:
+                yield "analysis", self._analysis_from_known_claims(known_claims)
+                return
+        
+        if not llm_client.available:
+            raise Exception("Gemini API não está configurada")
+        
+        chunks = self._split_content(pending_content)
+        if len(chunks) > 1:
+            # Conteúdo longo: afirmações entregues à medida que cada trecho conclui
+            logger.info(f"🧩 Conteúdo longo: análise em {len(chunks)} trechos paralelos (streaming)")
+            tasks = [
+                asyncio.ensure_future(self._analyze_chunk(chunk, language, (index, len(chunks))))
+                for index, chunk in enumerate(chunks, 1)
+            ]
+            emitted_texts = set()
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        analysis = await next_done
+                    except Exception:
+                        continue
+                    for claim in analysis["claims"]:
+                        key = preprocessing_service.normalize_for_matching(claim["text"])
+                        if key not in emitted_texts:
+                            emitted_texts.add(key)
+                            yield "claim", claim
+            finally:
+                for task in tasks:
+                    task.cancel()
+            
+            try:
+                result = self._reduce_chunk_analyses(
+                    chunks, [task.exception() or task.result() for task in tasks]
+                )
+            except LLMUnavailableError as e:
+                if not settings.LLM_DEGRADE_TO_HEURISTICS:
+                    raise
+                logger.warning(f"⚠️ Gemini indisponível, respondendo com heurísticas locais: {e}")
+                yield "analysis", self._degraded_analysis(pending_content, known_claims, pending_sentences)
+                return
+            async for item in self._finish_stream(result, known_claims, pending_sentences, language):
+                yield item
+            return
+        
+        prompt = self._build_factcheck_prompt(pending_content, language)
+        buffer = ""
+        emitted = 0
+        
+        logger.info("🤖 Enviando requisição (streaming) para Gemini API...")
+        try:
+            async for chunk in llm_client.stream(
+                prompt,
+                model_name=self.model_name,
+                priority=Priority.INTERACTIVE,
+                generation_config=llm_client.json_generation_config(ANALYSIS_SCHEMA)
+            ):
+                buffer += chunk
+                try:
+                    partial, _ = parse_llm_json(buffer, dict)
+                except LLMResponseError:
+                    continue
+                
+                # A última afirmação parcial só é entregue quando a seguinte começa
+                claims = self._parse_gemini_response(partial)["claims"]
+                for claim in claims[emitted:len(claims) - 1]:
+                    yield "claim", claim
+                    emitted += 1
+        except LLMUnavailableError as e:
+            # Afirmações já entregues não podem ser substituídas pelo resultado degradado
+            if not settings.LLM_DEGRADE_TO_HEURISTICS or emitted:
+                raise
+            logger.warning(f"⚠️ Gemini indisponível, respondendo com heurísticas locais: {e}")
+            yield "analysis", self._degraded_analysis(pending_content, known_claims, pending_sentences)
+            return
+        
+        metrics.inc("llm_responses_total", operation="analyze_stream")
+        try:
+            data, repaired = parse_llm_json(buffer, dict)
+        except LLMResponseError:
+            metrics.inc("llm_parse_failures_total", operation="analyze_stream")
+            raise
+        if repaired:
+            metrics.inc("llm_parse_repaired_total", operation="analyze_stream")
+        
+        result = self._parse_gemini_response(data)
+        for claim in result["claims"][emitted:]:
+            yield "claim", claim
+        
+        async for item in self._finish_stream(result, known_claims, pending_sentences, language):
+            yield item
+    
+    async def _finish_stream(
+        self,
+        result: Dict[str, Any],
+        known_claims: List[Dict[str, Any]],
+        pending_sentences: int,
+        language: str
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Guarda os vereditos novos e entrega a análise final do streaming"""
+        if settings.CLAIM_STORE_ENABLED:
+            await claim_store.save(result["claims"], language)
+            if known_claims:
+                result = self._merge_known_claims(result, known_claims, pending_sentences)
+        
+        logger.info("✅ Análise do Gemini (streaming) concluída")
+        yield "analysis", result
+    
+    def _split_content(self, content: str) -> List[str]:
+        """
+        Divide conteúdo longo em trechos para análise paralela
+        
+        Args:
+            content: Texto a ser analisado
+            
+        Returns:
+            Lista de trechos (um único item se o conteúdo couber num prompt)
+        """
+        if not settings.CHUNKED_ANALYSIS_ENABLED:
+            return [content]
+        
+        # Acima do número máximo de trechos, aumentar o tamanho de cada um
+        max_tokens = max(
+            settings.CHUNK_MAX_TOKENS,
+            -(-len(content) // (4 * max(1, settings.CHUNK_MAX_COUNT)))
+        )
+        return preprocessing_service.split_into_chunks(content, max_tokens)
+    
+    async def _analyze_chunk(
+        self,
+        content: str,
+        language: str,
+        part: Optional[Tuple[int, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Analisa um trecho (ou o conteúdo inteiro) com o Gemini
+        
+        Args:
+            content: Texto a ser analisado
+            language: Idioma do conteúdo
+            part: (índice, total) quando o texto é um trecho de documento maior
+            
+        Returns:
+            Análise normalizada do trecho
+        """
+        deadline = current_deadline()
+        if deadline is not None and not deadline.allows(settings.DEADLINE_MIN_STRONG_MODEL_SECONDS):
+            # Pouco tempo até o prazo da requisição: apenas o modelo rápido
+            deadline.degrade("analysis")
+            return await self._run_tier("fast", content, language, part, settings.GEMINI_FAST_MODEL)
+        
+        if not settings.MODEL_CASCADE_ENABLED:
+            return await self._analyze_with_model(content, language, part, self.model_name)
+        
+        # Cascata: modelo rápido primeiro, modelo principal só se o resultado for incerto
+        try:
+            result = await self._run_tier(
+                "fast", content, language, part, settings.GEMINI_FAST_MODEL, retries=0
+            )
+            reason = self._escalation_reason(result)
+        except LLMOverloadedError:
+            raise
+        except LLMResponseError:
+            reason = "parse_error"
+        except Exception as e:
+            logger.warning(f"Falha no modelo rápido, escalando: {e}")
+            reason = "error"
+        
+        if reason is None:
+            metrics.inc("cascade_resolved_total", tier="fast")
+            return result
+        
+        deadline = current_deadline()
+        short_on_time = deadline is not None and not deadline.allows(settings.DEADLINE_MIN_STRONG_MODEL_SECONDS)
+        if short_on_time and reason not in ("error", "parse_error"):
+            # Sem tempo para o modelo principal: fica o resultado incerto
+            deadline.degrade("analysis")
+            metrics.inc("cascade_resolved_total", tier="fast")
+            return result
+        
+        metrics.inc("cascade_escalations_total", reason=reason)
+        result = await self._run_tier("strong", content, language, part, self.model_name)
+        metrics.inc("cascade_resolved_total", tier="strong")
+        return result
+    
+    async def _run_tier(
+        self,
+        tier: str,
+        content: str,
+        language: str,
+        part: Optional[Tuple[int, int]],
+        model_name: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Executa uma camada da cascata registrando chamadas e latência"""
+        metrics.inc("cascade_requests_total", tier=tier)
+        started = time.monotonic()
+        try:
+            return await self._analyze_with_model(content, language, part, model_name, **kwargs)
+        finally:
+            metrics.observe("cascade_tier_seconds", time.monotonic() - started, tier=tier)
+    
+    async def _analyze_with_model(
+        self,
+        content: str,
+        language: str,
+        part: Optional[Tuple[int, int]],
+        model_name: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Analisa um trecho com um modelo específico
+        
+        Args:
+            content: Texto a ser analisado
+            language: Idioma do conteúdo
+            part: (índice, total) quando o texto é um trecho de documento maior
+            model_name: Modelo do Gemini a usar
+            **kwargs: Parâmetros repassados a generate_json (ex: retries)
+            
+        Returns:
+            Análise normalizada do trecho
+        """
+        response_data = await llm_client.generate_json(
+            self._build_factcheck_prompt(content, language, part),
+            operation="analyze_chunk" if part else "analyze",
+            schema=ANALYSIS_SCHEMA,
+            model_name=model_name,
+            priority=Priority.INTERACTIVE,
+            **kwargs
+        )
+        return self._parse_gemini_response(response_data)
+    
+    @staticmethod
+    def _escalation_reason(result: Dict[str, Any]) -> Optional[str]:
+        """
+        Motivo para escalar a análise do modelo rápido ao modelo principal
+        
+        Args:
+            result: Análise normalizada do modelo rápido
+            
+        Returns:
+            "uncertain_score", "low_confidence" ou None (resultado aceito)
+        """
+        score = result["credibility_score"]
+        if settings.CASCADE_UNCERTAIN_MIN <= score <= settings.CASCADE_UNCERTAIN_MAX:
+            return "uncertain_score"
+        if any(
+            claim["confidence"] < settings.CASCADE_MIN_CLAIM_CONFIDENCE
+            for claim in result["claims"]
+        ):
+            return "low_confidence"
+        return None
+    
+    @property
+    def model_signature(self) -> str:
+        """Identifica os modelos usados na análise (parte da chave de cache)"""
+        if settings.MODEL_CASCADE_ENABLED:
+            return f"{settings.GEMINI_FAST_MODEL}>{self.model_name}"
+        return self.model_name
+    
+    async def _analyze_batch(
+        self,
+        language: str,
+        contents: List[str]
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Analisa vários textos curtos numa única chamada ao Gemini
+        
+        Itens ausentes na resposta do lote são reanalisados individualmente.
+        
+        Args:
+            language: Idioma dos conteúdos
+            contents: Textos a serem analisados
+            
+        Returns:
+            Análise (ou exceção) de cada texto, na mesma ordem
+        """
+        by_index: Dict[int, Dict[str, Any]] = {}
+        tier = "fast" if settings.MODEL_CASCADE_ENABLED else None
+        
+        if len(contents) > 1:
+            logger.info(f"📦 Enviando lote de {len(contents)} textos para Gemini API...")
+            try:
+                items = await llm_client.generate_json(
+                    self._build_batch_prompt(contents, language),
+                    operation="analyze_batch",
+                    schema=BATCH_ANALYSIS_SCHEMA,
+                    expected=list,
+                    model_name=settings.GEMINI_FAST_MODEL if tier else self.model_name,
+                    priority=Priority.INTERACTIVE
+                )
+                for item in items:
+                    if isinstance(item, dict) and isinstance(item.get("index"), int):
+                        by_index[item.pop("index")] = item
+            except (LLMOverloadedError, LLMUnavailableError):
+                raise
+            except Exception as e:
+                logger.warning(f"Falha na análise em lote, analisando individualmente: {e}")
+        
+        results: List[Union[Dict[str, Any], BaseException, None]] = [
+            self._parse_gemini_response(by_index[index]) if index in by_index else None
+            for index in range(1, len(contents) + 1)
+        ]
+        metrics.inc("llm_batched_items_total", sum(result is not None for result in results))
+        
+        if tier:
+            # Itens incertos do lote (modelo rápido) seguem para o modelo principal
+            metrics.inc("cascade_requests_total", len(by_index), tier=tier)
+            escalated = []
+            for index, result in enumerate(results):
+                if result is None:
+                    continue
+                reason = self._escalation_reason(result)
+                if reason is None:
+                    metrics.inc("cascade_resolved_total", tier=tier)
+                else:
+                    metrics.inc("cascade_escalations_total", reason=reason)
+                    escalated.append(index)
+            if escalated:
+                strong = await asyncio.gather(
+                    *[
+                        self._run_tier("strong", contents[index], language, None, self.model_name)
+                        for index in escalated
+                    ],
+                    return_exceptions=True
+                )
+                for index, result in zip(escalated, strong):
+                    if not isinstance(result, BaseException):
+                        metrics.inc("cascade_resolved_total", tier="strong")
+                    results[index] = result
+        
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            retried = await asyncio.gather(
+                *[self._analyze_chunk(contents[index], language) for index in missing],
+                return_exceptions=True
+            )
+            for index, result in zip(missing, retried):
+                results[index] = result
+        
+        return results
+    
+    def _reduce_chunk_analyses(
+        self,
+        chunks: List[str],
+        outcomes: List[Union[Dict[str, Any], BaseException]]
+    ) -> Dict[str, Any]:
+        """
+        Combina as análises dos trechos numa análise do documento
         
-        language_names = {
-            "pt": "português",
-            "en": "inglês",
-            "es": "espanhol"
+        Afirmações repetidas entre trechos mantêm o veredito de maior
+        confiança; o score é a média ponderada pelo tamanho dos trechos.
+        
+        Args:
+            chunks: Trechos analisados
+            outcomes: Análise de cada trecho, ou a exceção que a impediu
+            
+        Returns:
+            Dicionário no mesmo formato de analyze_content
+        """
+        analyses = [
+            (chunk, outcome) for chunk, outcome in zip(chunks, outcomes)
+            if not isinstance(outcome, BaseException)
+        ]
+        if not analyses:
+            raise next(outcome for outcome in outcomes if isinstance(outcome, BaseException))
+        
+        metrics.inc("llm_chunked_analyses_total")
+        claims: Dict[str, Dict[str, Any]] = {}
+        red_flags: Dict[str, None] = {}
+        recommendations: Dict[str, None] = {}
+        summaries = []
+        weighted_score = 0.0
+        total_weight = 0
+        
+        for chunk, analysis in analyses:
+            for claim in analysis["claims"]:
+                key = preprocessing_service.normalize_for_matching(claim["text"])
+                if key not in claims or claim["confidence"] > claims[key]["confidence"]:
+                    claims[key] = claim
+            red_flags.update(dict.fromkeys(analysis["red_flags"]))
+            recommendations.update(dict.fromkeys(
+                item for item in analysis.get("recommendations") or [] if isinstance(item, str)
+            ))
+            if analysis.get("summary"):
+                summaries.append(analysis["summary"])
+            weighted_score += analysis["credibility_score"] * len(chunk)
+            total_weight += len(chunk)
+        
+        failed = len(chunks) - len(analyses)
+        if failed:
+            logger.warning(f"⚠️ {failed} de {len(chunks)} trechos não puderam ser analisados")
+            red_flags[f"{failed} de {len(chunks)} trechos do conteúdo não puderam ser analisados"] = None
+        
+        return {
+            "credibility_score": round(weighted_score / total_weight, 3),
+            "summary": f"Conteúdo longo analisado em {len(chunks)} trechos. " + " ".join(summaries),
+            "claims": list(claims.values()),
+            "red_flags": list(red_flags),
+            "recommendations": list(recommendations)
         }
-        lang_name = language_names.get(language, "português")
+    
+    async def _resolve_known_claims(
+        self,
+        content: str,
+        language: str
+    ) -> Tuple[List[Dict[str, Any]], str, int]:
+        """
+        Separa as sentenças do conteúdo que já têm veredito no repositório
+        
+        Args:
+            content: Texto a ser analisado
+            language: Idioma do conteúdo
+            
+        Returns:
+            Tupla (afirmações conhecidas, conteúdo pendente, nº de sentenças pendentes)
+        """
+        sentences = [
+            sentence for sentence in preprocessing_service.extract_sentences(content)
+            if len(sentence.split()) >= 4
+        ]
+        if not sentences:
+            return [], content, 0
+        
+        verdicts = await claim_store.lookup_many(sentences, language)
+        known = [verdict for verdict in verdicts if verdict is not None]
+        if not known:
+            return [], content, len(sentences)
+        
+        pending = [sentence for sentence, verdict in zip(sentences, verdicts) if verdict is None]
+        logger.info(f"♻️ {len(known)} de {len(sentences)} afirmações resolvidas localmente")
+        return known, ". ".join(pending) + ("." if pending else ""), len(pending)
+    
+    def _analysis_from_known_claims(self, known_claims: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Monta a análise apenas com vereditos já conhecidos
+        
+        Args:
+            known_claims: Afirmações resolvidas pelo repositório
+            
+        Returns:
+            Dicionário no mesmo formato de analyze_content
+        """
+        return {
+            "credibility_score": self.claims_credibility(known_claims),
+            "summary": (
+                f"Todas as {len(known_claims)} afirmações deste conteúdo já haviam sido "
+                "verificadas anteriormente. " + " ".join(
+                    claim["explanation"] for claim in known_claims[:2]
+                )
+            ).strip(),
+            "claims": [dict(claim) for claim in known_claims],
+            "red_flags": [],
+            "recommendations": []
+        }
+    
+    def _degraded_analysis(
+        self,
+        content: str,
+        known_claims: List[Dict[str, Any]],
+        pending_sentences: int
+    ) -> Dict[str, Any]:
+        """
+        Monta uma análise preliminar só com heurísticas locais (Gemini indisponível)
+        
+        Args:
+            content: Texto que seria enviado ao Gemini
+            known_claims: Afirmações resolvidas pelo repositório
+            pending_sentences: Número de sentenças sem veredito
+            
+        Returns:
+            Dicionário no mesmo formato de analyze_content, com "degraded" = True
+        """
+        metrics.inc("llm_degraded_responses_total")
+        red_flags = preprocessing_service.detect_red_flags(content)
+        result = {
+            "credibility_score": round(max(0.1, 0.5 - 0.1 * len(red_flags)), 3),
+            "summary": (
+                "A análise com IA está temporariamente indisponível. Resultado preliminar "
+                "baseado apenas em heurísticas locais; verifique novamente mais tarde."
+            ),
+            "claims": [],
+            "red_flags": red_flags,
+            "recommendations": [],
+            "degraded": True
+        }
+        if known_claims:
+            result = self._merge_known_claims(result, known_claims, pending_sentences)
+        return result
+    
+    def _merge_known_claims(
+        self,
+        result: Dict[str, Any],
+        known_claims: List[Dict[str, Any]],
+        pending_sentences: int
+    ) -> Dict[str, Any]:
+        """
+        Combina a análise do Gemini (conteúdo pendente) com vereditos conhecidos
+        
+        Args:
+            result: Análise do Gemini sobre o conteúdo pendente
+            known_claims: Afirmações resolvidas pelo repositório
+            pending_sentences: Número de sentenças enviadas ao Gemini
+            
+        Returns:
+            Análise combinada
+        """
+        total = len(known_claims) + max(pending_sentences, 1)
+        known_score = self.claims_credibility(known_claims)
+        result["credibility_score"] = round(
+            (result["credibility_score"] * max(pending_sentences, 1)
+             + known_score * len(known_claims)) / total,
+            3
+        )
+        result["claims"] = [dict(claim) for claim in known_claims] + result["claims"]
+        result["summary"] = (
+            f"{result['summary']} {len(known_claims)} afirmação(ões) já verificada(s) "
+            "anteriormente foram reaproveitadas."
+        )
+        return result
+    
+    @staticmethod
+    def claims_credibility(claims: List[Dict[str, Any]]) -> float:
+        """
+        Estima o score de credibilidade a partir dos vereditos das afirmações
+        
+        Args:
+            claims: Afirmações com veracity e confidence
+            
+        Returns:
+            Score entre 0 e 1
+        """
+        if not claims:
+            return 0.5
+        
+        scores = []
+        for claim in claims:
+            veracity = preprocessing_service.normalize_for_matching(claim.get("veracity", ""))
+            if "parcial" in veracity or "partial" in veracity:
+                base = 0.5
+            elif any(word in veracity for word in ("falso", "false", "enganoso", "misleading")):
+                base = 0.1
+            elif any(word in veracity for word in ("verdadeiro", "true", "correto")):
+                base = 0.95
+            else:
+                base = 0.5
+            confidence = float(claim.get("confidence", 0.5))
+            scores.append(confidence * base + (1 - confidence) * 0.5)
+        
+        return round(sum(scores) / len(scores), 3)
+    
+    def _build_factcheck_prompt(
+        self,
+        content: str,
+        language: str,
+        part: Optional[Tuple[int, int]] = None
+    ) -> str:
+        """Constrói o prompt para fact-checking"""
+        
+        lang_name = LANGUAGE_NAMES.get(language, "português")
+        
+        part_note = ""
+        if part:
+            part_note = (
+                f"\nEste é o trecho {part[0]} de {part[1]} de um documento maior. "
+                "Analise apenas as afirmações presentes neste trecho.\n"
+            )
         
         prompt = f"""Você é um especialista em verificação de fatos. Analise o seguinte conteúdo em {lang_name} e forneça uma análise detalhada.
-
+{part_note}
 CONTEÚDO A SER ANALISADO:
 {content}
 
@@ -105,60 +792,155 @@ IMPORTANTE:
 """
         return prompt
     
-    def _parse_gemini_response(self, response_text: str) -> Dict[str, Any]:
+    def _build_batch_prompt(self, contents: List[str], language: str) -> str:
+        """Constrói o prompt para fact-checking de vários textos curtos"""
+        
+        lang_name = LANGUAGE_NAMES.get(language, "português")
+        items = "\n\n".join(
+            f"[CONTEÚDO {index}]\n{content}" for index, content in enumerate(contents, 1)
+        )
+        
+        prompt = f"""Você é um especialista em verificação de fatos. Analise, de forma independente, cada um dos {len(contents)} conteúdos em {lang_name} abaixo.
+
+{items}
+
+Retorne um array JSON com exatamente um objeto por conteúdo, na mesma ordem:
+
+[
+  {{
+    "index": <número do conteúdo>,
+    "credibility_score": <número entre 0 e 1, onde 1 é totalmente confiável>,
+    "summary": "<resumo da análise do conteúdo em 1-2 frases>",
+    "claims": [
+      {{
+        "text": "<afirmação específica encontrada>",
+        "veracity": "<verdadeiro, falso, parcialmente verdadeiro, não verificável>",
+        "confidence": <número entre 0 e 1>,
+        "explanation": "<explicação da avaliação>"
+      }}
+    ],
+    "red_flags": ["<sinais de alerta encontrados neste conteúdo>"],
+    "recommendations": ["<fontes confiáveis para verificar as informações>"]
+  }}
+]
+
+IMPORTANTE:
+- Não misture afirmações ou sinais de alerta entre conteúdos diferentes
+- Seja objetivo e baseado em fatos
+- Responda APENAS com o JSON, sem texto adicional
+"""
+        return prompt
+    
+    def _parse_gemini_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Parseia a resposta do Gemini
+        Normaliza a análise retornada pelo Gemini
         
         Args:
-            response_text: Texto da resposta do Gemini
+            data: JSON já parseado da resposta do Gemini
             
         Returns:
             Dicionário com dados estruturados
         """
+        result = dict(data)
+        
+        # Afirmações cortadas (resposta truncada) sem veredito são descartadas
+        claims = [
+            claim for claim in result.get("claims") or []
+            if isinstance(claim, dict) and claim.get("text") and claim.get("veracity")
+        ]
+        for claim in claims:
+            claim["confidence"] = self._clamp_score(claim.get("confidence"), 0.5)
+        result["claims"] = claims
+        
+        # Sem score explícito (resposta reparada), estimar pelas afirmações
+        result["credibility_score"] = self._clamp_score(
+            result.get("credibility_score"),
+            self.claims_credibility(claims)
+        )
+        result.setdefault("summary", "Análise realizada com sucesso.")
+        result["red_flags"] = [flag for flag in result.get("red_flags") or [] if isinstance(flag, str)]
+        result.setdefault("recommendations", [])
+        
+        return result
+    
+    @staticmethod
+    def _clamp_score(value: Any, default: float) -> float:
+        """Converte um score para float no intervalo [0, 1]"""
         try:
-            # Tentar extrair JSON da resposta
-            # Remover possíveis markdown code blocks
-            text = response_text.strip()
-            if text.startswith("```json"):
-                text = text[7:]
-            if text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
-            text = text.strip()
-            
-            # Parsear JSON
-            result = json.loads(text)
-            
-            # Validar campos essenciais
-            if "credibility_score" not in result:
-                result["credibility_score"] = 0.5
-            if "overall_credibility" not in result:
-                result["overall_credibility"] = "medium"
-            if "summary" not in result:
-                result["summary"] = "Análise realizada com sucesso."
-            if "claims" not in result:
-                result["claims"] = []
-            if "red_flags" not in result:
-                result["red_flags"] = []
-            if "recommendations" not in result:
-                result["recommendations"] = []
-            
-            return result
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Erro ao parsear resposta JSON do Gemini: {e}")
-            logger.debug(f"Resposta original: {response_text}")
+            return min(1.0, max(0.0, float(value)))
+        except (TypeError, ValueError):
+            return default
+    
+    async def verify_claim(
+        self,
+        claim: Dict[str, Any],
+        evidence: List[Source],
+        language: str = "pt"
+    ) -> Dict[str, Any]:
+        """
+        Reavalia uma afirmação com base nas evidências encontradas na busca
+        
+        Args:
+            claim: Afirmação com o veredito da análise inicial
+            evidence: Fontes com trechos relacionados à afirmação
+            language: Idioma do conteúdo
             
-            # Retornar análise básica em caso de erro
-            return {
-                "credibility_score": 0.5,
-                "overall_credibility": "medium",
-                "summary": "Não foi possível realizar análise estruturada completa.",
-                "claims": [],
-                "red_flags": ["Erro ao processar resposta da IA"],
-                "recommendations": []
-            }
+        Returns:
+            Afirmação com novo veredito e as fontes usadas
+        """
+        if settings.CLAIM_STORE_ENABLED:
+            # Mesma afirmação (ou paráfrase) já verificada com evidências:
+            # dispensa o LLM (vereditos só da análise inicial não têm fontes)
+            known = (await claim_store.lookup_many([claim["text"]], language, grounded_only=True))[0]
+            if known is not None:
+                metrics.inc("claim_verifications_reused_total")
+                logger.info(f"♻️ Afirmação já verificada reaproveitada: {known['text'][:80]}")
+                return {
+                    "text": claim["text"],
+                    "veracity": known["veracity"],
+                    "confidence": known["confidence"],
+                    "explanation": known["explanation"],
+                    # As citações [n] da explicação se referem às fontes guardadas
+                    "sources": [Source.model_validate(source) for source in known["sources"]]
+                }
+        
+        lang_name = LANGUAGE_NAMES.get(language, "português")
+        snippets = "\n".join(
+            f"[{index}] {source.title} ({source.url or 'sem URL'}): {source.summary or ''}"
+            for index, source in enumerate(evidence, 1)
+        )
+        prompt = f"""Você é um especialista em verificação de fatos. Avalie a afirmação abaixo, em {lang_name}, usando SOMENTE as evidências listadas.
+
+AFIRMAÇÃO:
+{claim["text"]}
+
+EVIDÊNCIAS:
+{snippets}
+
+Retorne um JSON no formato:
+{{
+  "veracity": "<verdadeiro, falso, parcialmente verdadeiro, não verificável>",
+  "confidence": <número entre 0 e 1>,
+  "explanation": "<explicação curta citando as evidências pelo número, ex: [1]>"
+}}
+
+Se as evidências não forem suficientes, responda "não verificável".
+"""
+        
+        data = await llm_client.generate_json(
+            prompt,
+            operation="verify_claim",
+            schema=VERIFICATION_SCHEMA,
+            model_name=self.model_name,
+            priority=Priority.INTERACTIVE
+        )
+        return {
+            "text": claim["text"],
+            "veracity": data.get("veracity") or claim.get("veracity", "não verificável"),
+            "confidence": self._clamp_score(data.get("confidence"), claim.get("confidence", 0.5)),
+            "explanation": data.get("explanation") or claim.get("explanation", ""),
+            "sources": evidence
+        }
     
     async def extract_claims(self, content: str) -> List[str]:
         """
@@ -170,7 +952,7 @@ IMPORTANTE:
         Returns:
             Lista de afirmações encontradas
         """
-        if not self.model:
+        if not llm_client.available:
             raise Exception("Gemini API não está configurada")
         
         try:
@@ -183,20 +965,14 @@ TEXTO:
 Formato esperado: ["afirmação 1", "afirmação 2", ...]
 """
             
-            response = self.model.generate_content(prompt)
-            
-            # Parsear resposta
-            text = response.text.strip()
-            if text.startswith("```json"):
-                text = text[7:]
-            if text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
-            text = text.strip()
-            
-            claims = json.loads(text)
-            return claims if isinstance(claims, list) else []
+            claims = await llm_client.generate_json(
+                prompt,
+                operation="extract_claims",
+                schema=CLAIMS_SCHEMA,
+                expected=list,
+                model_name=self.model_name
+            )
+            return [claim for claim in claims if isinstance(claim, str)]
             
         except Exception as e:
             logger.error(f"Erro ao extrair afirmações: {e}")
@@ -212,7 +988,7 @@ Formato esperado: ["afirmação 1", "afirmação 2", ...]
         Returns:
             Análise de consistência
         """
-        if not self.model:
+        if not llm_client.available:
             raise Exception("Gemini API não está configurada")
         
         try:
@@ -230,19 +1006,12 @@ Retorne um JSON no formato:
 }}
 """
             
-            response = self.model.generate_content(prompt)
-            
-            # Parsear resposta
-            text = response.text.strip()
-            if text.startswith("```json"):
-                text = text[7:]
-            if text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
-            text = text.strip()
-            
-            result = json.loads(text)
+            result = await llm_client.generate_json(
+                prompt,
+                operation="check_consistency",
+                schema=CONSISTENCY_SCHEMA,
+                model_name=self.model_name
+            )
             return result
             
         except Exception as e:
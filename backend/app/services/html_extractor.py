@@ -0,0 +1,392 @@
+"""
+Extração do conteúdo principal de páginas HTML (lxml incremental + densidade de texto)
+"""
+import json
+import logging
+import re
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from lxml import etree
+from lxml import html as lxml_html
+from pydantic import BaseModel
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Elementos que nunca fazem parte do corpo do artigo
+_BOILERPLATE_TAGS = (
+    "script", "style", "noscript", "template", "nav", "footer", "aside", "header",
+    "form", "button", "select", "iframe", "svg", "canvas", "figure", "menu", "dialog"
+)
+
+# Blocos que pontuam como parágrafo
+_PARAGRAPH_TAGS = ("p", "pre", "td", "blockquote")
+
+# Blocos que quebram linha no texto extraído
+_BLOCK_TAGS = frozenset((
+    "p", "div", "section", "article", "main", "pre", "blockquote", "td", "tr", "li",
+    "ul", "ol", "dl", "dt", "dd", "br", "h1", "h2", "h3", "h4", "h5", "h6", "table"
+))
+
+# Classes/ids de blocos periféricos (menus, comentários, anúncios...) e de conteúdo
+_UNLIKELY = re.compile(
+    r"comment|disqus|footer|nav|menu|sidebar|sponsor|\bads?\b|advert|banner|promo|"
+    r"share|social|related|recommend|newsletter|subscribe|cookie|gdpr|popup|modal|"
+    r"breadcrumb|pagination|pager|widget|outbrain|taboola|masthead",
+    re.IGNORECASE
+)
+_LIKELY = re.compile(r"article|body|content|entry|main|post|story|text|materia|noticia", re.IGNORECASE)
+
+# Peso inicial de cada tag candidata
+_TAG_WEIGHT = {
+    "article": 10, "main": 8, "div": 5, "section": 3, "pre": 3, "td": 3, "blockquote": 3,
+    "ol": -3, "ul": -3, "dl": -3, "li": -3, "form": -3, "th": -5,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5
+}
+
+# Tipos de JSON-LD que descrevem um artigo
+_ARTICLE_TYPES = ("NewsArticle", "Article", "ReportageNews", "BlogPosting", "AnalysisNewsArticle")
+
+# Abaixo disso o "artigo" encontrado provavelmente está errado
+_MIN_ARTICLE_CHARS = 200
+
+
+class ExtractedPage(BaseModel):
+    """Conteúdo principal e metadados de uma página"""
+    url: str = ""
+    title: Optional[str] = None
+    author: Optional[str] = None
+    published_at: Optional[str] = None
+    description: Optional[str] = None
+    text: str = ""
+    truncated: bool = False
+    head_only: bool = False
+
+    def as_content(self) -> str:
+        """
+        Texto enviado para a análise: metadados seguidos do corpo
+
+        A descrição só entra quando não há corpo (modo head-only ou página
+        sem artigo), já que normalmente repete o primeiro parágrafo.
+
+        Returns:
+            Conteúdo textual da página
+        """
+        fields = [("Título", self.title), ("Autor", self.author), ("Publicado em", self.published_at)]
+        if not self.text:
+            fields.append(("Descrição", self.description))
+        header = [f"{label}: {value}" for label, value in fields if value]
+        return "\n".join(header + ([""] if header and self.text else []) + ([self.text] if self.text else []))
+
+    @property
+    def search_query(self) -> Optional[str]:
+        """Consulta de busca derivada dos metadados (título ou descrição)"""
+        return self.title or self.description
+
+
+class HTMLExtractor:
+    """
+    Extrator do corpo de artigos.
+
+    O HTML é alimentado no parser lxml à medida que chega (com limite de
+    bytes), blocos periféricos são descartados e o bloco com maior
+    densidade de texto (pontuação no estilo Readability: parágrafos
+    longos e com vírgulas, poucos links) é escolhido como artigo.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = settings.URL_CONTENT_MAX_BYTES,
+        head_max_bytes: int = settings.URL_HEAD_MAX_BYTES
+    ):
+        """
+        Inicializa o extrator
+
+        Args:
+            max_bytes: Máximo de bytes lidos de uma página
+            head_max_bytes: Máximo de bytes lidos no modo head-only
+        """
+        self.max_bytes = max_bytes
+        self.head_max_bytes = head_max_bytes
+
+    async def extract_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        url: str = "",
+        encoding: Optional[str] = None
+    ) -> ExtractedPage:
+        """
+        Lê o corpo da resposta em partes e extrai o conteúdo
+
+        Args:
+            chunks: Partes do corpo da resposta
+            url: URL da página
+            encoding: Codificação informada no Content-Type (None = detectar)
+
+        Returns:
+            Página extraída
+        """
+        parser = lxml_html.HTMLParser(encoding=encoding, remove_comments=True, remove_pis=True)
+        received = 0
+        truncated = False
+        started = time.monotonic()
+
+        async for chunk in chunks:
+            if received + len(chunk) > self.max_bytes:
+                chunk = chunk[:self.max_bytes - received]
+                truncated = True
+            received += len(chunk)
+            parser.feed(chunk)
+            if truncated:
+                break
+
+        page = self._extract(self._close(parser), url)
+        page.truncated = truncated
+        metrics.observe("html_extract_seconds", time.monotonic() - started)
+        metrics.observe("html_extract_bytes", received)
+        return page
+
+    async def extract_head_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        url: str = "",
+        encoding: Optional[str] = None
+    ) -> ExtractedPage:
+        """
+        Lê apenas até o fim do <head> e extrai os metadados
+
+        A leitura para em "</head>" (ou no início do <body>), então o corpo
+        da página não chega a ser baixado.
+
+        Args:
+            chunks: Partes do corpo da resposta
+            url: URL da página
+            encoding: Codificação informada no Content-Type (None = detectar)
+
+        Returns:
+            Página só com metadados (text vazio, head_only=True)
+        """
+        parser = lxml_html.HTMLParser(encoding=encoding, remove_comments=True, remove_pis=True)
+        received = 0
+        tail = b""
+        started = time.monotonic()
+
+        async for chunk in chunks:
+            chunk = chunk[:self.head_max_bytes - received]
+            received += len(chunk)
+            parser.feed(chunk)
+            # Procura o fim do head também na emenda entre duas partes
+            window = (tail + chunk).lower()
+            if b"</head" in window or b"<body" in window or received >= self.head_max_bytes:
+                break
+            tail = window[-8:]
+
+        root = self._close(parser)
+        page = ExtractedPage(url=url, head_only=True, **(self.metadata(root) if root is not None else {}))
+        metrics.observe("html_head_extract_seconds", time.monotonic() - started)
+        metrics.observe("html_head_extract_bytes", received)
+        return page
+
+    def extract(self, html: str, url: str = "") -> ExtractedPage:
+        """
+        Extrai o conteúdo de um HTML já baixado
+
+        Args:
+            html: HTML da página
+            url: URL da página
+
+        Returns:
+            Página extraída
+        """
+        parser = lxml_html.HTMLParser(remove_comments=True, remove_pis=True)
+        parser.feed(html)
+        return self._extract(self._close(parser), url)
+
+    @staticmethod
+    def _close(parser: lxml_html.HTMLParser) -> Optional[lxml_html.HtmlElement]:
+        """Finaliza o parser (None se o documento estiver vazio)"""
+        try:
+            return parser.close()
+        except etree.XMLSyntaxError:
+            return None
+
+    def _extract(self, root: Optional[lxml_html.HtmlElement], url: str) -> ExtractedPage:
+        """Metadados e corpo do artigo a partir da árvore"""
+        if root is None:
+            return ExtractedPage(url=url)
+
+        page = ExtractedPage(url=url, **self.metadata(root))
+        self._strip_boilerplate(root)
+        body = root.find("body")
+        if body is None:
+            body = root
+
+        article = self._best_candidate(body)
+        text = self._text(article) if article is not None else ""
+        if len(text) < _MIN_ARTICLE_CHARS:
+            text = self._text(body)
+
+        page.text = text
+        return page
+
+    def metadata(self, root: lxml_html.HtmlElement) -> Dict[str, Optional[str]]:
+        """
+        Título, autor, data de publicação e descrição (JSON-LD, Open Graph e meta tags)
+
+        Args:
+            root: Raiz do documento
+
+        Returns:
+            Dicionário com title, author, published_at e description
+        """
+        meta: Dict[str, str] = {}
+        for element in root.iter("meta"):
+            key = (element.get("property") or element.get("name") or element.get("itemprop") or "").lower()
+            content = (element.get("content") or "").strip()
+            if key and content and key not in meta:
+                meta[key] = content
+
+        article = self._json_ld_article(root)
+        author = article.get("author")
+        if isinstance(author, list):
+            author = author[0] if author else None
+        if isinstance(author, dict):
+            author = author.get("name")
+
+        title = article.get("headline") or meta.get("og:title") or meta.get("twitter:title")
+        if not title:
+            title_element = root.find(".//title")
+            title = title_element.text_content() if title_element is not None else None
+
+        return {
+            "title": _clean(title),
+            "author": _clean(author if isinstance(author, str) else None)
+                or _clean(meta.get("author") or meta.get("article:author")),
+            "published_at": _clean(
+                article.get("datePublished") or meta.get("article:published_time")
+                or meta.get("date") or meta.get("pubdate") or meta.get("datepublished")
+            ),
+            "description": _clean(
+                article.get("description") or meta.get("og:description")
+                or meta.get("description") or meta.get("twitter:description")
+            )
+        }
+
+    @staticmethod
+    def _json_ld_article(root: lxml_html.HtmlElement) -> Dict:
+        """Primeiro objeto JSON-LD do tipo artigo (vazio se não houver)"""
+        for script in root.iter("script"):
+            if (script.get("type") or "").lower() != "application/ld+json" or not script.text:
+                continue
+            try:
+                data = json.loads(script.text)
+            except ValueError:
+                continue
+
+            items = data if isinstance(data, list) else [data]
+            while items:
+                item = items.pop(0)
+                if not isinstance(item, dict):
+                    continue
+                items.extend(item.get("@graph", []))
+                types = item.get("@type")
+                types = types if isinstance(types, list) else [types]
+                if any(t in _ARTICLE_TYPES for t in types):
+                    return item
+        return {}
+
+    @staticmethod
+    def _strip_boilerplate(root: lxml_html.HtmlElement) -> None:
+        """Remove menus, rodapés, anúncios, comentários e afins"""
+        doomed = list(root.iter(*_BOILERPLATE_TAGS))
+        for element in root.iter("div", "section", "ul", "ol", "table", "span", "p"):
+            marker = f"{element.get('class', '')} {element.get('id', '')}"
+            if marker.strip() and _UNLIKELY.search(marker) and not _LIKELY.search(marker):
+                doomed.append(element)
+
+        for element in doomed:
+            if element.getparent() is not None:
+                element.drop_tree()
+
+    def _best_candidate(self, body: lxml_html.HtmlElement) -> Optional[lxml_html.HtmlElement]:
+        """Bloco com maior pontuação de densidade de texto"""
+        scores: Dict[lxml_html.HtmlElement, float] = {}
+
+        for paragraph in body.iter(*_PARAGRAPH_TAGS):
+            text = _collapse(paragraph.text_content())
+            if len(text) < 25:
+                continue
+
+            score = 1 + text.count(",") + min(len(text) // 100, 3)
+            parent = paragraph.getparent()
+            for ancestor, share in ((parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)):
+                if ancestor is None or not isinstance(ancestor.tag, str):
+                    continue
+                if ancestor not in scores:
+                    scores[ancestor] = self._initial_score(ancestor)
+                scores[ancestor] += score * share
+
+        if not scores:
+            return None
+
+        # Blocos cheios de links (listas de chamadas, menus) perdem pontos
+        return max(scores, key=lambda element: scores[element] * (1 - self._link_density(element)))
+
+    @staticmethod
+    def _initial_score(element: lxml_html.HtmlElement) -> float:
+        """Pontuação inicial pela tag e pelas classes/ids"""
+        score = _TAG_WEIGHT.get(element.tag, 0)
+        marker = f"{element.get('class', '')} {element.get('id', '')}"
+        if _LIKELY.search(marker):
+            score += 25
+        if _UNLIKELY.search(marker):
+            score -= 25
+        return score
+
+    @staticmethod
+    def _link_density(element: lxml_html.HtmlElement) -> float:
+        """Fração do texto do bloco que está dentro de links"""
+        length = len(_collapse(element.text_content()))
+        if not length:
+            return 1.0
+        link_length = sum(len(_collapse(link.text_content())) for link in element.iter("a"))
+        return min(1.0, link_length / length)
+
+    @staticmethod
+    def _text(element: lxml_html.HtmlElement) -> str:
+        """Texto do bloco, com uma linha por parágrafo"""
+        parts: List[str] = []
+        for event, node in etree.iterwalk(element, events=("start", "end")):
+            is_element = isinstance(node.tag, str)
+            if event == "start":
+                if is_element and node.tag in _BLOCK_TAGS:
+                    parts.append("\n")
+                if is_element and node.text:
+                    parts.append(node.text)
+            else:
+                if is_element and node.tag in _BLOCK_TAGS:
+                    parts.append("\n")
+                if node is not element and node.tail:
+                    parts.append(node.tail)
+
+        lines = (_collapse(line) for line in "".join(parts).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+def _collapse(text: str) -> str:
+    """Junta espaços repetidos"""
+    return " ".join(text.split())
+
+
+def _clean(value: Optional[str]) -> Optional[str]:
+    """Normaliza um metadado textual (None se vazio)"""
+    if not value:
+        return None
+    return _collapse(str(value))[:300] or None
+
+
+# Instância global do extrator
+html_extractor = HTMLExtractor()
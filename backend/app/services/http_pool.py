@@ -0,0 +1,232 @@
+"""
+Pool de conexões HTTP compartilhado para todas as chamadas externas
+"""
+import asyncio
+import importlib.util
+import ipaddress
+import logging
+import time
+import urllib.request
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+import httpx
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PoolUsage:
+    """Requisições em andamento no pool (somadas entre os transportes do cliente)"""
+
+    def __init__(self, max_connections: Optional[int]):
+        """
+        Inicializa o contador
+
+        Args:
+            max_connections: Limite de conexões (None = sem limite)
+        """
+        self.max_connections = max_connections
+        self.active = 0
+
+    def acquire(self) -> None:
+        """Registra o início de uma requisição"""
+        self.active += 1
+        self._update_gauges()
+
+    def release(self) -> None:
+        """Registra o fim de uma requisição (corpo fechado ou falha)"""
+        self.active -= 1
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        """Atualiza as métricas de ocupação do pool"""
+        metrics.set_gauge("http_pool_active_requests", self.active)
+        if self.max_connections:
+            metrics.set_gauge("http_pool_utilization", min(1.0, self.active / self.max_connections))
+
+
+class _TrackedResponseStream(httpx.AsyncByteStream):
+    """Corpo da resposta que avisa quando é fechado (lido até o fim ou descartado)"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close: Optional[Callable[[], None]] = on_close
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                on_close, self._on_close = self._on_close, None
+                on_close()
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """
+    Transporte httpx com métricas do pool.
+
+    Pela extensão `trace` do httpcore, mede a espera por uma conexão do
+    pool (até começar a conectar ou a enviar a requisição), o tempo para
+    abrir uma conexão (DNS + TCP) e as conexões abertas por host. Uma
+    requisição conta como ativa até o corpo da resposta ser fechado, então
+    leituras em streaming ocupam o pool enquanto duram.
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits,
+        http2: bool = False,
+        proxy: Optional[str] = None,
+        usage: Optional[PoolUsage] = None
+    ):
+        """
+        Inicializa o transporte
+
+        Args:
+            limits: Limites de conexões e keep-alive
+            http2: Se deve negociar HTTP/2 (requer o pacote h2)
+            proxy: URL do proxy (None = conexão direta)
+            usage: Contador de ocupação compartilhado entre transportes
+        """
+        super().__init__(limits=limits, http2=http2, proxy=proxy)
+        self.usage = usage or PoolUsage(limits.max_connections)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        started = time.monotonic()
+        connect_started = started
+        acquired = False
+        user_trace = request.extensions.get("trace")
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            nonlocal acquired, connect_started
+            if not acquired and event.endswith((".connect_tcp.started", ".send_request_headers.started")):
+                acquired = True
+                metrics.observe("http_pool_wait_seconds", time.monotonic() - started)
+            if event == "connection.connect_tcp.started":
+                connect_started = time.monotonic()
+            elif event == "connection.connect_tcp.complete":
+                metrics.observe("http_connect_seconds", time.monotonic() - connect_started, host=host)
+                metrics.inc("http_connections_opened_total", host=host)
+            if user_trace is not None:
+                result = user_trace(event, info)
+                if asyncio.iscoroutine(result):
+                    await result
+
+        request.extensions = {**request.extensions, "trace": trace}
+        self.usage.acquire()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                metrics.inc("http_errors_total", host=host, error=type(e).__name__)
+            self.usage.release()
+            raise
+
+        metrics.observe("http_request_seconds", time.monotonic() - started, host=host)
+        response.stream = _TrackedResponseStream(response.stream, self.usage.release)
+        return response
+
+
+def environment_proxy_mounts(
+    make_transport: Callable[[Optional[str]], httpx.AsyncBaseTransport]
+) -> Dict[str, Optional[httpx.AsyncBaseTransport]]:
+    """
+    Rotas de proxy das variáveis de ambiente (HTTP_PROXY, HTTPS_PROXY,
+    ALL_PROXY e NO_PROXY), como o httpx faz com `trust_env` sem transporte próprio
+
+    Args:
+        make_transport: Cria o transporte instrumentado para uma URL de proxy
+
+    Returns:
+        Mapa padrão de URL -> transporte (None = conexão direta)
+    """
+    proxies = urllib.request.getproxies()
+    mounts: Dict[str, Optional[httpx.AsyncBaseTransport]] = {}
+    for scheme in ("http", "https"):
+        url = proxies.get(scheme) or proxies.get("all")
+        if url:
+            mounts[f"{scheme}://"] = make_transport(url if "://" in url else f"http://{url}")
+
+    for host in (h.strip() for h in proxies.get("no", "").split(",")):
+        if not host:
+            continue
+        if host == "*":
+            return {}
+        if "://" in host:
+            mounts[host] = None
+            continue
+        try:
+            address = ipaddress.ip_address(host)
+            mounts[f"all://[{host}]" if address.version == 6 else f"all://{host}"] = None
+        except ValueError:
+            mounts[f"all://{host}" if host.lower() == "localhost" else f"all://*{host.lstrip('.')}"] = None
+    return mounts
+
+
+class HTTPPool:
+    """
+    Cliente HTTP único da aplicação.
+
+    Criado no startup (lifespan) e fechado no shutdown, mantém conexões
+    keep-alive e HTTP/2 entre buscas e downloads, evitando um handshake
+    TCP+TLS por chamada.
+    """
+
+    def __init__(self):
+        """Inicializa o pool (o cliente só é criado no primeiro uso ou no startup)"""
+        self._client: Optional[httpx.AsyncClient] = None
+        self.http2 = False
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente compartilhado (criado sob demanda fora do lifespan)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    async def start(self) -> None:
+        """Cria o cliente no startup da aplicação"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        logger.info(f"🌐 Pool HTTP iniciado (HTTP/2: {'sim' if self.http2 else 'não'})")
+
+    async def close(self) -> None:
+        """Fecha as conexões no shutdown da aplicação"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Monta o cliente com limites, timeouts e transporte instrumentado"""
+        self.http2 = settings.HTTP2_ENABLED
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("⚠️ Pacote h2 não instalado; usando HTTP/1.1 (pip install httpx[http2])")
+            self.http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS
+        )
+        usage = PoolUsage(limits.max_connections)
+
+        def make_transport(proxy: Optional[str] = None) -> InstrumentedTransport:
+            return InstrumentedTransport(limits, http2=self.http2, proxy=proxy, usage=usage)
+
+        # Com transporte próprio o httpx ignora os proxies do ambiente: repassados aqui
+        return httpx.AsyncClient(
+            transport=make_transport(),
+            mounts=environment_proxy_mounts(make_transport),
+            timeout=httpx.Timeout(10.0, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS)
+        )
+
+
+# Instância global do pool
+http_pool = HTTPPool()
@@ -0,0 +1,426 @@
+"""
+Cliente assíncrono compartilhado para chamadas ao LLM
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.config import settings
+from app.services.llm_providers import (
+    LLMProvider, LLMResponse, QuotaExceededError, TransientLLMError, create_provider
+)
+from app.services.llm_scheduler import LLMOverloadedError, LLMScheduler, Priority, llm_scheduler
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.deadline import remaining_time
+from app.utils.json_parser import LLMResponseError, parse_llm_json
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Erros transitórios que justificam nova tentativa
+RETRYABLE_ERRORS = (asyncio.TimeoutError, ConnectionError, TransientLLMError)
+
+
+class LLMUnavailableError(Exception):
+    """LLM indisponível (circuito aberto, prazo esgotado ou falhas repetidas)"""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = max(1.0, retry_after)
+
+
+class LLMClient:
+    """
+    Cliente único para o LLM.
+
+    Delega a geração ao provedor configurado (LLM_PROVIDER: Gemini ou o
+    provedor simulado) sem bloquear o event loop do uvicorn. Toda chamada
+    passa pelo escalonador (concorrência, cota por minuto e prioridade) e
+    pelo circuit breaker.
+    """
+
+    def __init__(
+        self,
+        provider: Optional[LLMProvider] = None,
+        scheduler: LLMScheduler = llm_scheduler
+    ):
+        """
+        Inicializa o cliente
+
+        Args:
+            provider: Provedor de LLM (usa LLM_PROVIDER se None)
+            scheduler: Escalonador que controla concorrência, cota e prioridade
+        """
+        self.provider = provider or create_provider()
+        self.scheduler = scheduler
+        self.breaker = CircuitBreaker(
+            self.provider.name,
+            failure_rate_threshold=settings.LLM_CIRCUIT_FAILURE_RATE,
+            min_calls=settings.LLM_CIRCUIT_MIN_CALLS,
+            window_seconds=settings.LLM_CIRCUIT_WINDOW_SECONDS,
+            reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS
+        )
+        self.in_flight = 0
+
+    @property
+    def available(self) -> bool:
+        """Indica se o cliente pode enviar requisições ao LLM"""
+        return self.provider.available
+
+    @staticmethod
+    def estimate_tokens(contents: Any) -> int:
+        """
+        Estima os tokens de uma chamada (entrada + saída esperada)
+
+        Args:
+            contents: Prompt (texto ou lista com texto/imagens)
+
+        Returns:
+            Número estimado de tokens
+        """
+        parts = contents if isinstance(contents, list) else [contents]
+        input_tokens = 0
+        for part in parts:
+            if isinstance(part, str):
+                input_tokens += len(part) // 4 + 1
+            else:
+                # Imagens custam um número fixo de tokens no Gemini
+                input_tokens += 258
+        return input_tokens + settings.LLM_ESTIMATED_OUTPUT_TOKENS
+
+    async def generate(
+        self,
+        contents: Any,
+        model_name: Optional[str] = None,
+        priority: Priority = Priority.DEFAULT,
+        **kwargs
+    ) -> str:
+        """
+        Gera conteúdo sem bloquear o event loop
+        
+        Cada tentativa tem um timeout próprio e todas respeitam o prazo
+        total da chamada. Erros transitórios são repetidos com backoff
+        exponencial e jitter; com LLM_HEDGING_ENABLED, uma cópia da
+        requisição é disparada quando a primeira passa do p95 de latência.
+
+        Args:
+            contents: Prompt (texto ou lista com texto/imagens)
+            model_name: Nome do modelo (usa GEMINI_MODEL se None)
+            priority: Prioridade da chamada na fila do escalonador
+            **kwargs: Parâmetros repassados ao provedor (generation_config)
+
+        Returns:
+            Texto da resposta do modelo
+
+        Raises:
+            LLMOverloadedError: Fila saturada ou cota do Gemini esgotada
+            LLMUnavailableError: Circuito aberto, prazo esgotado ou falhas repetidas
+        """
+        if not self.available:
+            raise Exception("Gemini API não está configurada")
+
+        name = model_name or settings.GEMINI_MODEL
+        # O prazo da requisição (deadline_ms), se menor, limita o prazo da chamada
+        budget = remaining_time(settings.LLM_DEADLINE_SECONDS)
+        request_bound = budget < settings.LLM_DEADLINE_SECONDS
+        deadline = time.monotonic() + budget
+        last_error: Optional[BaseException] = None
+
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            self._allow()
+            try:
+                response = await self._hedged_attempt(name, contents, priority, remaining, kwargs)
+            except asyncio.TimeoutError as e:
+                if request_bound and deadline - time.monotonic() <= 0.05:
+                    # Prazo da requisição esgotado: não é falha do serviço
+                    self.breaker.release()
+                    metrics.inc("llm_errors_total", model=name, error="RequestDeadline")
+                    last_error = e
+                    break
+                self.breaker.record_failure()
+                metrics.inc("llm_errors_total", model=name, error=type(e).__name__)
+                last_error = e
+            except RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                metrics.inc("llm_errors_total", model=name, error=type(e).__name__)
+                last_error = e
+            except LLMOverloadedError:
+                self.breaker.release()
+                raise
+            except asyncio.CancelledError:
+                # Etapa cancelada, prazo da verificação, hedge perdedor ou cliente
+                # desconectado: não é falha do serviço, mas a vaga de teste precisa voltar
+                self.breaker.release()
+                raise
+            except Exception:
+                # Erro do próprio pedido (ex: argumento inválido): o serviço respondeu
+                self.breaker.record_success()
+                raise
+            else:
+                self.breaker.record_success()
+                return response.text
+
+            if attempt < settings.LLM_MAX_RETRIES:
+                # Backoff exponencial com jitter completo, limitado ao prazo restante
+                delay = random.uniform(0, settings.LLM_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+                metrics.inc("llm_retries_total", model=name)
+                logger.warning(f"⚠️ Erro transitório do LLM ({last_error!r}), nova tentativa em {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        raise LLMUnavailableError(
+            f"LLM indisponível após {attempt + 1} tentativa(s): {last_error!r}",
+            self.breaker.retry_after()
+        ) from last_error
+
+    def _allow(self) -> None:
+        """Consulta o circuit breaker antes de uma tentativa"""
+        try:
+            self.breaker.allow()
+        except CircuitOpenError as e:
+            raise LLMUnavailableError(str(e), e.retry_after) from e
+
+    async def _hedged_attempt(
+        self,
+        name: str,
+        contents: Any,
+        priority: Priority,
+        remaining: float,
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """
+        Executa uma tentativa, com requisição duplicada se a primeira demorar
+        
+        A cópia só é disparada quando já há histórico de latência suficiente
+        e o escalonador tem vaga livre (sem fila), para não amplificar carga.
+        """
+        timeout = min(settings.LLM_TIMEOUT_SECONDS, remaining)
+        hedge_delay = self._hedge_delay(name)
+        if hedge_delay is None or hedge_delay >= timeout:
+            return await self._attempt(name, contents, priority, timeout, kwargs)
+
+        primary = asyncio.ensure_future(self._attempt(name, contents, priority, timeout, kwargs))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if done or self.scheduler.queue_depth or self.scheduler.active >= self.scheduler.max_concurrency:
+                return await primary
+
+            metrics.inc("llm_hedged_requests_total", model=name)
+            hedge = asyncio.ensure_future(
+                self._attempt(name, contents, priority, timeout - hedge_delay, kwargs)
+            )
+            tasks.add(hedge)
+
+            # Vale a primeira resposta bem-sucedida; erro só se ambas falharem
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            metrics.inc("llm_hedge_wins_total", model=name)
+                        return task.result()
+            return await primary
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        """Atraso da requisição duplicada (p95 de latência do modelo) ou None"""
+        if not settings.LLM_HEDGING_ENABLED:
+            return None
+        if metrics.get_count("llm_request_seconds", model=name) < settings.LLM_HEDGING_MIN_SAMPLES:
+            return None
+        return metrics.percentile("llm_request_seconds", 0.95, model=name)
+
+    async def _attempt(
+        self,
+        name: str,
+        contents: Any,
+        priority: Priority,
+        timeout: float,
+        kwargs: Dict[str, Any]
+    ) -> LLMResponse:
+        """Uma requisição ao provedor, com vaga no escalonador e timeout próprio"""
+        async with self.scheduler.slot(self.estimate_tokens(contents), priority) as reservation:
+            self.in_flight += 1
+            started = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    self.provider.generate(name, contents, **kwargs),
+                    timeout=timeout
+                )
+            except QuotaExceededError as e:
+                metrics.inc("llm_rejected_total", reason="upstream_quota")
+                raise LLMOverloadedError(f"Cota do LLM esgotada: {e}", self.scheduler.retry_after()) from e
+            finally:
+                self.in_flight -= 1
+
+            metrics.observe("llm_request_seconds", time.monotonic() - started, model=name)
+            reservation.report_usage(response.total_tokens)
+
+        return response
+
+    async def stream(
+        self,
+        contents: Any,
+        model_name: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Gera conteúdo em streaming, entregando os trechos conforme chegam
+        
+        Sem novas tentativas (trechos já entregues não podem ser desfeitos);
+        nenhum trecho pode demorar mais que LLM_TIMEOUT_SECONDS e o resultado
+        alimenta o circuit breaker.
+
+        Args:
+            contents: Prompt (texto ou lista com texto/imagens)
+            model_name: Nome do modelo (usa GEMINI_MODEL se None)
+            priority: Prioridade da chamada na fila do escalonador
+            **kwargs: Parâmetros repassados ao provedor (generation_config)
+
+        Yields:
+            Trechos de texto da resposta
+        """
+        if not self.available:
+            raise Exception("Gemini API não está configurada")
+
+        name = model_name or settings.GEMINI_MODEL
+        self._allow()
+
+        async with self.scheduler.slot(self.estimate_tokens(contents), priority):
+            self.in_flight += 1
+            chunks = self.provider.stream(name, contents, **kwargs).__aiter__()
+            request_bound = False
+            try:
+                while True:
+                    # O prazo da requisição (deadline_ms), se menor, limita a espera do trecho
+                    timeout = remaining_time(settings.LLM_TIMEOUT_SECONDS)
+                    request_bound = timeout < settings.LLM_TIMEOUT_SECONDS
+                    try:
+                        text = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    yield text
+            except asyncio.TimeoutError as e:
+                if request_bound and remaining_time(settings.LLM_TIMEOUT_SECONDS) <= 0.05:
+                    # Prazo da requisição esgotado: não é falha do serviço
+                    self.breaker.release()
+                    metrics.inc("llm_errors_total", model=name, error="RequestDeadline")
+                    raise LLMUnavailableError(f"Prazo da requisição esgotado: {e!r}") from e
+                self.breaker.record_failure()
+                metrics.inc("llm_errors_total", model=name, error=type(e).__name__)
+                raise LLMUnavailableError(f"LLM indisponível: {e!r}", self.breaker.retry_after()) from e
+            except QuotaExceededError as e:
+                self.breaker.release()
+                metrics.inc("llm_rejected_total", reason="upstream_quota")
+                raise LLMOverloadedError(f"Cota do LLM esgotada: {e}", self.scheduler.retry_after()) from e
+            except RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                raise LLMUnavailableError(f"LLM indisponível: {e!r}", self.breaker.retry_after()) from e
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+            finally:
+                self.in_flight -= 1
+                await chunks.aclose()
+
+    @staticmethod
+    def json_generation_config(
+        schema: Optional[Dict[str, Any]] = None,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Monta o generation_config para saída JSON
+
+        Args:
+            schema: Response schema esperado
+            generation_config: Configuração base a complementar
+
+        Returns:
+            Configuração com mime type e schema (se GEMINI_JSON_MODE)
+        """
+        config = dict(generation_config or {})
+        if settings.GEMINI_JSON_MODE:
+            config["response_mime_type"] = "application/json"
+            if schema is not None:
+                config["response_schema"] = schema
+        return config
+
+    async def generate_json(
+        self,
+        contents: Any,
+        operation: str,
+        schema: Optional[Dict[str, Any]] = None,
+        expected: Optional[type] = dict,
+        model_name: Optional[str] = None,
+        retries: int = settings.LLM_PARSE_RETRIES,
+        priority: Priority = Priority.DEFAULT,
+        **kwargs
+    ) -> Any:
+        """
+        Gera uma resposta JSON, com saída restrita ao schema quando suportado
+
+        Args:
+            contents: Prompt (texto ou lista com texto/imagens)
+            operation: Nome da operação (rótulo das métricas)
+            schema: Response schema esperado (ver app.utils.llm_schema)
+            expected: Tipo esperado do resultado (dict ou list)
+            model_name: Nome do modelo (usa GEMINI_MODEL se None)
+            retries: Novas tentativas quando a resposta não puder ser parseada
+            priority: Prioridade da chamada na fila do escalonador
+            **kwargs: Parâmetros repassados ao provedor
+
+        Returns:
+            Objeto parseado
+
+        Raises:
+            LLMResponseError: Se nenhuma tentativa produzir JSON válido
+            LLMOverloadedError: Fila saturada ou cota do Gemini esgotada
+            LLMUnavailableError: Circuito aberto, prazo esgotado ou falhas repetidas
+        """
+        generation_config = self.json_generation_config(
+            schema, kwargs.pop("generation_config", None)
+        )
+
+        for attempt in range(retries + 1):
+            text = await self.generate(
+                contents,
+                model_name=model_name,
+                priority=priority,
+                generation_config=generation_config or None,
+                **kwargs
+            )
+            metrics.inc("llm_responses_total", operation=operation)
+
+            try:
+                result, repaired = parse_llm_json(text, expected)
+            except LLMResponseError as e:
+                metrics.inc("llm_parse_failures_total", operation=operation)
+                if attempt < retries:
+                    metrics.inc("llm_parse_retries_total", operation=operation)
+                    logger.warning(f"Resposta inválida do Gemini ({operation}), repetindo: {e}")
+                    continue
+                raise
+
+            if repaired:
+                metrics.inc("llm_parse_repaired_total", operation=operation)
+            return result
+
+
+# Instância global do cliente
+llm_client = LLMClient()
@@ -0,0 +1,338 @@
+"""
+Provedores de LLM: Gemini e um provedor local simulado para testes de carga
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Optional
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TransientLLMError(Exception):
+    """Falha transitória do provedor (pode ser repetida)"""
+
+
+class QuotaExceededError(Exception):
+    """Cota do provedor esgotada"""
+
+
+class LLMResponse:
+    """Resposta de um provedor de LLM"""
+
+    def __init__(self, text: str, total_tokens: Optional[int] = None):
+        self.text = text
+        self.total_tokens = total_tokens
+
+
+class LLMProvider(ABC):
+    """Interface comum dos provedores de LLM"""
+
+    name = "base"
+
+    @property
+    def available(self) -> bool:
+        """Indica se o provedor pode receber requisições"""
+        return False
+
+    @abstractmethod
+    async def generate(
+        self,
+        model_name: str,
+        contents: Any,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> LLMResponse:
+        """
+        Gera uma resposta completa
+
+        Args:
+            model_name: Nome do modelo
+            contents: Prompt (texto ou lista com texto/imagens)
+            generation_config: Configuração de geração (mime type, schema etc)
+
+        Returns:
+            Texto gerado e tokens consumidos
+
+        Raises:
+            TransientLLMError: Falha transitória
+            QuotaExceededError: Cota esgotada
+        """
+
+    @abstractmethod
+    def stream(
+        self,
+        model_name: str,
+        contents: Any,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Gera a resposta em trechos, conforme ficam prontos
+
+        Args:
+            model_name: Nome do modelo
+            contents: Prompt (texto ou lista com texto/imagens)
+            generation_config: Configuração de geração (mime type, schema etc)
+
+        Yields:
+            Trechos de texto da resposta
+        """
+
+
+# Erros do Gemini tratados como transitórios
+_GEMINI_TRANSIENT_ERRORS = (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.Aborted,
+)
+
+
+class GeminiProvider(LLMProvider):
+    """Provedor Google Gemini (SDK google-generativeai)"""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str = settings.GEMINI_API_KEY):
+        """
+        Inicializa o provedor (a API só é configurada no primeiro uso)
+
+        Args:
+            api_key: Chave da API do Gemini
+        """
+        self.api_key = api_key
+        self._configured: Optional[bool] = None
+        self._models: Dict[str, genai.GenerativeModel] = {}
+
+    @property
+    def available(self) -> bool:
+        if self._configured is None:
+            self._configured = False
+            if self.api_key:
+                try:
+                    genai.configure(api_key=self.api_key)
+                    self._configured = True
+                except Exception as e:
+                    logger.error(f"Erro ao configurar Gemini API: {e}")
+        return self._configured
+
+    def _model(self, model_name: str) -> genai.GenerativeModel:
+        """Retorna (e reaproveita) a instância do modelo"""
+        model = self._models.get(model_name)
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            self._models[model_name] = model
+        return model
+
+    async def generate(
+        self,
+        model_name: str,
+        contents: Any,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> LLMResponse:
+        try:
+            response = await self._model(model_name).generate_content_async(
+                contents, generation_config=generation_config
+            )
+        except google_exceptions.ResourceExhausted as e:
+            raise QuotaExceededError(str(e)) from e
+        except _GEMINI_TRANSIENT_ERRORS as e:
+            raise TransientLLMError(f"{type(e).__name__}: {e}") from e
+
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(response.text, getattr(usage, "total_token_count", None))
+
+    async def stream(
+        self,
+        model_name: str,
+        contents: Any,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        try:
+            response = await self._model(model_name).generate_content_async(
+                contents, stream=True, generation_config=generation_config
+            )
+            async for chunk in response:
+                if chunk.parts:
+                    yield chunk.text
+        except google_exceptions.ResourceExhausted as e:
+            raise QuotaExceededError(str(e)) from e
+        except _GEMINI_TRANSIENT_ERRORS as e:
+            raise TransientLLMError(f"{type(e).__name__}: {e}") from e
+
+
+# Valores simulados para campos de texto livre com vocabulário conhecido
+_FAKE_CHOICES = {
+    "veracity": ["verdadeiro", "falso", "parcialmente verdadeiro", "não verificável"],
+}
+
+
+class FakeProvider(LLMProvider):
+    """
+    Provedor local e determinístico, para testes de carga sem rede ou cota.
+
+    As respostas seguem o `response_schema` pedido e dependem apenas do
+    prompt (mesmo prompt, mesma resposta). Latência e erros seguem a
+    distribuição configurada e a semente FAKE_LLM_SEED.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_ms: float = settings.FAKE_LLM_LATENCY_MS,
+        latency_distribution: str = settings.FAKE_LLM_LATENCY_DISTRIBUTION,
+        latency_spread: float = settings.FAKE_LLM_LATENCY_SPREAD,
+        error_rate: float = settings.FAKE_LLM_ERROR_RATE,
+        quota_error_rate: float = settings.FAKE_LLM_QUOTA_ERROR_RATE,
+        seed: int = settings.FAKE_LLM_SEED
+    ):
+        """
+        Inicializa o provedor simulado
+
+        Args:
+            latency_ms: Latência mediana em milissegundos
+            latency_distribution: "fixed", "uniform" ou "lognormal"
+            latency_spread: Dispersão (fração para uniform, sigma para lognormal)
+            error_rate: Probabilidade de erro transitório por chamada
+            quota_error_rate: Probabilidade de erro de cota por chamada
+            seed: Semente do gerador de latência e erros
+        """
+        if latency_distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Distribuição de latência desconhecida: {latency_distribution}")
+
+        self.latency = max(0.0, latency_ms) / 1000
+        self.latency_distribution = latency_distribution
+        self.latency_spread = max(0.0, latency_spread)
+        self.error_rate = error_rate
+        self.quota_error_rate = quota_error_rate
+        self._rng = random.Random(seed)
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    async def generate(
+        self,
+        model_name: str,
+        contents: Any,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> LLMResponse:
+        await asyncio.sleep(self._sample_latency())
+        self._inject_error()
+
+        prompt = self._prompt_text(contents)
+        text = self._render(prompt, generation_config)
+        return LLMResponse(text, (len(prompt) + len(text)) // 4 + 1)
+
+    async def stream(
+        self,
+        model_name: str,
+        contents: Any,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        latency = self._sample_latency()
+        # Primeiro trecho após parte da latência; o restante distribuído
+        await asyncio.sleep(latency * 0.3)
+        self._inject_error()
+
+        text = self._render(self._prompt_text(contents), generation_config)
+        pieces = [text[i:i + 64] for i in range(0, len(text), 64)] or [""]
+        for piece in pieces:
+            yield piece
+            await asyncio.sleep(latency * 0.7 / len(pieces))
+
+    def _sample_latency(self) -> float:
+        """Sorteia a latência de uma chamada em segundos"""
+        if self.latency_distribution == "uniform":
+            return self._rng.uniform(
+                self.latency * max(0.0, 1 - self.latency_spread),
+                self.latency * (1 + self.latency_spread)
+            )
+        if self.latency_distribution == "lognormal":
+            return self.latency * self._rng.lognormvariate(0, self.latency_spread)
+        return self.latency
+
+    def _inject_error(self) -> None:
+        """Sorteia erros de cota e transitórios conforme as taxas configuradas"""
+        draw = self._rng.random()
+        if draw < self.quota_error_rate:
+            raise QuotaExceededError("Cota simulada esgotada")
+        if draw < self.quota_error_rate + self.error_rate:
+            raise TransientLLMError("Erro transitório simulado")
+
+    @staticmethod
+    def _prompt_text(contents: Any) -> str:
+        """Extrai a parte textual do prompt (imagens são ignoradas)"""
+        parts = contents if isinstance(contents, list) else [contents]
+        return "\n".join(part for part in parts if isinstance(part, str))
+
+    def _render(self, prompt: str, generation_config: Optional[Dict[str, Any]]) -> str:
+        """Gera um JSON válido para o schema pedido, determinístico pelo prompt"""
+        schema = (generation_config or {}).get("response_schema")
+        if schema is None:
+            return "{}"
+
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        rng = random.Random(int.from_bytes(digest[:8], "big"))
+        # Lotes numerados ([CONTEÚDO n]) recebem um item por conteúdo
+        batch_size = len(re.findall(r"\[CONTEÚDO \d+\]", prompt))
+        return json.dumps(self._fake_value(schema, rng, "", batch_size), ensure_ascii=False)
+
+    def _fake_value(self, schema: Dict[str, Any], rng: random.Random, name: str, batch_size: int) -> Any:
+        """Gera recursivamente um valor compatível com o schema"""
+        if "enum" in schema:
+            return rng.choice(schema["enum"])
+
+        kind = schema.get("type", "string")
+        if kind == "object":
+            return {
+                prop: self._fake_value(sub, rng, prop, batch_size)
+                for prop, sub in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            items = schema.get("items", {"type": "string"})
+            if batch_size and "index" in items.get("properties", {}):
+                values = []
+                for index in range(1, batch_size + 1):
+                    value = self._fake_value(items, rng, name, 0)
+                    value["index"] = index
+                    values.append(value)
+                return values
+            return [self._fake_value(items, rng, name, 0) for _ in range(rng.randint(1, 3))]
+        if kind == "number":
+            return round(rng.random(), 3)
+        if kind == "integer":
+            return rng.randint(0, 10)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        if name in _FAKE_CHOICES:
+            return rng.choice(_FAKE_CHOICES[name])
+        return f"Conteúdo simulado ({name or 'texto'} #{rng.randint(1, 999)})"
+
+
+def create_provider(name: str = settings.LLM_PROVIDER) -> LLMProvider:
+    """
+    Cria o provedor de LLM configurado
+
+    Args:
+        name: "gemini" ou "fake"
+
+    Returns:
+        Instância do provedor
+    """
+    if name == "gemini":
+        return GeminiProvider()
+    if name == "fake":
+        logger.warning("🧪 Usando provedor de LLM simulado (LLM_PROVIDER=fake)")
+        return FakeProvider()
+    raise ValueError(f"Provedor de LLM desconhecido: {name}")
@@ -0,0 +1,266 @@
+"""
+Escalonador de chamadas ao LLM com prioridades e limites de cota
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.deadline import remaining_time
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Prioridade de uma chamada ao LLM (menor valor = atendida antes)"""
+    INTERACTIVE = 0  # Verificações de texto do usuário
+    DEFAULT = 1      # Chamadas auxiliares (consistência, imagens avulsas)
+    BATCH = 2        # Frames de vídeo e processamento em lote
+
+
+class LLMOverloadedError(Exception):
+    """Fila do LLM saturada ou cota do provedor esgotada"""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = max(1.0, retry_after)
+
+
+class TokenBucket:
+    """Balde de fichas com reposição contínua (limite por minuto)"""
+
+    def __init__(self, per_minute: float):
+        """
+        Inicializa o balde
+
+        Args:
+            per_minute: Fichas repostas por minuto (0 = sem limite)
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Tempo até haver fichas suficientes
+
+        Args:
+            amount: Fichas necessárias
+
+        Returns:
+            Segundos de espera (0 se já disponível)
+        """
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        # Pedidos maiores que a capacidade esperam o balde encher
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Consome fichas (pode ficar negativo ao corrigir estimativas)"""
+        if self.unlimited:
+            return
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Devolve (ou cobra, se negativo) a diferença entre estimativa e uso real"""
+        if self.unlimited:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class LLMScheduler:
+    """
+    Porta de entrada única para chamadas ao LLM.
+
+    Mantém filas por prioridade e libera cada chamada quando há vaga de
+    concorrência e fichas nos baldes de requisições e tokens por minuto.
+    Quando a fila está cheia, ou a espera passa do limite, a chamada é
+    recusada com `LLMOverloadedError` (HTTP 429 com Retry-After).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        requests_per_minute: int = settings.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = settings.LLM_TOKENS_PER_MINUTE,
+        max_queue_size: int = settings.LLM_MAX_QUEUE_SIZE,
+        queue_timeout: float = settings.LLM_QUEUE_TIMEOUT_SECONDS
+    ):
+        """
+        Inicializa o escalonador
+
+        Args:
+            max_concurrency: Máximo de chamadas simultâneas
+            requests_per_minute: Limite de requisições por minuto (0 = sem limite)
+            tokens_per_minute: Limite de tokens por minuto (0 = sem limite)
+            max_queue_size: Máximo de chamadas aguardando na fila
+            queue_timeout: Tempo máximo de espera na fila em segundos
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.active = 0
+
+        self._queue: List[Tuple[int, int, asyncio.Future, int]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Número de chamadas aguardando"""
+        return sum(1 for _, _, future, _ in self._queue if not future.done())
+
+    def retry_after(self) -> float:
+        """Estimativa em segundos até a fila atual ser escoada"""
+        depth = self.queue_depth + 1
+        if not self.requests.unlimited:
+            return math.ceil(depth / self.requests.rate)
+        return math.ceil(depth / self.max_concurrency)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        estimated_tokens: int,
+        priority: Priority = Priority.DEFAULT
+    ) -> AsyncIterator["_Reservation"]:
+        """
+        Reserva uma vaga para uma chamada ao LLM
+
+        Args:
+            estimated_tokens: Estimativa de tokens (entrada + saída) da chamada
+            priority: Prioridade da chamada
+
+        Yields:
+            Reserva, usada para informar o consumo real de tokens
+        """
+        await self._acquire(estimated_tokens, priority)
+        reservation = _Reservation(estimated_tokens)
+        try:
+            yield reservation
+        finally:
+            if reservation.actual_tokens is not None:
+                self.tokens.refund(estimated_tokens - reservation.actual_tokens)
+            self._release()
+
+    async def _acquire(self, estimated_tokens: int, priority: Priority) -> None:
+        """Entra na fila e aguarda a liberação"""
+        if self.queue_depth >= self.max_queue_size:
+            metrics.inc("llm_rejected_total", reason="queue_full")
+            raise LLMOverloadedError("Fila de análises cheia", self.retry_after())
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._queue, (int(priority), next(self._sequence), future, estimated_tokens))
+        self._update_gauges()
+        self._dispatch()
+
+        started = time.monotonic()
+        # A espera também respeita o prazo da requisição (deadline_ms)
+        timeout = remaining_time(self.queue_timeout)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Se a vaga foi liberada no mesmo instante do timeout, aproveitá-la
+            if not future.done() or future.cancelled():
+                future.cancel()
+                self._dispatch()
+                if timeout < self.queue_timeout:
+                    # Prazo da requisição esgotado na fila: quem chamou degrada
+                    metrics.inc("llm_rejected_total", reason="request_deadline")
+                    raise
+                metrics.inc("llm_rejected_total", reason="queue_timeout")
+                raise LLMOverloadedError("Tempo de espera na fila esgotado", self.retry_after())
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            else:
+                future.cancel()
+                self._dispatch()
+            raise
+
+        metrics.observe("llm_queue_wait_seconds", time.monotonic() - started, priority=priority.name.lower())
+
+    def _release(self) -> None:
+        """Libera a vaga de uma chamada concluída"""
+        self.active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Libera as chamadas do topo da fila enquanto houver vaga e cota"""
+        while self._queue and self.active < self.max_concurrency:
+            _, _, future, estimated_tokens = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+            if wait > 0:
+                self._schedule_dispatch(wait)
+                break
+
+            heapq.heappop(self._queue)
+            self.requests.take(1)
+            self.tokens.take(estimated_tokens)
+            self.active += 1
+            future.set_result(None)
+
+        self._update_gauges()
+
+    def _schedule_dispatch(self, delay: float) -> None:
+        """Agenda nova tentativa de despacho quando o balde tiver fichas"""
+        if self._timer is not None and not self._timer.cancelled():
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, self._dispatch)
+
+    def _update_gauges(self) -> None:
+        """Atualiza as métricas de profundidade da fila"""
+        depth = {priority: 0 for priority in Priority}
+        for priority, _, future, _ in self._queue:
+            if not future.done():
+                depth[Priority(priority)] += 1
+        for priority, count in depth.items():
+            metrics.set_gauge("llm_queue_depth", count, priority=priority.name.lower())
+        metrics.set_gauge("llm_active_requests", self.active)
+
+
+class _Reservation:
+    """Reserva de vaga retornada por `LLMScheduler.slot`"""
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: Optional[int] = None
+
+    def report_usage(self, total_tokens: Optional[int]) -> None:
+        """Informa os tokens realmente consumidos pela chamada"""
+        if total_tokens:
+            self.actual_tokens = total_tokens
+
+
+# Instância global do escalonador
+llm_scheduler = LLMScheduler()
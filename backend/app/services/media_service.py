@@ -1,13 +1,13 @@
 """
 Serviço de análise de mídia (imagens e vídeos)
 """
+import asyncio
 import logging
 import os
 import tempfile
 import base64
 from typing import Dict, Any, Optional, List
 from pathlib import Path
-import httpx
 
 # Imports condicionais para evitar erros se não instalado
 try:
@@ -33,11 +33,28 @@ except ImportError:
     MOVIEPY_AVAILABLE = False
     logging.warning("MoviePy não disponível. Extração de áudio limitada.")
 
-import google.generativeai as genai
 from app.config import settings
+from app.services.http_pool import http_pool
+from app.services.llm_client import LLMUnavailableError, llm_client
+from app.services.llm_scheduler import LLMOverloadedError, Priority
+from app.utils.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+IMAGE_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "description": {"type": "string"},
+        "contains_text": {"type": "boolean"},
+        "extracted_text": {"type": "string"},
+        "claims": {"type": "array", "items": {"type": "string"}},
+        "red_flags": {"type": "array", "items": {"type": "string"}},
+        "authenticity_score": {"type": "number"},
+        "context_needed": {"type": "string"}
+    },
+    "required": ["description", "contains_text", "claims", "red_flags", "authenticity_score"]
+}
+
 
 class MediaService:
     """Serviço para análise de imagens e vídeos"""
@@ -45,12 +62,12 @@ class MediaService:
     def __init__(self):
         """Inicializa o serviço de mídia"""
         self.temp_dir = tempfile.gettempdir()
+        self._image_inflight = SingleFlight()
         
         # Configurar Gemini para visão
-        if settings.GEMINI_API_KEY:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
+        if llm_client.available:
             # Usar modelo com suporte a visão
-            self.vision_model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            self.vision_model = settings.GEMINI_VISION_MODEL
             logger.info("✅ Gemini Vision API inicializada")
         else:
             self.vision_model = None
@@ -60,6 +77,23 @@ class MediaService:
         """
         Analisa uma imagem (URL ou caminho local)
         
+        Análises simultâneas da mesma imagem são coalescidas em uma só.
+        
+        Args:
+            image_source: URL ou caminho da imagem
+            
+        Returns:
+            Dicionário com análise da imagem
+        """
+        return await self._image_inflight.do(
+            image_source.strip(),
+            lambda: self._analyze_image(image_source)
+        )
+    
+    async def _analyze_image(self, image_source: str) -> Dict[str, Any]:
+        """
+        Executa a análise de uma imagem
+        
         Args:
             image_source: URL ou caminho da imagem
             
@@ -98,6 +132,8 @@ class MediaService:
             else:
                 raise Exception("Nenhum método de análise de imagem disponível")
                 
+        except (LLMOverloadedError, LLMUnavailableError):
+            raise
         except Exception as e:
             logger.error(f"Erro ao analisar imagem: {e}")
             raise Exception(f"Erro na análise de imagem: {str(e)}")
@@ -133,13 +169,15 @@ class MediaService:
                 
                 # Analisar frames com Gemini
                 if self.vision_model and frames:
-                    frame_analyses = []
-                    for i, frame_path in enumerate(frames[:5]):  # Limitar a 5 frames
-                        frame_analysis = await self._analyze_image_with_gemini(frame_path)
-                        frame_analyses.append(frame_analysis)
+                    # Frames analisados em paralelo (limitado a 5 frames)
+                    # com prioridade de lote: verificações de texto passam na frente
+                    frame_analyses = await asyncio.gather(*[
+                        self._analyze_image_with_gemini(frame_path, priority=Priority.BATCH)
+                        for frame_path in frames[:5]
+                    ])
                     
                     # Consolidar análises
-                    analysis['frames_content'] = frame_analyses
+                    analysis['frames_content'] = list(frame_analyses)
             
             # Extrair e transcrever áudio
             if MOVIEPY_AVAILABLE:
@@ -156,16 +194,23 @@ class MediaService:
             
             return analysis
             
+        except (LLMOverloadedError, LLMUnavailableError):
+            raise
         except Exception as e:
             logger.error(f"Erro ao analisar vídeo: {e}")
             raise Exception(f"Erro na análise de vídeo: {str(e)}")
     
-    async def _analyze_image_with_gemini(self, image_path: str) -> Dict[str, Any]:
+    async def _analyze_image_with_gemini(
+        self,
+        image_path: str,
+        priority: Priority = Priority.DEFAULT
+    ) -> Dict[str, Any]:
         """
         Analisa imagem usando Gemini Vision
         
         Args:
             image_path: Caminho da imagem
+            priority: Prioridade da chamada na fila do LLM
             
         Returns:
             Análise da imagem
@@ -192,13 +237,18 @@ Forneça sua análise no formato JSON:
 Responda APENAS com o JSON, sem texto adicional."""
 
             # Gerar análise
-            response = self.vision_model.generate_content([prompt, image])
-            
-            # Parsear resposta
-            result = self._parse_json_response(response.text)
+            result = await llm_client.generate_json(
+                [prompt, image],
+                operation="analyze_image",
+                schema=IMAGE_ANALYSIS_SCHEMA,
+                model_name=self.vision_model,
+                priority=priority
+            )
             
             return result
             
+        except (LLMOverloadedError, LLMUnavailableError):
+            raise
         except Exception as e:
             logger.error(f"Erro ao analisar com Gemini Vision: {e}")
             return {
@@ -316,18 +366,17 @@ Responda APENAS com o JSON, sem texto adicional."""
             Caminho do arquivo baixado
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=30.0)
-                response.raise_for_status()
-                
-                # Salvar em arquivo temporário
-                ext = Path(url).suffix or '.jpg'
-                temp_path = os.path.join(self.temp_dir, f"downloaded_image{ext}")
-                
-                with open(temp_path, 'wb') as f:
-                    f.write(response.content)
-                
-                return temp_path
+            response = await http_pool.client.get(url, timeout=30.0)
+            response.raise_for_status()
+            
+            # Salvar em arquivo temporário
+            ext = Path(url).suffix or '.jpg'
+            temp_path = os.path.join(self.temp_dir, f"downloaded_image{ext}")
+            
+            with open(temp_path, 'wb') as f:
+                f.write(response.content)
+            
+            return temp_path
                 
         except Exception as e:
             logger.error(f"Erro ao baixar imagem: {e}")
@@ -344,50 +393,21 @@ Responda APENAS com o JSON, sem texto adicional."""
             Caminho do arquivo baixado
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=60.0)
-                response.raise_for_status()
-                
-                # Salvar em arquivo temporário
-                ext = Path(url).suffix or '.mp4'
-                temp_path = os.path.join(self.temp_dir, f"downloaded_video{ext}")
-                
-                with open(temp_path, 'wb') as f:
-                    f.write(response.content)
-                
-                return temp_path
+            response = await http_pool.client.get(url, timeout=60.0)
+            response.raise_for_status()
+            
+            # Salvar em arquivo temporário
+            ext = Path(url).suffix or '.mp4'
+            temp_path = os.path.join(self.temp_dir, f"downloaded_video{ext}")
+            
+            with open(temp_path, 'wb') as f:
+                f.write(response.content)
+            
+            return temp_path
                 
         except Exception as e:
             logger.error(f"Erro ao baixar vídeo: {e}")
             raise
-    
-    def _parse_json_response(self, text: str) -> Dict[str, Any]:
-        """
-        Parseia resposta JSON do Gemini
-        
-        Args:
-            text: Texto da resposta
-            
-        Returns:
-            Dicionário parseado
-        """
-        import json
-        
-        try:
-            # Limpar markdown
-            text = text.strip()
-            if text.startswith("```json"):
-                text = text[7:]
-            if text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
-            text = text.strip()
-            
-            return json.loads(text)
-        except json.JSONDecodeError:
-            logger.error(f"Erro ao parsear JSON: {text}")
-            return {}
 
 
 # Instância global do serviço
@@ -0,0 +1,279 @@
+"""
+Cache persistente de páginas baixadas (conteúdo extraído + validadores HTTP)
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.services.html_extractor import ExtractedPage
+from app.utils.cache import TTLCache
+from app.utils.helpers import canonical_url
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Download de uma URL com cabeçalhos extras (requisição condicional): devolve
+# a resposta e a página extraída (None quando o servidor responde 304)
+PageDownload = Callable[[str, Dict[str, str]], Awaitable[Tuple[httpx.Response, Optional[ExtractedPage]]]]
+
+
+class CachedPage:
+    """Conteúdo extraído de uma página e os validadores enviados pelo servidor"""
+
+    def __init__(
+        self,
+        url: str,
+        page: ExtractedPage,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        fetched_at: Optional[float] = None
+    ):
+        self.url = url
+        self.page = page
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+
+    @property
+    def has_validators(self) -> bool:
+        """Se a página pode ser revalidada com uma requisição condicional"""
+        return bool(self.etag or self.last_modified)
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Se a página pode ser servida sem nenhuma requisição"""
+        return time.time() - self.fetched_at < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Cabeçalhos If-None-Match / If-Modified-Since da revalidação"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """
+    Cache de páginas endereçado pela URL canônica.
+
+    Páginas são servidas do cache sem nenhuma requisição por `ttl` segundos.
+    Depois disso, as que têm ETag ou Last-Modified são revalidadas com uma
+    requisição condicional: um 304 devolve o conteúdo guardado sem baixar nem
+    parsear o HTML de novo, e uma falha na revalidação devolve a cópia
+    guardada (stale) em vez de perder a página. Como o result_cache, usa uma camada em memória e SQLite em
+    disco; entradas com mais de `max_age` segundos são descartadas.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.PAGE_CACHE_PATH,
+        ttl: float = settings.PAGE_CACHE_TTL_SECONDS,
+        max_age: float = settings.PAGE_CACHE_MAX_AGE_SECONDS,
+        max_items: int = settings.PAGE_CACHE_MAX_ITEMS,
+        enabled: bool = settings.PAGE_CACHE_ENABLED
+    ):
+        """
+        Inicializa o cache
+
+        Args:
+            path: Caminho do arquivo SQLite
+            ttl: Tempo em que páginas são servidas sem requisição
+            max_age: Tempo máximo que uma página fica guardada
+            max_items: Máximo de páginas na camada em memória
+            enabled: Se o cache está habilitado
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_age = max_age
+        self.enabled = enabled
+        self._memory = TTLCache(max_items=max_items, ttl=max_age)
+
+        if self.enabled:
+            try:
+                self._init_db()
+            except Exception as e:
+                logger.error(f"Erro ao inicializar cache de páginas ({path}): {e}")
+                self.path = None
+
+    async def get_or_fetch(self, url: str, download: PageDownload) -> ExtractedPage:
+        """
+        Retorna o conteúdo da página, revalidando ou baixando quando necessário
+
+        Args:
+            url: URL pedida
+            download: Função que faz o GET e extrai o conteúdo (recebe URL e
+                cabeçalhos extras)
+
+        Returns:
+            Página extraída
+
+        Raises:
+            httpx.HTTPError: Falha no download
+        """
+        if not self.enabled:
+            _, page = await download(url, {})
+            return page
+
+        key = canonical_url(url)
+        cached = await self.get(key)
+
+        if cached is not None and cached.is_fresh(self.ttl):
+            self._record("hit")
+            return cached.page
+
+        if cached is not None and cached.has_validators:
+            # Revalida direto na URL final, sem repetir redirecionamentos
+            try:
+                response, page = await download(cached.url, cached.conditional_headers())
+            except Exception as e:
+                logger.warning(f"⚠️ Falha ao revalidar {cached.url}, usando cópia em cache: {e}")
+                self._record("stale")
+                return cached.page
+            if page is None:
+                self._record("revalidated")
+                entry = CachedPage(
+                    cached.url, cached.page,
+                    etag=response.headers.get("etag") or cached.etag,
+                    last_modified=response.headers.get("last-modified") or cached.last_modified
+                )
+                await self.set(key, entry)
+                return entry.page
+        else:
+            response, page = await download(url, {})
+
+        self._record("miss")
+        if "no-store" not in response.headers.get("cache-control", "").lower():
+            entry = CachedPage(
+                str(response.url), page,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified")
+            )
+            await self.set(key, entry)
+            final_key = canonical_url(entry.url)
+            if final_key != key:
+                await self.set(final_key, entry)
+        return page
+
+    async def get(self, key: str) -> Optional[CachedPage]:
+        """
+        Busca uma página no cache
+
+        Args:
+            key: URL canônica
+
+        Returns:
+            Página guardada ou None
+        """
+        entry = self._memory.get(key)
+        if entry is None and self.path:
+            try:
+                entry = await asyncio.to_thread(self._db_get, key)
+            except Exception as e:
+                logger.error(f"Erro ao ler cache de páginas: {e}")
+                entry = None
+
+            if entry is not None:
+                self._memory.set(key, entry, ttl=self.max_age - (time.time() - entry.fetched_at))
+        return entry
+
+    async def set(self, key: str, entry: CachedPage) -> None:
+        """
+        Armazena uma página nas duas camadas
+
+        Args:
+            key: URL canônica
+            entry: Página com conteúdo e validadores
+        """
+        self._memory.set(key, entry)
+        if self.path:
+            try:
+                await asyncio.to_thread(self._db_set, key, entry)
+            except Exception as e:
+                logger.error(f"Erro ao gravar cache de páginas: {e}")
+
+    def _record(self, result: str) -> None:
+        """Contabiliza o resultado de uma consulta (hit, revalidated, stale, miss)"""
+        metrics.inc("page_cache_requests_total", result=result)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre uma conexão com o banco do cache"""
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self) -> None:
+        """Cria o diretório e a tabela do cache se necessário"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extracted_pages (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    page TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+            # Descartar páginas antigas de execuções anteriores
+            conn.execute(
+                "DELETE FROM extracted_pages WHERE fetched_at < ?",
+                (time.time() - self.max_age,)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _db_get(self, key: str) -> Optional[CachedPage]:
+        """Lê uma página válida do SQLite"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT url, page, etag, last_modified, fetched_at FROM extracted_pages WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[4] > self.max_age:
+                conn.execute("DELETE FROM extracted_pages WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            return CachedPage(
+                row[0], ExtractedPage.model_validate_json(row[1]), etag=row[2], last_modified=row[3], fetched_at=row[4]
+            )
+        finally:
+            conn.close()
+
+    def _db_set(self, key: str, entry: CachedPage) -> None:
+        """Grava uma página no SQLite"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO extracted_pages (key, url, page, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.url, entry.page.model_dump_json(), entry.etag, entry.last_modified, entry.fetched_at)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+# Instância global do cache de páginas
+page_cache = PageCache()
@@ -3,28 +3,43 @@ Serviço de pré-processamento de texto
 """
 import re
 import logging
+import unicodedata
 from typing import List, Dict, Any
 from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
+# Palavras sem valor de busca (já sem acento, como saem de normalize_for_matching)
+STOPWORDS = frozenset("""
+a o as os um uma uns umas de do da dos das em no na nos nas por pelo pela pelos pelas para pra
+com sem sob sobre entre ate apos e ou mas nem que se ja nao sim mais menos muito muita muitos
+muitas ao aos ele ela eles elas isso isto esse essa esses essas este esta estes estas aquele
+aquela seu sua seus suas meu minha eu tu voce voces nos vos lhe lhes foi era sao ser estar esta
+ter tem tinha ha como quando onde qual quais quem porque tambem so
+the an of to in on at by for with from and or but not no is are was were be been being it its
+this that these those as into than then there their they he she we you i do does did has have had
+""".split())
+
 
 class PreprocessingService:
     """Serviço para pré-processar e limpar texto"""
     
     @staticmethod
-    def clean_text(text: str) -> str:
+    def clean_text(text: str, strip_html: bool = True) -> str:
         """
         Limpa e normaliza o texto
         
         Args:
             text: Texto a ser limpo
+            strip_html: Se deve remover tags HTML (desnecessário para texto
+                que já saiu do extrator de páginas)
             
         Returns:
             Texto limpo
         """
         # Remover HTML tags se houver
-        text = BeautifulSoup(text, "html.parser").get_text()
+        if strip_html:
+            text = BeautifulSoup(text, "html.parser").get_text()
         
         # Remover URLs
         text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
@@ -37,6 +52,22 @@ class PreprocessingService:
         
         return text
     
+    @staticmethod
+    def normalize_for_matching(text: str) -> str:
+        """
+        Normaliza o texto para comparação (minúsculas, sem acentos e pontuação)
+        
+        Args:
+            text: Texto a ser normalizado
+            
+        Returns:
+            Texto normalizado
+        """
+        text = unicodedata.normalize("NFKD", text.lower())
+        text = "".join(c for c in text if not unicodedata.combining(c))
+        text = re.sub(r'[^\w\s]', ' ', text)
+        return re.sub(r'\s+', ' ', text).strip()
+    
     @staticmethod
     def extract_sentences(text: str) -> List[str]:
         """
@@ -56,6 +87,53 @@ class PreprocessingService:
         
         return sentences
     
+    @staticmethod
+    def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+        """
+        Divide o texto em trechos que cabem num orçamento de tokens
+        
+        Os cortes respeitam parágrafos e sentenças; só sentenças maiores que
+        o orçamento são cortadas entre palavras.
+        
+        Args:
+            text: Texto a ser dividido
+            max_tokens: Máximo de tokens por trecho (estimativa de 4 caracteres/token)
+            
+        Returns:
+            Lista de trechos, na ordem do texto
+        """
+        max_chars = max(1, max_tokens) * 4
+        if len(text) <= max_chars:
+            return [text]
+        
+        # Unidades indivisíveis com o separador que as precede
+        units = []
+        for paragraph in re.split(r'\n\s*\n', text):
+            separator = "\n\n"
+            for sentence in re.split(r'(?<=[.!?])\s+', paragraph.strip()):
+                while len(sentence) > max_chars:
+                    cut = sentence.rfind(" ", 0, max_chars)
+                    if cut <= 0:
+                        cut = max_chars
+                    units.append((separator, sentence[:cut]))
+                    sentence = sentence[cut:].strip()
+                    separator = " "
+                if sentence:
+                    units.append((separator, sentence))
+                    separator = " "
+        
+        chunks = []
+        current = ""
+        for separator, unit in units:
+            if current and len(current) + len(separator) + len(unit) > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}{separator}{unit}" if current else unit
+        if current:
+            chunks.append(current)
+        
+        return chunks
+    
     @staticmethod
     def detect_red_flags(text: str) -> List[str]:
         """
@@ -0,0 +1,215 @@
+"""
+Cache persistente de resultados de fact-checking
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from typing import Optional, Tuple
+
+from app.config import settings
+from app.models import FactCheckResponse
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Cache de respostas endereçado pelo conteúdo normalizado.
+
+    Duas camadas: LRU em memória com TTL (por processo) e SQLite em disco,
+    que sobrevive a reinícios e é compartilhado pelos workers do mesmo host.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.RESULT_CACHE_PATH,
+        ttl: float = settings.RESULT_CACHE_TTL_SECONDS,
+        max_items: int = settings.RESULT_CACHE_MAX_ITEMS,
+        enabled: bool = settings.RESULT_CACHE_ENABLED
+    ):
+        """
+        Inicializa o cache
+
+        Args:
+            path: Caminho do arquivo SQLite
+            ttl: Tempo de vida das entradas em segundos
+            max_items: Máximo de entradas na camada em memória
+            enabled: Se o cache está habilitado
+        """
+        self.path = path
+        self.ttl = ttl
+        self.enabled = enabled
+        self._memory = TTLCache(max_items=max_items, ttl=ttl)
+
+        if self.enabled:
+            try:
+                self._init_db()
+            except Exception as e:
+                logger.error(f"Erro ao inicializar cache em disco ({path}): {e}")
+                self.path = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre uma conexão com o banco do cache"""
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self) -> None:
+        """Cria o diretório e a tabela do cache se necessário"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS factcheck_results (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            # Descartar entradas expiradas de execuções anteriores
+            conn.execute(
+                "DELETE FROM factcheck_results WHERE created_at < ?",
+                (time.time() - self.ttl,)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_namespace(
+        content_type: str,
+        language: str,
+        check_sources: bool,
+        model_name: str,
+        prompt_version: str
+    ) -> str:
+        """
+        Monta a parte da chave que depende apenas dos parâmetros da análise
+
+        Args:
+            content_type: Tipo de conteúdo da requisição
+            language: Idioma da requisição
+            check_sources: Se a requisição busca fontes externas
+            model_name: Modelo usado na análise
+            prompt_version: Versão do prompt de fact-checking
+
+        Returns:
+            Namespace textual
+        """
+        return "|".join([
+            content_type, language, "1" if check_sources else "0",
+            model_name, prompt_version
+        ])
+
+    @staticmethod
+    def make_key(content: str, namespace: str) -> str:
+        """
+        Monta a chave do cache
+
+        Args:
+            content: Conteúdo já normalizado (saída de clean_text)
+            namespace: Parâmetros da análise (ver make_namespace)
+
+        Returns:
+            Chave hexadecimal (sha256)
+        """
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{content_hash}|{namespace}".encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Tuple[FactCheckResponse, float]]:
+        """
+        Busca um resultado no cache
+
+        Args:
+            key: Chave do cache
+
+        Returns:
+            Tupla (resposta, idade em segundos) ou None
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._memory.get(key)
+        if entry is None and self.path:
+            try:
+                entry = await asyncio.to_thread(self._db_get, key)
+            except Exception as e:
+                logger.error(f"Erro ao ler cache em disco: {e}")
+                entry = None
+
+            if entry is not None:
+                # Promover para a camada em memória com o TTL restante
+                remaining = self.ttl - (time.time() - entry[0])
+                self._memory.set(key, entry, ttl=remaining)
+
+        if entry is None:
+            return None
+
+        created_at, response_json = entry
+        response = FactCheckResponse.model_validate_json(response_json)
+        return response, max(0.0, time.time() - created_at)
+
+    async def set(self, key: str, response: FactCheckResponse) -> None:
+        """
+        Armazena um resultado nas duas camadas
+
+        Args:
+            key: Chave do cache
+            response: Resposta de fact-checking
+        """
+        if not self.enabled:
+            return
+
+        entry = (time.time(), response.model_dump_json())
+        self._memory.set(key, entry)
+
+        if self.path:
+            try:
+                await asyncio.to_thread(self._db_set, key, entry)
+            except Exception as e:
+                logger.error(f"Erro ao gravar cache em disco: {e}")
+
+    def _db_get(self, key: str) -> Optional[Tuple[float, str]]:
+        """Lê uma entrada válida do SQLite"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT created_at, response FROM factcheck_results WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[0] > self.ttl:
+                conn.execute("DELETE FROM factcheck_results WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            return row[0], row[1]
+        finally:
+            conn.close()
+
+    def _db_set(self, key: str, entry: Tuple[float, str]) -> None:
+        """Grava uma entrada no SQLite"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO factcheck_results (key, response, created_at) "
+                "VALUES (?, ?, ?)",
+                (key, entry[1], entry[0])
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# Instância global do cache
+result_cache = ResultCache()
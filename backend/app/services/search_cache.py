@@ -0,0 +1,201 @@
+"""
+Cache de resultados dos provedores de busca (economia de cota das APIs pagas)
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.models import Source
+from app.services.preprocessing import preprocessing_service
+from app.utils.cache import TTLCache
+from app.utils.metrics import metrics
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Busca real no provedor; exceções viram entrada negativa
+SearchFetch = Callable[[], Awaitable[List[Source]]]
+
+
+class _Entry:
+    """Resultado guardado de uma busca"""
+
+    def __init__(self, sources: List[Source], requested: int, fresh_for: float):
+        self.sources = sources
+        self.requested = requested
+        self.fresh_until = time.monotonic() + fresh_for
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.fresh_until
+
+    def covers(self, max_results: int) -> bool:
+        """Se a entrada atende a um pedido de `max_results` resultados"""
+        return self.requested >= max_results or len(self.sources) < self.requested
+
+
+class SearchCache:
+    """
+    Cache em memória por provedor, idioma e query normalizada.
+
+    Resultados ficam frescos por `ttl` segundos; depois disso, por mais
+    `stale_ttl` segundos, são servidos imediatamente enquanto uma única
+    atualização roda em segundo plano (stale-while-revalidate). Buscas
+    vazias e erros ficam guardados por `negative_ttl` segundos, para não
+    repetir chamadas que acabaram de falhar.
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.SEARCH_CACHE_TTL_SECONDS,
+        stale_ttl: float = settings.SEARCH_CACHE_STALE_SECONDS,
+        negative_ttl: float = settings.SEARCH_CACHE_NEGATIVE_TTL_SECONDS,
+        max_items: int = settings.SEARCH_CACHE_MAX_ITEMS,
+        enabled: bool = settings.SEARCH_CACHE_ENABLED
+    ):
+        """
+        Inicializa o cache
+
+        Args:
+            ttl: Tempo em que um resultado é considerado fresco (segundos)
+            stale_ttl: Tempo extra em que o resultado velho ainda é servido
+            negative_ttl: Tempo de vida de resultados vazios e erros
+            max_items: Máximo de entradas em memória
+            enabled: Se o cache está habilitado
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.enabled = enabled
+        self._memory = TTLCache(max_items=max_items, ttl=ttl + stale_ttl)
+        self._inflight = SingleFlight()
+        self._refreshing: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(provider: str, query: str, language: str) -> Tuple[str, str, str]:
+        """
+        Monta a chave de uma busca
+
+        Args:
+            provider: Nome do provedor
+            query: Termo de busca
+            language: Idioma da busca
+
+        Returns:
+            Chave (provedor, idioma, query normalizada)
+        """
+        return provider, language, preprocessing_service.normalize_for_matching(query)
+
+    async def get_or_fetch(
+        self,
+        provider: str,
+        query: str,
+        language: str,
+        max_results: int,
+        fetch: SearchFetch
+    ) -> List[Source]:
+        """
+        Retorna o resultado em cache ou executa a busca
+
+        Args:
+            provider: Nome do provedor
+            query: Termo de busca
+            language: Idioma da busca
+            max_results: Número máximo de resultados pedidos
+            fetch: Função que faz a busca real no provedor
+
+        Returns:
+            Fontes encontradas (vazia se a busca falhou)
+        """
+        if not self.enabled:
+            return await self._fetch(provider, fetch) or []
+
+        key = self.make_key(provider, query, language)
+        entry: Optional[_Entry] = self._memory.get(key)
+
+        if entry is not None and entry.covers(max_results):
+            if not entry.fresh:
+                # Velho mas dentro da janela: serve agora e atualiza em segundo plano
+                self._record(provider, "stale")
+                self._refresh(key, provider, max_results, fetch)
+            else:
+                self._record(provider, "negative" if not entry.sources else "hit")
+            return entry.sources[:max_results]
+
+        self._record(provider, "miss")
+        entry = await self._inflight.do(
+            key + (max_results,),
+            lambda: self._load(key, provider, max_results, fetch)
+        )
+        return entry.sources[:max_results]
+
+    async def _load(self, key: Tuple[str, str, str], provider: str, max_results: int, fetch: SearchFetch) -> _Entry:
+        """Executa a busca e guarda o resultado (entrada negativa se vazio ou erro)"""
+        sources = await self._fetch(provider, fetch) or []
+        entry = _Entry(sources, max_results, self.ttl if sources else self.negative_ttl)
+        # Entradas negativas não entram na janela de stale-while-revalidate
+        self._memory.set(key, entry, ttl=self.ttl + self.stale_ttl if sources else self.negative_ttl)
+        return entry
+
+    async def _fetch(self, provider: str, fetch: SearchFetch) -> Optional[List[Source]]:
+        """Chama o provedor, registrando latência e erros (None em caso de erro)"""
+        started = time.monotonic()
+        try:
+            return await fetch()
+        except Exception as e:
+            logger.error(f"Erro ao buscar em {provider}: {e}")
+            metrics.inc("search_errors_total", provider=provider)
+            return None
+        finally:
+            metrics.observe("search_provider_seconds", time.monotonic() - started, provider=provider)
+
+    def _refresh(
+        self,
+        key: Tuple[str, str, str],
+        provider: str,
+        max_results: int,
+        fetch: SearchFetch
+    ) -> None:
+        """Dispara uma única atualização em segundo plano por chave"""
+        if key in self._refreshing:
+            return
+
+        task = asyncio.ensure_future(self._revalidate(key, provider, max_results, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _revalidate(
+        self,
+        key: Tuple[str, str, str],
+        provider: str,
+        max_results: int,
+        fetch: SearchFetch
+    ) -> None:
+        """Atualiza uma entrada velha, mantendo-a se a nova busca falhar ou vier vazia"""
+        sources = await self._fetch(provider, fetch)
+        if not sources:
+            return
+        self._memory.set(key, _Entry(sources, max_results, self.ttl), ttl=self.ttl + self.stale_ttl)
+        metrics.inc("search_cache_refreshes_total", provider=provider)
+
+    def _record(self, provider: str, result: str) -> None:
+        """Atualiza contadores de acerto e a cota economizada"""
+        metrics.inc("search_cache_requests_total", provider=provider, result=result)
+        if result == "miss":
+            self.misses += 1
+        else:
+            self.hits += 1
+            # Cada acerto é uma chamada paga que não foi feita
+            metrics.inc("search_quota_saved_total", provider=provider)
+        metrics.set_gauge("search_cache_hit_ratio", round(self.hits / (self.hits + self.misses), 4))
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+# Instância global do cache de buscas
+search_cache = SearchCache()
@@ -0,0 +1,164 @@
+"""
+Provedores de busca externa: Google Custom Search, News API e Google Fact Check Tools
+"""
+import logging
+from abc import ABC, abstractmethod
+from typing import List
+
+from app.config import settings
+from app.models import Source
+from app.services.credibility_registry import credibility_registry
+from app.services.http_pool import http_pool
+
+logger = logging.getLogger(__name__)
+
+
+class SearchProvider(ABC):
+    """Interface comum dos provedores de busca"""
+
+    name = "base"
+
+    @property
+    def available(self) -> bool:
+        """Indica se o provedor está configurado"""
+        return False
+
+    @abstractmethod
+    async def search(self, query: str, max_results: int, language: str = "pt") -> List[Source]:
+        """
+        Busca fontes relacionadas à query
+
+        Args:
+            query: Termo de busca
+            max_results: Número máximo de resultados
+            language: Idioma da busca (pt, en, es)
+
+        Returns:
+            Lista de fontes
+        """
+
+
+class GoogleSearchProvider(SearchProvider):
+    """Google Custom Search API"""
+
+    name = "google"
+
+    @property
+    def available(self) -> bool:
+        return bool(settings.GOOGLE_SEARCH_API_KEY and settings.GOOGLE_SEARCH_ENGINE_ID)
+
+    async def search(self, query: str, max_results: int, language: str = "pt") -> List[Source]:
+        url = "https://www.googleapis.com/customsearch/v1"
+        params = {
+            "key": settings.GOOGLE_SEARCH_API_KEY,
+            "cx": settings.GOOGLE_SEARCH_ENGINE_ID,
+            "q": query,
+            "lr": f"lang_{language}",
+            "num": min(max_results, 10)
+        }
+
+        response = await http_pool.client.get(url, params=params, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
+
+        sources = []
+        for item in data.get("items", []):
+            source = Source(
+                title=item.get("title", ""),
+                url=item.get("link", ""),
+                credibility=credibility_registry.rate(item.get("link", "")),
+                relevance=0.8,
+                summary=item.get("snippet", "")
+            )
+            sources.append(source)
+
+        logger.info(f"✅ Google Search retornou {len(sources)} resultados")
+        return sources
+
+
+class NewsAPIProvider(SearchProvider):
+    """News API (notícias)"""
+
+    name = "news_api"
+
+    @property
+    def available(self) -> bool:
+        return bool(settings.NEWS_API_KEY)
+
+    async def search(self, query: str, max_results: int, language: str = "pt") -> List[Source]:
+        url = "https://newsapi.org/v2/everything"
+        params = {
+            "apiKey": settings.NEWS_API_KEY,
+            "q": query,
+            "pageSize": min(max_results, 20),
+            "language": language,
+            "sortBy": "relevancy"
+        }
+
+        response = await http_pool.client.get(url, params=params, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
+
+        sources = []
+        for article in data.get("articles", []):
+            source = Source(
+                title=article.get("title", ""),
+                url=article.get("url", ""),
+                credibility=credibility_registry.rate(article.get("url", "")),
+                relevance=0.7,
+                summary=article.get("description", "")
+            )
+            sources.append(source)
+
+        logger.info(f"✅ News API retornou {len(sources)} resultados")
+        return sources
+
+
+class FactCheckToolsProvider(SearchProvider):
+    """Google Fact Check Tools API (verificações já publicadas por agências)"""
+
+    name = "factcheck_tools"
+
+    @property
+    def available(self) -> bool:
+        return bool(settings.GOOGLE_FACTCHECK_API_KEY)
+
+    async def search(self, query: str, max_results: int, language: str = "pt") -> List[Source]:
+        url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+        params = {
+            "key": settings.GOOGLE_FACTCHECK_API_KEY,
+            "query": query,
+            "languageCode": language,
+            "pageSize": min(max_results, 10)
+        }
+
+        response = await http_pool.client.get(url, params=params, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
+
+        sources = []
+        for claim in data.get("claims", []):
+            for review in claim.get("claimReview", []):
+                publisher = review.get("publisher", {}).get("name", "")
+                rating = review.get("textualRating", "")
+                sources.append(Source(
+                    title=review.get("title") or f"{publisher}: {claim.get('text', '')}",
+                    url=review.get("url", ""),
+                    # Agências de checagem verificadas pelo Google, salvo se o registro disser o contrário
+                    credibility=credibility_registry.rate(review.get("url", ""), default="high"),
+                    relevance=0.9,
+                    summary=f"{publisher} classificou como \"{rating}\": {claim.get('text', '')}"
+                ))
+
+        logger.info(f"✅ Fact Check Tools retornou {len(sources)} resultados")
+        return sources[:max_results]
+
+
+def default_providers() -> List[SearchProvider]:
+    """
+    Cria os provedores de busca padrão
+
+    Returns:
+        Lista de provedores (os não configurados são ignorados na busca)
+    """
+    return [FactCheckToolsProvider(), GoogleSearchProvider(), NewsAPIProvider()]
@@ -1,58 +1,63 @@
 """
 Serviço de busca externa para verificação de fontes
 """
-import httpx
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
 
 from app.config import settings
 from app.models import Source
+from app.services.credibility_registry import credibility_registry
+from app.services.html_extractor import ExtractedPage, html_extractor
+from app.services.http_pool import http_pool
+from app.services.page_cache import page_cache
+from app.services.search_cache import search_cache
+from app.services.search_providers import SearchProvider, default_providers
+from app.utils.deadline import remaining_time
+from app.utils.helpers import canonical_url
+from app.utils.metrics import metrics
+from app.utils.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Ordem de desempate entre fontes de mesma relevância
+_CREDIBILITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
 
 class SearchService:
     """Serviço para buscar informações em fontes externas"""
     
     def __init__(self):
         """Inicializa o serviço de busca"""
-        self.google_search_available = bool(settings.GOOGLE_SEARCH_API_KEY and settings.GOOGLE_SEARCH_ENGINE_ID)
-        self.news_api_available = bool(settings.NEWS_API_KEY)
+        self.providers: List[SearchProvider] = default_providers()
+        self._url_inflight = SingleFlight()
+        
+        for provider in self.providers:
+            if provider.available:
+                logger.info(f"✅ Provedor de busca configurado: {provider.name}")
+    
+    def register_provider(self, provider: SearchProvider) -> None:
+        """
+        Adiciona um provedor de busca (consultado em paralelo com os demais)
         
-        if self.google_search_available:
-            logger.info("✅ Google Search API configurada")
-        if self.news_api_available:
-            logger.info("✅ News API configurada")
+        Args:
+            provider: Provedor de busca
+        """
+        self.providers.append(provider)
     
-    async def search_sources(self, query: str, max_results: int = 5) -> List[Source]:
+    async def search_sources(self, query: str, max_results: int = 5, language: str = "pt") -> List[Source]:
         """
         Busca fontes externas relacionadas à query
         
         Args:
             query: Termo de busca
             max_results: Número máximo de resultados
+            language: Idioma da busca
             
         Returns:
             Lista de fontes encontradas
         """
-        sources = []
-        
-        # Tentar Google Search API
-        if self.google_search_available:
-            try:
-                google_sources = await self._google_search(query, max_results)
-                sources.extend(google_sources)
-            except Exception as e:
-                logger.error(f"Erro ao buscar no Google: {e}")
-        
-        # Tentar News API
-        if self.news_api_available and len(sources) < max_results:
-            try:
-                news_sources = await self._news_api_search(query, max_results - len(sources))
-                sources.extend(news_sources)
-            except Exception as e:
-                logger.error(f"Erro ao buscar na News API: {e}")
+        sources = await self.search_evidence(query, max_results, language)
         
         # Se nenhuma API está configurada, fazer busca genérica
         if not sources:
@@ -61,82 +66,111 @@ class SearchService:
         
         return sources[:max_results]
     
-    async def _google_search(self, query: str, max_results: int) -> List[Source]:
+    async def search_evidence(self, query: str, max_results: int = 5, language: str = "pt") -> List[Source]:
         """
-        Busca usando Google Custom Search API
+        Busca fontes nas APIs configuradas, sem recorrer às fontes genéricas
+        
+        Os provedores são consultados em paralelo sob um único prazo
+        (SEARCH_TIMEOUT_SECONDS, limitado pelo deadline da requisição).
+        Os resultados são unidos sem URLs repetidas e ordenados por
+        relevância; assim que houver `max_results` fontes com relevância
+        mínima (SEARCH_MIN_RELEVANCE), as buscas restantes são canceladas.
+        Cada provedor passa pelo cache de buscas (SEARCH_CACHE_*).
         
         Args:
             query: Termo de busca
             max_results: Número máximo de resultados
+            language: Idioma da busca
             
         Returns:
-            Lista de fontes
+            Lista de fontes com trechos (vazia se nenhuma API responder)
         """
-        url = "https://www.googleapis.com/customsearch/v1"
-        params = {
-            "key": settings.GOOGLE_SEARCH_API_KEY,
-            "cx": settings.GOOGLE_SEARCH_ENGINE_ID,
-            "q": query,
-            "num": min(max_results, 10)
-        }
+        providers = [provider for provider in self.providers if provider.available]
+        if not providers:
+            return []
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-        
-        sources = []
-        for item in data.get("items", []):
-            source = Source(
-                title=item.get("title", ""),
-                url=item.get("link", ""),
-                credibility="medium",  # Poderia ser avaliado por domínio
-                relevance=0.8,
-                summary=item.get("snippet", "")
-            )
-            sources.append(source)
+        tasks = {
+            asyncio.ensure_future(self._search_provider(provider, query, max_results, language)): provider
+            for provider in providers
+        }
+        merged: Dict[str, Source] = {}
+        pending = set(tasks)
+        timeout = remaining_time(settings.SEARCH_TIMEOUT_SECONDS)
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + timeout
+        try:
+            while pending:
+                remaining = expires_at - loop.time()
+                if remaining <= 0:
+                    logger.warning(f"⏱️ Prazo da busca esgotado; {len(pending)} provedores sem resposta")
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    for source in task.result():
+                        self._merge_source(merged, source)
+                
+                good = sum(1 for source in merged.values() if source.relevance >= settings.SEARCH_MIN_RELEVANCE)
+                if good >= max_results:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+                metrics.inc("search_cancelled_total", provider=tasks[task].name)
         
-        logger.info(f"✅ Google Search retornou {len(sources)} resultados")
-        return sources
+        return self._rank(merged.values())[:max_results]
     
-    async def _news_api_search(self, query: str, max_results: int) -> List[Source]:
+    async def _search_provider(
+        self,
+        provider: SearchProvider,
+        query: str,
+        max_results: int,
+        language: str
+    ) -> List[Source]:
         """
-        Busca usando News API
+        Consulta um provedor através do cache de buscas
         
         Args:
+            provider: Provedor de busca
             query: Termo de busca
             max_results: Número máximo de resultados
+            language: Idioma da busca
             
         Returns:
-            Lista de fontes
+            Fontes encontradas (vazia em caso de erro)
         """
-        url = "https://newsapi.org/v2/everything"
-        params = {
-            "apiKey": settings.NEWS_API_KEY,
-            "q": query,
-            "pageSize": min(max_results, 20),
-            "language": "pt",
-            "sortBy": "relevancy"
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-        
-        sources = []
-        for article in data.get("articles", []):
-            source = Source(
-                title=article.get("title", ""),
-                url=article.get("url", ""),
-                credibility="medium",
-                relevance=0.7,
-                summary=article.get("description", "")
-            )
-            sources.append(source)
+        return await search_cache.get_or_fetch(
+            provider.name, query, language, max_results,
+            lambda: provider.search(query, max_results, language)
+        )
+    
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        Normaliza uma URL para detectar a mesma página vinda de provedores diferentes
         
-        logger.info(f"✅ News API retornou {len(sources)} resultados")
-        return sources
+        Args:
+            url: URL da fonte
+            
+        Returns:
+            URL canônica (ver `canonical_url`)
+        """
+        return canonical_url(url)
+    
+    def _merge_source(self, merged: Dict[str, Source], source: Source) -> None:
+        """Adiciona uma fonte, mantendo a de maior relevância entre URLs iguais"""
+        key = self.normalize_url(source.url) if source.url else source.title.lower()
+        current = merged.get(key)
+        if current is None or source.relevance > current.relevance:
+            merged[key] = source
+    
+    def _rank(self, sources) -> List[Source]:
+        """Ordena por relevância e, no empate, pela credibilidade do domínio"""
+        return sorted(
+            sources,
+            key=lambda source: (-source.relevance, _CREDIBILITY_RANK.get(source.credibility, 1))
+        )
     
     def _get_generic_sources(self, query: str) -> List[Source]:
         """
@@ -187,7 +221,7 @@ class SearchService:
             sources.append(Source(
                 title=src["title"],
                 url=src["url"],
-                credibility=src["credibility"],
+                credibility=credibility_registry.rate(src["url"], default=src["credibility"]),
                 relevance=0.6,
                 summary=src["summary"]
             ))
@@ -195,38 +229,105 @@ class SearchService:
         logger.info(f"📚 Retornando {len(sources)} fontes genéricas confiáveis")
         return sources
     
-    async def fetch_url_content(self, url: str) -> Optional[str]:
+    async def fetch_url_content(self, url: str, head_only: bool = False) -> Optional[str]:
         """
         Busca o conteúdo de uma URL
         
         Args:
             url: URL a ser buscada
+            head_only: Se True, lê só o <head> e devolve os metadados
+                (título, autor, data e descrição)
             
         Returns:
-            Conteúdo textual da página ou None
+            Conteúdo textual da página (metadados + corpo do artigo) ou None
+        """
+        page = await self.fetch_page(url, head_only=head_only)
+        if page is None or not (page.text or head_only and page.search_query):
+            return None
+        return page.as_content()[:settings.URL_CONTENT_MAX_CHARS]  # Limitar tamanho
+    
+    async def fetch_page(self, url: str, head_only: bool = False) -> Optional[ExtractedPage]:
         """
+        Busca o corpo do artigo e os metadados (título, autor, data) de uma URL
+        
+        Downloads simultâneos da mesma URL são coalescidos em um só.
+        
+        Args:
+            url: URL a ser buscada
+            head_only: Se True, para de ler em </head> e devolve só os
+                metadados (og:*, JSON-LD NewsArticle, meta tags)
+            
+        Returns:
+            Página extraída ou None
+        """
+        if head_only:
+            return await self._url_inflight.do(
+                ("head", canonical_url(url)),
+                lambda: self._fetch_page_head(url)
+            )
+        return await self._url_inflight.do(
+            canonical_url(url),
+            lambda: self._fetch_page(url)
+        )
+    
+    async def _fetch_page_head(self, url: str) -> Optional[ExtractedPage]:
+        """
+        Lê só o <head> de uma URL para extrair os metadados
+        
+        Se a página completa já está no cache de páginas, os metadados
+        guardados são usados sem nenhuma requisição.
+        
+        Args:
+            url: URL a ser buscada
+            
+        Returns:
+            Página só com metadados ou None
+        """
+        cached = await page_cache.get(canonical_url(url)) if page_cache.enabled else None
+        if cached is not None:
+            return cached.page
+        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=10.0, follow_redirects=True)
+            async with http_pool.client.stream("GET", url, timeout=10.0, follow_redirects=True) as response:
                 response.raise_for_status()
-                
-                # Parsear HTML
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Remover scripts e estilos
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                # Extrair texto
-                text = soup.get_text()
-                
-                # Limpar texto
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = ' '.join(chunk for chunk in chunks if chunk)
-                
-                return text[:5000]  # Limitar tamanho
-                
+                return await html_extractor.extract_head_stream(
+                    response.aiter_bytes(), url=str(response.url), encoding=response.charset_encoding
+                )
+        except Exception as e:
+            logger.error(f"Erro ao buscar metadados da URL {url}: {e}")
+            return None
+    
+    async def _fetch_page(self, url: str) -> Optional[ExtractedPage]:
+        """
+        Baixa e extrai o conteúdo principal de uma URL
+        
+        O corpo é lido em partes (até URL_CONTENT_MAX_BYTES) e parseado
+        incrementalmente pelo extrator. Passa pelo cache de páginas
+        (PAGE_CACHE_*): páginas vistas há menos de PAGE_CACHE_TTL_SECONDS
+        saem direto do cache; as mais antigas são revalidadas com GET
+        condicional e, se não mudaram (304) ou se a revalidação falhar, o
+        conteúdo guardado é devolvido sem baixar nem parsear o HTML.
+        
+        Args:
+            url: URL a ser buscada
+            
+        Returns:
+            Página extraída ou None
+        """
+        async def download(target: str, headers: Dict[str, str]):
+            async with http_pool.client.stream(
+                "GET", target, headers=headers, timeout=10.0, follow_redirects=True
+            ) as response:
+                if response.status_code == 304:
+                    return response, None
+                response.raise_for_status()
+                page = await html_extractor.extract_stream(
+                    response.aiter_bytes(), url=str(response.url), encoding=response.charset_encoding
+                )
+                return response, page
+        
+        try:
+            return await page_cache.get_or_fetch(url, download)
         except Exception as e:
             logger.error(f"Erro ao buscar URL {url}: {e}")
             return None
@@ -241,31 +342,7 @@ class SearchService:
         Returns:
             Nível de credibilidade (high, medium, low)
         """
-        # Domínios confiáveis
-        high_credibility_domains = [
-            "gov.br", "edu.br", "bbc.com", "reuters.com", "apnews.com",
-            "nature.com", "science.org", "who.int", "un.org",
-            "folha.uol.com.br", "estadao.com.br", "g1.globo.com",
-            "aosfatos.org", "piaui.folha.uol.com.br", "snopes.com"
-        ]
-        
-        # Domínios suspeitos
-        low_credibility_indicators = [
-            "blogspot", "wordpress.com", "wix.com", "weebly.com",
-            "tumblr.com"
-        ]
-        
-        url_lower = url.lower()
-        
-        for domain in high_credibility_domains:
-            if domain in url_lower:
-                return "high"
-        
-        for indicator in low_credibility_indicators:
-            if indicator in url_lower:
-                return "low"
-        
-        return "medium"
+        return credibility_registry.rate(url)
 
 
 # Instância global do serviço
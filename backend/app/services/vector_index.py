@@ -0,0 +1,446 @@
+"""
+Índice vetorial (vizinho mais próximo por similaridade de cosseno)
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.embeddings import EmbeddingBackend
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Linhas reservadas na criação da matriz (a capacidade dobra quando enche)
+_INITIAL_CAPACITY = 1024
+# Linhas por bloco ao atribuir vetores aos centróides
+_ASSIGN_BATCH = 32768
+# Iterações e amostra por lista do k-means do IVF
+_KMEANS_ITERATIONS = 10
+_KMEANS_SAMPLES_PER_LIST = 40
+
+
+class VectorIndex:
+    """
+    Embeddings float32 numa matriz mapeada em memória.
+
+    A matriz fica num arquivo binário (`path`) com uma linha por entrada e
+    cresce dobrando de capacidade; as chaves ficam numa tabela SQLite e
+    num `bytearray` de 32 bytes por linha. Cada linha pertence a um
+    namespace (ex: idioma) e a consulta só considera as linhas do mesmo
+    namespace. A consulta é força bruta
+    (produto matricial) até `ivf_min_vectors` entradas. A partir daí um
+    índice IVF é treinado em segundo plano: k-means esférico com cerca de
+    2·√n centróides, e a consulta compara o vetor só com as linhas das
+    `nprobe` listas mais próximas. O IVF é retreinado quando o índice dobra
+    de tamanho; linhas reescritas continuam na lista original até lá.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbeddingBackend,
+        path: Optional[str] = settings.CLAIM_VECTOR_INDEX_PATH,
+        db_path: Optional[str] = settings.CLAIM_STORE_PATH,
+        table: str = "claim_vectors",
+        threshold: float = settings.CLAIM_VECTOR_INDEX_THRESHOLD,
+        ivf_min_vectors: int = settings.CLAIM_VECTOR_INDEX_IVF_MIN_VECTORS,
+        nprobe: int = settings.CLAIM_VECTOR_INDEX_NPROBE
+    ):
+        """
+        Inicializa o índice
+
+        Args:
+            embedder: Backend que converte textos em vetores
+            path: Arquivo da matriz de embeddings (None = só memória)
+            db_path: Arquivo SQLite com as chaves de cada linha (None = só memória)
+            table: Nome da tabela de chaves
+            threshold: Similaridade de cosseno mínima para um casamento
+            ivf_min_vectors: Entradas a partir das quais o IVF é treinado
+            nprobe: Listas do IVF visitadas por consulta
+        """
+        self.embedder = embedder
+        self.dim = embedder.dim
+        self.path = path if db_path else None
+        self.db_path = db_path if path else None
+        self.table = table
+        self.threshold = threshold
+        self.ivf_min_vectors = ivf_min_vectors
+        self.nprobe = max(1, nprobe)
+
+        self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        self._count = 0
+        self._keys = bytearray()
+        self._namespaces = np.zeros(0, dtype=np.int32)
+        self._namespace_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+        # Estado do IVF
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._extra: List[List[int]] = []
+        self._trained_count = 0
+        self._training = False
+
+    def __len__(self) -> int:
+        return self._count
+
+    async def search_many(
+        self,
+        texts: List[str],
+        namespace: str = ""
+    ) -> List[Optional[Tuple[str, float]]]:
+        """
+        Busca a entrada mais parecida com cada texto
+
+        Args:
+            texts: Textos livres
+            namespace: Partição do índice
+
+        Returns:
+            Lista alinhada com `texts` contendo (chave, similaridade) acima do
+            limiar ou None
+        """
+        await self._ensure_loaded()
+        if not texts or not self._count:
+            return [None] * len(texts)
+
+        started = time.monotonic()
+        matches = await asyncio.to_thread(self._search_sync, texts, namespace)
+        metrics.observe("vector_index_search_seconds", time.monotonic() - started, index=self.table)
+        for match in matches:
+            metrics.inc("vector_index_searches_total", index=self.table, result="hit" if match else "miss")
+        return matches
+
+    async def add_many(self, entries: List[Tuple[str, str]], namespace: str = "") -> None:
+        """
+        Indexa (ou reindexa) vários textos
+
+        Args:
+            entries: Pares (chave hexadecimal de 32 bytes, texto)
+            namespace: Partição do índice
+        """
+        await self._ensure_loaded()
+        if not entries:
+            return
+        try:
+            await asyncio.to_thread(self._add_sync, entries, namespace)
+        except Exception as e:
+            logger.error(f"Erro ao indexar embeddings: {e}")
+
+    def search_vectors(
+        self,
+        queries: np.ndarray,
+        namespace: str = ""
+    ) -> List[Optional[Tuple[str, float]]]:
+        """
+        Busca o vizinho mais próximo de vetores já calculados
+
+        Args:
+            queries: Matriz float32 (m, dim) normalizada
+            namespace: Partição do índice
+
+        Returns:
+            Lista com (chave, similaridade) acima do limiar ou None
+        """
+        with self._lock:
+            count = self._count
+            namespace_id = self._namespace_ids.get(namespace)
+            if not count or namespace_id is None:
+                return [None] * len(queries)
+
+            if self._centroids is None:
+                scores = self._matrix[:count] @ queries.T
+                scores[self._namespaces[:count] != namespace_id] = -np.inf
+                best_rows = np.argmax(scores, axis=0)
+                best_scores = scores[best_rows, np.arange(len(queries))]
+            else:
+                best_rows = np.zeros(len(queries), dtype=np.int64)
+                best_scores = np.full(len(queries), -1.0, dtype=np.float32)
+                for i, query in enumerate(queries):
+                    rows = self._candidates(query)
+                    rows = rows[self._namespaces[rows] == namespace_id]
+                    if not len(rows):
+                        continue
+                    scores = self._matrix[rows] @ query
+                    best = int(np.argmax(scores))
+                    best_rows[i], best_scores[i] = rows[best], scores[best]
+
+            matches: List[Optional[Tuple[str, float]]] = []
+            for query, row, score in zip(queries, best_rows, best_scores):
+                if score < self.threshold or not query.any():
+                    matches.append(None)
+                    continue
+                row = int(row)
+                key = bytes(self._keys[row * 32:(row + 1) * 32]).hex()
+                matches.append((key, float(score)))
+            return matches
+
+    def _search_sync(self, texts: List[str], namespace: str) -> List[Optional[Tuple[str, float]]]:
+        """Calcula os embeddings e busca (fora do event loop)"""
+        return self.search_vectors(self.embedder.embed(texts), namespace)
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray:
+        """Linhas das `nprobe` listas do IVF mais próximas do vetor"""
+        centroid_scores = self._centroids @ query
+        nprobe = min(self.nprobe, len(centroid_scores))
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        parts = [self._lists[p] for p in probe]
+        parts.extend(np.asarray(self._extra[p], dtype=np.int64) for p in probe if self._extra[p])
+        return np.concatenate(parts)
+
+    def _add_sync(self, entries: List[Tuple[str, str]], namespace: str) -> None:
+        """Grava os vetores na matriz e as chaves no SQLite"""
+        vectors = self.embedder.embed([text for _, text in entries])
+
+        with self._lock:
+            namespace_id = self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+            new_rows = []
+            for (key, _), vector in zip(entries, vectors):
+                key_bytes = bytes.fromhex(key)
+                row = self._find_row(key_bytes)
+                if row is None:
+                    row = self._count
+                    if row >= len(self._matrix):
+                        self._grow(max(_INITIAL_CAPACITY, 2 * len(self._matrix)))
+                    self._keys += key_bytes
+                    self._count += 1
+                    new_rows.append((row, key_bytes, namespace))
+                    if self._centroids is not None:
+                        self._extra[int(np.argmax(self._centroids @ vector))].append(row)
+                self._matrix[row] = vector
+                self._namespaces[row] = namespace_id
+
+            if isinstance(self._matrix, np.memmap):
+                self._matrix.flush()
+            if self.db_path and new_rows:
+                self._db_add(new_rows)
+
+        metrics.set_gauge("vector_index_size", self._count, index=self.table)
+        self._maybe_train()
+
+    def _find_row(self, key_bytes: bytes) -> Optional[int]:
+        """Linha já ocupada pela chave, se houver"""
+        if self.db_path:
+            conn = self._connect()
+            try:
+                row = conn.execute(f"SELECT row FROM {self.table} WHERE key = ?", (key_bytes,)).fetchone()
+            finally:
+                conn.close()
+            return row[0] if row else None
+
+        start = self._keys.find(key_bytes)
+        while start >= 0:
+            if start % 32 == 0:
+                return start // 32
+            start = self._keys.find(key_bytes, start + 1)
+        return None
+
+    def _grow(self, capacity: int) -> None:
+        """Aumenta a capacidade da matriz (estendendo o arquivo, se houver)"""
+        namespaces = np.full(capacity, -1, dtype=np.int32)
+        namespaces[:self._count] = self._namespaces[:self._count]
+        self._namespaces = namespaces
+
+        if not self.path:
+            matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+            matrix[:self._count] = self._matrix[:self._count]
+            self._matrix = matrix
+            return
+
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+        with open(self.path, "ab") as file:
+            file.truncate(capacity * self.dim * 4)
+        self._matrix = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _maybe_train(self) -> None:
+        """Dispara o treino do IVF em segundo plano quando o índice cresceu o bastante"""
+        if (
+            self._training
+            or self._count < self.ivf_min_vectors
+            or self._count < 2 * self._trained_count
+        ):
+            return
+        self._training = True
+        threading.Thread(target=self._background_train, daemon=True).start()
+
+    def _background_train(self) -> None:
+        """Treina o IVF fora do event loop (milhões de linhas levam alguns segundos)"""
+        try:
+            self.train()
+        except Exception as e:
+            logger.error(f"Erro ao treinar IVF do índice vetorial: {e}")
+        finally:
+            self._training = False
+
+    def train(self) -> None:
+        """Treina os centróides do IVF e redistribui todas as linhas"""
+        started = time.monotonic()
+        with self._lock:
+            matrix, count = self._matrix, self._count
+        if not count:
+            return
+
+        nlist = int(min(4096, max(1, 2 * np.sqrt(count))))
+        rng = np.random.default_rng(42)
+        sample_size = min(count, nlist * _KMEANS_SAMPLES_PER_LIST)
+        sample = np.asarray(matrix[np.sort(rng.choice(count, sample_size, replace=False))])
+
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = self._assign(sample, centroids)
+            order = np.argsort(labels, kind="stable")
+            sizes = np.bincount(labels, minlength=nlist)
+            starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+            sums = np.zeros_like(centroids)
+            filled = sizes > 0
+            sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+            empty = ~filled
+            if empty.any():
+                # Listas vazias recomeçam de pontos aleatórios
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+
+        assignments = np.concatenate([
+            self._assign(np.asarray(matrix[start:min(count, start + _ASSIGN_BATCH)]), centroids)
+            for start in range(0, count, _ASSIGN_BATCH)
+        ])
+        self._install_ivf(centroids, assignments)
+
+        if self.path:
+            np.savez(self.path + ".ivf.npz", centroids=centroids, assignments=assignments)
+        metrics.observe("vector_index_train_seconds", time.monotonic() - started, index=self.table)
+        logger.info(f"🧭 IVF do índice vetorial treinado: {count} vetores em {nlist} listas")
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Centróide mais próximo de cada vetor"""
+        return np.argmax(vectors @ centroids.T, axis=1).astype(np.int32)
+
+    def _install_ivf(self, centroids: np.ndarray, assignments: np.ndarray) -> None:
+        """Monta as listas a partir das atribuições e atribui as linhas mais novas"""
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(len(centroids) + 1))
+        lists = [order[bounds[i]:bounds[i + 1]].astype(np.int64) for i in range(len(centroids))]
+
+        with self._lock:
+            extra: List[List[int]] = [[] for _ in range(len(centroids))]
+            tail = np.arange(len(assignments), self._count)
+            if len(tail):
+                for row, label in zip(tail, self._assign(np.asarray(self._matrix[tail]), centroids)):
+                    extra[int(label)].append(int(row))
+            self._centroids = centroids.astype(np.float32)
+            self._lists = lists
+            self._extra = extra
+            self._trained_count = len(assignments)
+
+    async def _ensure_loaded(self) -> None:
+        """Abre a matriz e carrega as chaves na primeira utilização"""
+        if self._loaded:
+            return
+
+        async with self._load_lock:
+            if self._loaded:
+                return
+            if self.path:
+                try:
+                    await asyncio.to_thread(self._load)
+                    logger.info(f"🧮 Índice vetorial carregado: {self._count} vetores ({self.embedder.name})")
+                except Exception as e:
+                    logger.error(f"Erro ao carregar índice vetorial ({self.path}): {e}")
+                    self.path = self.db_path = None
+                    self._count = 0
+                    self._keys = bytearray()
+                    self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+            self._loaded = True
+
+    def _load(self) -> None:
+        """Abre ou cria a matriz e reconstrói o estado em memória"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            meta = conn.execute(f"SELECT backend, dim FROM {self.table}_meta").fetchone()
+            if meta != (self.embedder.name, self.dim):
+                if meta is not None:
+                    # Vetores de outro modelo não são comparáveis: recomeça
+                    logger.warning(
+                        f"⚠️ Backend de embeddings mudou ({meta[0]}/{meta[1]} → "
+                        f"{self.embedder.name}/{self.dim}); índice vetorial recriado"
+                    )
+                conn.execute(f"DELETE FROM {self.table}")
+                conn.execute(f"DELETE FROM {self.table}_meta")
+                conn.execute(
+                    f"INSERT INTO {self.table}_meta (backend, dim) VALUES (?, ?)",
+                    (self.embedder.name, self.dim)
+                )
+                conn.commit()
+                for stale in (self.path, self.path + ".ivf.npz"):
+                    if os.path.exists(stale):
+                        os.remove(stale)
+            rows = conn.execute(f"SELECT row, key, namespace FROM {self.table} ORDER BY row").fetchall()
+        finally:
+            conn.close()
+
+        row_bytes = self.dim * 4
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        # Linhas gravadas no SQLite sem o vetor correspondente (queda no meio) são ignoradas
+        count = 0
+        for row, _, _ in rows:
+            if row != count or (row + 1) * row_bytes > size:
+                break
+            count += 1
+
+        self._grow(max(_INITIAL_CAPACITY, size // row_bytes))
+        self._keys = bytearray(b"".join(key for _, key, _ in rows[:count]))
+        for row, _, namespace in rows[:count]:
+            self._namespaces[row] = self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+        self._count = count
+        metrics.set_gauge("vector_index_size", count, index=self.table)
+
+        ivf_path = self.path + ".ivf.npz"
+        if os.path.exists(ivf_path):
+            with np.load(ivf_path) as ivf:
+                centroids, assignments = ivf["centroids"], ivf["assignments"]
+            if centroids.shape[1] == self.dim and len(assignments) <= count:
+                self._install_ivf(centroids, assignments)
+        self._maybe_train()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre conexão com o banco e garante as tabelas"""
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                row INTEGER PRIMARY KEY,
+                key BLOB NOT NULL UNIQUE,
+                namespace TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table}_meta (backend TEXT NOT NULL, dim INTEGER NOT NULL)"
+        )
+        return conn
+
+    def _db_add(self, rows: List[Tuple[int, bytes, str]]) -> None:
+        """Persiste as chaves das linhas novas"""
+        conn = self._connect()
+        try:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (row, key, namespace) VALUES (?, ?, ?)", rows
+            )
+            conn.commit()
+        finally:
+            conn.close()
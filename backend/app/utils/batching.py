@@ -0,0 +1,136 @@
+"""
+Agrupamento de chamadas concorrentes em lotes (micro-batching)
+"""
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+
+from app.utils.deadline import current_deadline
+from app.utils.metrics import metrics
+
+# Handler do lote: recebe a chave e os itens, devolve um resultado (ou exceção) por item
+BatchHandler = Callable[[Hashable, List[Any]], Awaitable[List[Any]]]
+
+
+class MicroBatcher:
+    """
+    Junta itens enviados quase ao mesmo tempo numa única execução.
+
+    Cada chave (ex: idioma) tem seu próprio lote pendente. O lote é
+    executado quando atinge `max_batch_size` ou quando o primeiro item
+    completa `max_wait_ms` de espera; o resultado de cada item volta para
+    quem o enviou.
+
+    O lote roda num contexto vazio: o prazo (e demais contextvars) de quem
+    enviou o primeiro item não vale para os outros. Cada um aplica o
+    próprio prazo apenas à sua espera.
+    """
+
+    def __init__(self, name: str, handler: BatchHandler, max_batch_size: int, max_wait_ms: float):
+        """
+        Inicializa o agrupador
+
+        Args:
+            name: Nome do lote (rótulo das métricas)
+            handler: Função que processa um lote inteiro
+            max_batch_size: Máximo de itens por lote
+            max_wait_ms: Espera máxima do primeiro item antes do envio
+        """
+        self.name = name
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._running: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any, key: Hashable = None) -> Any:
+        """
+        Envia um item e aguarda o resultado do lote
+
+        Args:
+            item: Item a ser processado
+            key: Chave do lote (itens com chaves diferentes nunca se misturam)
+
+        Returns:
+            Resultado correspondente ao item
+
+        Raises:
+            asyncio.TimeoutError: Prazo da requisição esgotado antes do resultado
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((item, future))
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(
+                self.max_wait, self._flush, key, context=contextvars.Context()
+            )
+
+        deadline = current_deadline()
+        if deadline is None:
+            return await future
+        try:
+            # O lote continua para os demais mesmo se este item desistir
+            return await asyncio.wait_for(asyncio.shield(future), timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            self._discard(key, future)
+            metrics.inc("batch_deadline_exceeded_total", batch=self.name)
+            raise
+
+    def _discard(self, key: Hashable, future: asyncio.Future) -> None:
+        """Tira do lote pendente um item cujo remetente desistiu"""
+        batch = self._pending.get(key)
+        if batch is None:
+            return
+        batch[:] = [(item, pending) for item, pending in batch if pending is not future]
+        if not batch:
+            self._pending.pop(key, None)
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+
+    def _flush(self, key: Hashable) -> None:
+        """Dispara a execução do lote pendente de uma chave"""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+
+        # Contexto vazio: nada da requisição que disparou o envio vaza para o lote
+        task = contextvars.Context().run(asyncio.ensure_future, self._run(key, batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key: Hashable, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Executa o handler e distribui os resultados"""
+        metrics.observe("batch_size", len(batch), batch=self.name)
+        try:
+            results = await self.handler(key, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        # Handler com menos resultados que itens: não deixar ninguém esperando
+        for _, future in batch[len(results):]:
+            if not future.done():
+                future.set_exception(RuntimeError("Lote sem resultado para o item"))
+
+    def __len__(self) -> int:
+        return sum(len(batch) for batch in self._pending.values())
@@ -0,0 +1,71 @@
+"""
+Cache em memória com política LRU e expiração (TTL)
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Cache LRU em memória com tempo de vida por entrada"""
+
+    def __init__(self, max_items: int = 1024, ttl: float = 3600.0):
+        """
+        Inicializa o cache
+
+        Args:
+            max_items: Número máximo de entradas mantidas
+            ttl: Tempo de vida padrão das entradas em segundos
+        """
+        self.max_items = max(1, max_items)
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Busca uma entrada válida
+
+        Args:
+            key: Chave da entrada
+
+        Returns:
+            Valor armazenado ou None se ausente/expirado
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Armazena uma entrada, descartando a menos usada se necessário
+
+        Args:
+            key: Chave da entrada
+            value: Valor a armazenar
+            ttl: Tempo de vida em segundos (usa o padrão se None)
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_items:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove uma entrada, se existir"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
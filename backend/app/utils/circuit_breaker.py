@@ -0,0 +1,141 @@
+"""
+Circuit breaker baseado na taxa de erros recente
+"""
+import time
+from collections import deque
+from typing import Deque, Tuple
+
+from app.utils.metrics import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Circuito aberto: chamadas recusadas sem contatar o serviço"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuito '{name}' aberto")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Interrompe chamadas a um serviço instável.
+
+    Fechado: as chamadas passam e o resultado entra na janela deslizante.
+    Quando a taxa de falhas da janela passa do limite (com um mínimo de
+    chamadas), o circuito abre e recusa tudo por `reset_timeout` segundos.
+    Depois disso fica meio-aberto: uma única chamada de teste decide se o
+    circuito fecha (sucesso) ou volta a abrir (falha).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        min_calls: int = 10,
+        window_seconds: float = 60.0,
+        reset_timeout: float = 30.0
+    ):
+        """
+        Inicializa o circuito
+
+        Args:
+            name: Nome do circuito (rótulo das métricas)
+            failure_rate_threshold: Taxa de falhas (0-1) que abre o circuito
+            min_calls: Mínimo de chamadas na janela para avaliar a taxa
+            window_seconds: Tamanho da janela deslizante em segundos
+            reset_timeout: Tempo aberto antes da chamada de teste
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = max(1, min_calls)
+        self.window_seconds = window_seconds
+        self.reset_timeout = reset_timeout
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._calls: Deque[Tuple[float, bool]] = deque()
+        self._set_state(CLOSED)
+
+    @property
+    def state(self) -> str:
+        """Estado atual (closed, open ou half_open)"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._set_state(HALF_OPEN)
+        return self._state
+
+    def allow(self) -> None:
+        """
+        Verifica se uma chamada pode prosseguir
+
+        Raises:
+            CircuitOpenError: Se o circuito estiver aberto (ou já houver
+                uma chamada de teste em andamento)
+        """
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        metrics.inc("circuit_rejected_total", circuit=self.name)
+        raise CircuitOpenError(self.name, self.retry_after())
+
+    def retry_after(self) -> float:
+        """Segundos até o circuito aceitar uma chamada de teste"""
+        if self._state != OPEN:
+            return 1.0
+        return max(1.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        """Registra uma chamada bem-sucedida"""
+        if self._state == HALF_OPEN:
+            self._probe_in_flight = False
+            self._calls.clear()
+            self._set_state(CLOSED)
+        self._record(True)
+
+    def record_failure(self) -> None:
+        """Registra uma chamada que falhou por instabilidade do serviço"""
+        if self._state == HALF_OPEN:
+            self._probe_in_flight = False
+            self._open()
+            return
+        self._record(False)
+
+        failures = sum(1 for _, ok in self._calls if not ok)
+        if (
+            self._state == CLOSED
+            and len(self._calls) >= self.min_calls
+            and failures / len(self._calls) >= self.failure_rate_threshold
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """Libera a chamada de teste que terminou sem contatar o serviço"""
+        self._probe_in_flight = False
+
+    def _record(self, ok: bool) -> None:
+        """Adiciona o resultado na janela e descarta os antigos"""
+        now = time.monotonic()
+        self._calls.append((now, ok))
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _open(self) -> None:
+        """Abre o circuito"""
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+        self._set_state(OPEN)
+        metrics.inc("circuit_opened_total", circuit=self.name)
+
+    def _set_state(self, state: str) -> None:
+        """Atualiza o estado e o gauge correspondente"""
+        self._state = state
+        metrics.set_gauge("circuit_state", _STATE_VALUES[state], circuit=self.name)
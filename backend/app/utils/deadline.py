@@ -0,0 +1,99 @@
+"""
+Orçamento de tempo de uma requisição (deadline) compartilhado entre as etapas
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from app.utils.metrics import metrics
+
+_current: ContextVar[Optional["Deadline"]] = ContextVar("deadline", default=None)
+
+
+class Deadline:
+    """
+    Prazo absoluto de uma requisição.
+
+    As etapas consultam o tempo restante para se encurtar ou pular e
+    registram em `degraded` o que deixaram de fazer por falta de tempo.
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Inicializa o prazo
+
+        Args:
+            seconds: Orçamento total em segundos, a partir de agora
+        """
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.degraded: List[str] = []
+
+    def remaining(self) -> float:
+        """Segundos restantes (0 se esgotado)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows(self, seconds: float) -> bool:
+        """Indica se ainda restam pelo menos `seconds` segundos"""
+        return self.remaining() >= seconds
+
+    def cap(self, timeout: float) -> float:
+        """Limita um timeout ao tempo restante"""
+        return min(timeout, self.remaining())
+
+    def degrade(self, stage: str) -> None:
+        """
+        Registra uma etapa pulada ou encurtada por falta de tempo
+
+        Args:
+            stage: Nome da etapa
+        """
+        if stage not in self.degraded:
+            self.degraded.append(stage)
+            metrics.inc("deadline_degraded_total", stage=stage)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Prazo da requisição em andamento (None se não houver)"""
+    return _current.get()
+
+
+def remaining_time(default: float) -> float:
+    """
+    Limita um tempo ao prazo da requisição em andamento
+
+    Args:
+        default: Tempo máximo sem prazo de requisição
+
+    Returns:
+        O menor entre `default` e o tempo restante
+    """
+    deadline = _current.get()
+    return default if deadline is None else deadline.cap(default)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """
+    Define o prazo da requisição para o código (e tarefas criadas) dentro do bloco
+
+    Args:
+        deadline: Prazo da requisição (None = sem prazo)
+
+    Yields:
+        O próprio prazo
+    """
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Gerador assíncrono fechado fora do contexto em que começou (finalizador)
+            _current.set(None)
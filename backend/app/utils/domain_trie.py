@@ -0,0 +1,129 @@
+"""
+Trie de domínios por rótulos invertidos (com → bbc → www)
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Chaves reservadas de um nó (rótulos DNS nunca são None nem "*")
+_VALUE = None
+_WILDCARD = "*"
+
+
+def host_labels(url_or_host: str) -> List[str]:
+    """
+    Rótulos do host de uma URL, do mais genérico ao mais específico
+
+    Remove esquema, porta, credenciais e ponto final; converte nomes
+    internacionalizados para a forma ASCII (IDNA).
+
+    Args:
+        url_or_host: URL completa ou apenas o host
+
+    Returns:
+        Rótulos invertidos (ex: ["br", "gov", "saude"]); vazio se não houver host
+    """
+    value = url_or_host.strip()
+    host = urlsplit(value if "//" in value else f"//{value}").hostname or ""
+    host = host.rstrip(".")
+    if not host:
+        return []
+    try:
+        host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        pass
+    return host.split(".")[::-1]
+
+
+class DomainTrie:
+    """
+    Mapa de domínios para valores com busca pelo sufixo mais específico.
+
+    Um domínio vale para ele mesmo e seus subdomínios ("gov.br" cobre
+    "saude.gov.br"), e um curinga "*.sufixo" vale só para os domínios
+    registrados sob um sufixo público ("*.blogspot.com" cobre
+    "fulano.blogspot.com", mas não "blogspot.com"). Como a busca anda
+    rótulo a rótulo, "gov.br.exemplo.com" não casa com "gov.br".
+
+    A busca custa O(número de rótulos). Nós sem filhos guardam o valor
+    diretamente, o que mantém centenas de milhares de domínios em pouca
+    memória.
+    """
+
+    def __init__(self):
+        """Inicializa a trie vazia"""
+        self._root: Dict[Any, Any] = {}
+        self.size = 0
+
+    def insert(self, domain: str, value: Any) -> None:
+        """
+        Associa um valor a um domínio (ou curinga "*.sufixo")
+
+        Args:
+            domain: Domínio, opcionalmente prefixado por "*."
+            value: Valor associado (não pode ser dict nem None)
+        """
+        wildcard = domain.startswith("*.")
+        labels = host_labels(domain[2:] if wildcard else domain)
+        if not labels:
+            raise ValueError(f"Domínio inválido: {domain}")
+
+        node = self._root
+        for index, label in enumerate(labels):
+            child = node.get(label)
+            is_last = index == len(labels) - 1
+            if is_last and not wildcard and not isinstance(child, dict):
+                # Folha: o valor fica direto no nó pai
+                self.size += child is None
+                node[label] = value
+                return
+            if not isinstance(child, dict):
+                child = {} if child is None else {_VALUE: child}
+                node[label] = child
+            node = child
+
+        key = _WILDCARD if wildcard else _VALUE
+        self.size += key not in node
+        node[key] = value
+
+    def lookup(self, url_or_host: str) -> Optional[Any]:
+        """
+        Valor do sufixo cadastrado mais específico do host
+
+        Args:
+            url_or_host: URL completa ou host
+
+        Returns:
+            Valor encontrado ou None
+        """
+        best = None
+        node = self._root
+        for label in host_labels(url_or_host):
+            if _WILDCARD in node:
+                best = node[_WILDCARD]
+            child = node.get(label)
+            if child is None:
+                break
+            if not isinstance(child, dict):
+                return child
+            node = child
+            if _VALUE in node:
+                best = node[_VALUE]
+        return best
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Percorre os pares (domínio, valor) cadastrados"""
+        stack: List[Tuple[List[str], Dict[Any, Any]]] = [([], self._root)]
+        while stack:
+            labels, node = stack.pop()
+            for label, child in node.items():
+                if label is _VALUE:
+                    yield ".".join(reversed(labels)), child
+                elif label == _WILDCARD:
+                    yield "*." + ".".join(reversed(labels)), child
+                elif isinstance(child, dict):
+                    stack.append((labels + [label], child))
+                else:
+                    yield ".".join(reversed(labels + [label])), child
+
+    def __len__(self) -> int:
+        return self.size
@@ -110,6 +110,36 @@ def extract_domain(url: str) -> str:
         return ""
 
 
+# Parâmetros de rastreamento ignorados ao comparar URLs
+TRACKING_PARAMS = ("fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Forma canônica de uma URL, para reconhecer a mesma página em endereços diferentes
+    
+    Ignora esquema, "www.", maiúsculas no host, barra final, fragmento e
+    parâmetros de rastreamento (utm_*, fbclid, gclid...); ordena a query.
+    
+    Args:
+        url: URL completa
+        
+    Returns:
+        URL canônica (sem esquema)
+    """
+    from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+    
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.startswith("utm_") and key not in TRACKING_PARAMS
+    ))
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, ""))
+
+
 def sanitize_input(text: str) -> str:
     """
     Sanitiza input do usuário
@@ -0,0 +1,143 @@
+"""
+Parser tolerante para JSON gerado por LLMs
+"""
+import json
+import re
+from typing import Any, Optional, Tuple
+
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\s*|\s*```\s*$")
+
+
+class LLMResponseError(Exception):
+    """Resposta do LLM não pôde ser convertida no formato esperado"""
+
+
+def strip_markdown_fences(text: str) -> str:
+    """
+    Remove blocos de código Markdown (```json ... ```) ao redor do texto
+
+    Args:
+        text: Texto da resposta
+
+    Returns:
+        Texto sem as cercas
+    """
+    return _FENCE_RE.sub("", text.strip()).strip()
+
+
+def repair_json(text: str) -> str:
+    """
+    Tenta completar um JSON truncado
+
+    Percorre o texto acompanhando strings e aninhamento; descarta o último
+    valor incompleto (chave sem valor, vírgula pendente, literal cortado) e
+    fecha strings, objetos e listas que ficaram abertos.
+
+    Args:
+        text: JSON possivelmente truncado (começando em '{' ou '[')
+
+    Returns:
+        JSON sintaticamente fechado
+    """
+    stack = []
+    in_string = False
+    string_is_key = False
+    escaped = False
+    last_char = ""
+    # Último ponto seguro de corte (fim de valor completo) e a pilha nesse ponto
+    safe_end = 0
+    safe_stack: list = []
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                last_char = char
+                # Uma string completa só é segura como valor, não como chave
+                if not string_is_key:
+                    safe_end, safe_stack = i + 1, list(stack)
+            continue
+
+        if char.isspace():
+            continue
+
+        if char == '"':
+            in_string = True
+            string_is_key = bool(stack) and stack[-1] == "}" and last_char in "{,"
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            safe_end, safe_stack = i + 1, list(stack)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            safe_end, safe_stack = i + 1, list(stack)
+        elif char.isdigit() or char in "el":
+            # Fim de número ou de true/false/null (no fim do texto pode estar cortado)
+            nxt = text[i + 1:i + 2]
+            if nxt and nxt in ",}] \n\r\t":
+                safe_end, safe_stack = i + 1, list(stack)
+        last_char = char
+
+    if not stack and not in_string:
+        return text
+
+    repaired = text[:safe_end].rstrip()
+    if repaired.endswith(","):
+        repaired = repaired[:-1]
+    return repaired + "".join(reversed(safe_stack))
+
+
+def parse_llm_json(text: str, expected: Optional[type] = None) -> Tuple[Any, bool]:
+    """
+    Converte a resposta de um LLM em objeto Python
+
+    Remove cercas Markdown e texto ao redor, e tenta reparar JSON truncado.
+
+    Args:
+        text: Texto da resposta
+        expected: Tipo esperado do resultado (dict ou list)
+
+    Returns:
+        Tupla (objeto, reparado) onde `reparado` indica se foi preciso
+        completar o JSON
+
+    Raises:
+        LLMResponseError: Se não for possível obter um JSON do tipo esperado
+    """
+    if not text or not text.strip():
+        raise LLMResponseError("Resposta vazia do LLM")
+
+    cleaned = strip_markdown_fences(text)
+
+    # Começar no primeiro '{' ou '[' (descarta texto antes do JSON)
+    starts = [pos for pos in (cleaned.find("{"), cleaned.find("[")) if pos >= 0]
+    if expected is dict and cleaned.find("{") >= 0:
+        start = cleaned.find("{")
+    elif expected is list and cleaned.find("[") >= 0:
+        start = cleaned.find("[")
+    elif starts:
+        start = min(starts)
+    else:
+        raise LLMResponseError("Resposta do LLM não contém JSON")
+    cleaned = cleaned[start:]
+
+    repaired = False
+    try:
+        result, _ = json.JSONDecoder().raw_decode(cleaned)
+    except json.JSONDecodeError:
+        try:
+            result = json.loads(repair_json(cleaned))
+            repaired = True
+        except json.JSONDecodeError as e:
+            raise LLMResponseError(f"JSON inválido na resposta do LLM: {e}") from e
+
+    if expected is not None and not isinstance(result, expected):
+        raise LLMResponseError(
+            f"Resposta do LLM com tipo inesperado: {type(result).__name__}"
+        )
+
+    return result, repaired
@@ -0,0 +1,81 @@
+"""
+Conversão de modelos Pydantic em response schema do Gemini
+"""
+from typing import Any, Dict, Iterable, Optional, Set, Type
+
+from pydantic import BaseModel
+
+# Campos do JSON Schema aceitos pelo response_schema do Gemini
+_SUPPORTED_KEYS = {"type", "description", "enum", "items", "properties", "required", "nullable"}
+
+
+def model_response_schema(
+    model: Type[BaseModel],
+    fields: Optional[Iterable[str]] = None,
+    exclude: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    Gera um response schema (subconjunto OpenAPI) a partir de um modelo Pydantic
+
+    Args:
+        model: Modelo Pydantic de origem
+        fields: Campos de primeiro nível a manter (todos se None)
+        exclude: Nomes de campos removidos em qualquer nível
+
+    Returns:
+        Schema no formato aceito por `generation_config["response_schema"]`
+    """
+    json_schema = model.model_json_schema()
+    definitions = json_schema.get("$defs", {})
+    schema = _convert(json_schema, definitions, set(exclude))
+
+    if fields is not None:
+        keep = list(fields)
+        schema["properties"] = {
+            name: prop for name, prop in schema["properties"].items() if name in keep
+        }
+        schema["required"] = [name for name in keep if name in schema["properties"]]
+
+    return schema
+
+
+def _convert(node: Dict[str, Any], definitions: Dict[str, Any], exclude: Set[str]) -> Dict[str, Any]:
+    """Converte recursivamente um nó do JSON Schema"""
+    if "$ref" in node:
+        name = node["$ref"].split("/")[-1]
+        merged = {**definitions[name], **{k: v for k, v in node.items() if k != "$ref"}}
+        return _convert(merged, definitions, exclude)
+
+    if "allOf" in node and len(node["allOf"]) == 1:
+        merged = {**node["allOf"][0], **{k: v for k, v in node.items() if k != "allOf"}}
+        return _convert(merged, definitions, exclude)
+
+    if "anyOf" in node:
+        # Optional[X] vira X com nullable=true
+        options = [option for option in node["anyOf"] if option.get("type") != "null"]
+        converted = _convert(options[0], definitions, exclude) if options else {"type": "string"}
+        if len(options) < len(node["anyOf"]):
+            converted["nullable"] = True
+        if node.get("description"):
+            converted["description"] = node["description"]
+        return converted
+
+    schema = {key: value for key, value in node.items() if key in _SUPPORTED_KEYS}
+
+    if "enum" in node and "type" not in schema:
+        schema["type"] = "string"
+
+    if "properties" in node:
+        schema["properties"] = {
+            name: _convert(prop, definitions, exclude)
+            for name, prop in node["properties"].items()
+            if name not in exclude
+        }
+        schema["required"] = [
+            name for name in node.get("required", []) if name in schema["properties"]
+        ]
+
+    if "items" in node:
+        schema["items"] = _convert(node["items"], definitions, exclude)
+
+    return schema
@@ -0,0 +1,144 @@
+"""
+Métricas em memória do processo (contadores, gauges e histogramas)
+"""
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+# Chave de uma série: (nome, rótulos ordenados)
+_SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _series_key(name: str, labels: Dict[str, Any]) -> _SeriesKey:
+    """Monta a chave de uma série a partir do nome e dos rótulos"""
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _series_name(key: _SeriesKey) -> str:
+    """Nome legível da série, no formato nome{rotulo="valor"}"""
+    name, labels = key
+    if not labels:
+        return name
+    rendered = ",".join(f'{label}="{value}"' for label, value in labels)
+    return f"{name}{{{rendered}}}"
+
+
+class _Histogram:
+    """Histograma simples com janela das últimas observações para percentis"""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.recent.append(value)
+
+    def percentile(self, q: float) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "avg": round(self.total / self.count, 6) if self.count else 0.0,
+            "p50": round(self.percentile(0.50), 6),
+            "p95": round(self.percentile(0.95), 6),
+            "p99": round(self.percentile(0.99), 6),
+            "max": round(self.max, 6),
+        }
+
+
+class Metrics:
+    """Registro de métricas do processo"""
+
+    def __init__(self):
+        """Inicializa o registro"""
+        self._lock = threading.Lock()
+        self._counters: Dict[_SeriesKey, float] = {}
+        self._gauges: Dict[_SeriesKey, float] = {}
+        self._histograms: Dict[_SeriesKey, _Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        Incrementa um contador
+
+        Args:
+            name: Nome da métrica
+            value: Valor a somar
+            **labels: Rótulos da série
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Define o valor atual de um gauge
+
+        Args:
+            name: Nome da métrica
+            value: Valor atual
+            **labels: Rótulos da série
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Registra uma observação num histograma (ex: latência em segundos)
+
+        Args:
+            name: Nome da métrica
+            value: Valor observado
+            **labels: Rótulos da série
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.observe(value)
+
+    def get_counter(self, name: str, **labels: Any) -> float:
+        """Valor atual de um contador"""
+        return self._counters.get(_series_key(name, labels), 0)
+
+    def get_count(self, name: str, **labels: Any) -> int:
+        """Número de observações de um histograma"""
+        histogram = self._histograms.get(_series_key(name, labels))
+        return histogram.count if histogram else 0
+
+    def percentile(self, name: str, q: float, **labels: Any) -> float:
+        """Percentil das observações recentes de um histograma"""
+        histogram = self._histograms.get(_series_key(name, labels))
+        return histogram.percentile(q) if histogram else 0.0
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna todas as métricas
+
+        Returns:
+            Dicionário com contadores, gauges e histogramas
+        """
+        with self._lock:
+            return {
+                "counters": {_series_name(k): v for k, v in sorted(self._counters.items())},
+                "gauges": {_series_name(k): v for k, v in sorted(self._gauges.items())},
+                "histograms": {
+                    _series_name(k): h.snapshot() for k, h in sorted(self._histograms.items())
+                },
+            }
+
+
+# Instância global de métricas
+metrics = Metrics()
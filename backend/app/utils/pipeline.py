@@ -0,0 +1,190 @@
+"""
+Executor de pipelines assíncronos em grafo de dependências (DAG)
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Função de uma etapa: recebe a execução e devolve o resultado da etapa
+StageFunc = Callable[["PipelineRun"], Awaitable[Any]]
+
+
+class Stage:
+    """Etapa do pipeline"""
+
+    def __init__(self, name: str, func: StageFunc, depends_on: Iterable[str] = (), optional: bool = False):
+        """
+        Inicializa a etapa
+
+        Args:
+            name: Nome da etapa
+            func: Função assíncrona da etapa
+            depends_on: Etapas que precisam terminar antes desta começar
+            optional: Se True, falhas viram resultado None em vez de
+                interromper o pipeline
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.optional = optional
+
+
+class Pipeline:
+    """
+    Grafo de etapas assíncronas.
+
+    Cada etapa começa assim que suas dependências terminam, então etapas
+    independentes rodam em paralelo e a latência total se aproxima do
+    caminho crítico. Uma etapa pode cancelar outra que se tornou
+    desnecessária (o resultado da cancelada passa a ser None).
+    """
+
+    def __init__(self, name: str):
+        """
+        Inicializa o pipeline
+
+        Args:
+            name: Nome do pipeline (rótulo das métricas)
+        """
+        self.name = name
+        self.stages: Dict[str, Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        func: StageFunc,
+        depends_on: Iterable[str] = (),
+        optional: bool = False
+    ) -> "Pipeline":
+        """
+        Adiciona uma etapa (as dependências devem ter sido adicionadas antes,
+        o que impede ciclos)
+
+        Args:
+            name: Nome da etapa
+            func: Função assíncrona da etapa
+            depends_on: Etapas que precisam terminar antes desta começar
+            optional: Se True, falhas viram resultado None
+
+        Returns:
+            O próprio pipeline (para encadear chamadas)
+        """
+        if name in self.stages:
+            raise ValueError(f"Etapa duplicada: {name}")
+        depends_on = list(depends_on)
+        missing = [dep for dep in depends_on if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Etapa '{name}' depende de etapas desconhecidas: {', '.join(missing)}")
+
+        self.stages[name] = Stage(name, func, depends_on, optional)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Executa todas as etapas respeitando as dependências
+
+        Returns:
+            Resultado de cada etapa por nome (None para etapas canceladas
+            ou opcionais que falharam)
+
+        Raises:
+            Exception: Primeira falha de uma etapa obrigatória (as demais
+                etapas são canceladas)
+        """
+        run = PipelineRun(self)
+        await run.execute()
+        return {name: run.value(name) for name in self.stages}
+
+
+class PipelineRun:
+    """Execução de um `Pipeline`, repassada para cada etapa"""
+
+    def __init__(self, pipeline: Pipeline):
+        self.pipeline = pipeline
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def execute(self) -> None:
+        """Cria as tarefas de todas as etapas e aguarda o fim"""
+        for stage in self.pipeline.stages.values():
+            self._tasks[stage.name] = asyncio.ensure_future(self._run_stage(stage))
+
+        pending = set(self._tasks.values())
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+                for task in done:
+                    if not task.cancelled() and task.exception() is not None:
+                        raise task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+    async def result(self, name: str) -> Any:
+        """
+        Aguarda e retorna o resultado de uma etapa
+
+        Permite que uma etapa use o resultado de outra sem declará-la como
+        dependência (ex: aproveitar uma busca especulativa se ainda for útil).
+
+        Args:
+            name: Nome da etapa
+
+        Returns:
+            Resultado da etapa (None se cancelada ou opcional com falha)
+        """
+        task = self._tasks[name]
+        await asyncio.wait({task})
+        return self.value(name)
+
+    def task(self, name: str) -> asyncio.Task:
+        """Tarefa de uma etapa (para aguardar ou cancelar diretamente)"""
+        return self._tasks[name]
+
+    def value(self, name: str) -> Any:
+        """Resultado de uma etapa já concluída"""
+        task = self._tasks[name]
+        if task.cancelled():
+            return None
+        return task.result()
+
+    def cancel(self, name: str) -> None:
+        """
+        Cancela uma etapa que se tornou desnecessária
+
+        Args:
+            name: Nome da etapa
+        """
+        task = self._tasks[name]
+        if not task.done():
+            task.cancel()
+
+    async def _run_stage(self, stage: Stage) -> Any:
+        """Aguarda as dependências e executa a etapa"""
+        for dep in stage.depends_on:
+            await self.result(dep)
+
+        started = time.monotonic()
+        try:
+            value = await stage.func(self)
+        except asyncio.CancelledError:
+            metrics.inc("pipeline_stage_cancelled_total", pipeline=self.pipeline.name, stage=stage.name)
+            raise
+        except Exception as e:
+            if not stage.optional:
+                raise
+            logger.error(f"Erro na etapa opcional '{stage.name}': {e}")
+            metrics.inc("pipeline_stage_errors_total", pipeline=self.pipeline.name, stage=stage.name)
+            return None
+
+        metrics.observe(
+            "pipeline_stage_seconds", time.monotonic() - started,
+            pipeline=self.pipeline.name, stage=stage.name
+        )
+        return value
@@ -0,0 +1,57 @@
+"""
+Coalescência de requisições idênticas em andamento (single-flight)
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Garante no máximo uma execução em andamento por chave.
+
+    Chamadas concorrentes com a mesma chave aguardam o mesmo future; a
+    execução é protegida com `asyncio.shield`, então o cancelamento de um
+    chamador não cancela o trabalho compartilhado pelos demais.
+    """
+
+    def __init__(self):
+        """Inicializa o grupo"""
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Executa `func` ou aguarda a execução em andamento da mesma chave
+
+        Args:
+            key: Chave canônica da operação
+            func: Função que cria a corrotina a ser executada
+
+        Returns:
+            Resultado compartilhado da execução
+        """
+        future = self._inflight.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._inflight[key] = future
+            self.executions += 1
+            future.add_done_callback(lambda f: self._on_done(key, f))
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(future)
+
+    def _on_done(self, key: Hashable, future: asyncio.Future) -> None:
+        """Remove a chave ao terminar e marca a exceção como consumida"""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+        if not future.cancelled():
+            future.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,28 @@
+"""
+Configuração compartilhada dos testes
+
+Os testes rodam com o provedor de LLM simulado (sem rede nem cota) e com os
+bancos SQLite num diretório temporário. As variáveis precisam ser definidas
+antes do primeiro import de `app.config`.
+"""
+import os
+import sys
+import tempfile
+
+_DATA_DIR = tempfile.mkdtemp(prefix="factcheck-tests-")
+
+os.environ.update({
+    "LLM_PROVIDER": "fake",
+    "FAKE_LLM_LATENCY_MS": "20",
+    "FAKE_LLM_LATENCY_DISTRIBUTION": "fixed",
+    "FAKE_LLM_ERROR_RATE": "0",
+    "FAKE_LLM_QUOTA_ERROR_RATE": "0",
+    "RESULT_CACHE_ENABLED": "False",
+    "RESULT_CACHE_PATH": os.path.join(_DATA_DIR, "factcheck_cache.db"),
+    "PAGE_CACHE_PATH": os.path.join(_DATA_DIR, "pages.db"),
+    "CLAIM_STORE_PATH": os.path.join(_DATA_DIR, "claims.db"),
+    "CLAIM_VECTOR_INDEX_PATH": os.path.join(_DATA_DIR, "claim_vectors.f32"),
+    "FACTCHECK_INDEX_PATH": os.path.join(_DATA_DIR, "factchecks.db"),
+})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
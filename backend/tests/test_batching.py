@@ -0,0 +1,92 @@
+"""
+Testes do agrupamento em lotes (isolamento de contexto e prazos por item)
+"""
+import asyncio
+
+import pytest
+
+from app.utils.batching import MicroBatcher
+from app.utils.deadline import Deadline, current_deadline, deadline_scope
+
+
+def test_batch_does_not_inherit_submitter_deadline():
+    seen = []
+
+    async def handler(key, items):
+        seen.append(current_deadline())
+        await asyncio.sleep(0.05)
+        return [item * 2 for item in items]
+
+    async def submit(batcher, item, seconds):
+        with deadline_scope(Deadline(seconds)):
+            return await batcher.submit(item)
+
+    async def scenario():
+        batcher = MicroBatcher("test", handler, max_batch_size=10, max_wait_ms=20)
+        return await asyncio.gather(submit(batcher, 1, 5.0), submit(batcher, 2, 5.0))
+
+    assert asyncio.run(scenario()) == [2, 4]
+    assert seen == [None]
+
+
+def test_full_batch_runs_without_deadline():
+    seen = []
+
+    async def handler(key, items):
+        seen.append(current_deadline())
+        return items
+
+    async def submit(batcher, item):
+        with deadline_scope(Deadline(5.0)):
+            return await batcher.submit(item)
+
+    async def scenario():
+        batcher = MicroBatcher("test", handler, max_batch_size=2, max_wait_ms=1000)
+        return await asyncio.gather(submit(batcher, "a"), submit(batcher, "b"))
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+    assert seen == [None]
+
+
+def test_short_deadline_only_times_out_its_own_caller():
+    async def handler(key, items):
+        await asyncio.sleep(0.15)
+        return items
+
+    async def submit(batcher, item, seconds):
+        with deadline_scope(Deadline(seconds)):
+            return await batcher.submit(item)
+
+    async def scenario():
+        batcher = MicroBatcher("test", handler, max_batch_size=10, max_wait_ms=10)
+        return await asyncio.gather(
+            submit(batcher, "slow", 0.05),
+            submit(batcher, "patient", 2.0),
+            return_exceptions=True,
+        )
+
+    hurried, patient = asyncio.run(scenario())
+    assert isinstance(hurried, asyncio.TimeoutError)
+    assert patient == "patient"
+
+
+def test_caller_giving_up_before_flush_leaves_the_batch():
+    batches = []
+
+    async def handler(key, items):
+        batches.append(list(items))
+        return items
+
+    async def submit(batcher, item, seconds):
+        with deadline_scope(Deadline(seconds)):
+            return await batcher.submit(item)
+
+    async def scenario():
+        batcher = MicroBatcher("test", handler, max_batch_size=10, max_wait_ms=100)
+        with pytest.raises(asyncio.TimeoutError):
+            await submit(batcher, "gone", 0.02)
+        assert len(batcher) == 0
+        return await batcher.submit("kept")
+
+    assert asyncio.run(scenario()) == "kept"
+    assert batches == [["kept"]]
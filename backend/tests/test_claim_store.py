@@ -0,0 +1,71 @@
+"""
+Testes do repositório de afirmações já verificadas
+"""
+import asyncio
+
+from app.services.claim_store import ClaimStore
+
+SOURCE = {"title": "Agência Lupa", "url": "https://lupa.uol.com.br/x", "summary": "", "relevance": 0.9}
+
+
+def make_store(tmp_path, **options) -> ClaimStore:
+    return ClaimStore(
+        path=str(tmp_path / "claims.db"),
+        vector_path=str(tmp_path / "claim_vectors.f32"),
+        **options
+    )
+
+
+def claim(text: str, veracity: str = "falso", sources=None) -> dict:
+    return {
+        "text": text,
+        "veracity": veracity,
+        "confidence": 0.95,
+        "explanation": "Explicação [1]",
+        "sources": sources or [],
+    }
+
+
+def test_verdicts_are_scoped_by_language(tmp_path):
+    store = make_store(tmp_path)
+
+    async def scenario():
+        await store.save([claim("A vacina contém um chip de rastreamento")], "pt")
+        return (
+            await store.lookup_many(["A vacina contém um chip de rastreamento"], "pt"),
+            await store.lookup_many(["A vacina contém um chip de rastreamento"], "en"),
+        )
+
+    same_language, other_language = asyncio.run(scenario())
+    assert same_language[0]["veracity"] == "falso"
+    assert other_language == [None]
+
+
+def test_approximate_matches_are_scoped_by_language(tmp_path):
+    store = make_store(tmp_path, semantic_matching=True, similarity_threshold=0.5, vector_matching=True)
+    text = "O ministério da saúde confirmou que a vacina contém um chip de rastreamento"
+
+    async def scenario():
+        await store.save([claim(text, sources=[SOURCE])], "pt")
+        edited = text.replace("confirmou", "admitiu")
+        return (
+            await store.lookup_many([edited], "pt"),
+            await store.lookup_many([edited], "en"),
+        )
+
+    same_language, other_language = asyncio.run(scenario())
+    assert same_language[0] is not None
+    assert other_language == [None]
+
+
+def test_unsourced_verdict_does_not_replace_grounded_one(tmp_path):
+    store = make_store(tmp_path)
+    text = "A vacina contém um chip de rastreamento"
+
+    async def scenario():
+        await store.save([claim(text, "falso", [SOURCE])], "pt")
+        await store.save([claim(text, "verdadeiro")], "pt")
+        return await store.lookup_many([text], "pt", grounded_only=True)
+
+    result = asyncio.run(scenario())
+    assert result[0]["veracity"] == "falso"
@@ -0,0 +1,147 @@
+"""
+Testes do índice de quase-duplicatas (MinHash + LSH)
+"""
+import asyncio
+import hashlib
+import random
+import threading
+
+from app.services.dedup_index import _MAX_HASH, _MERSENNE_PRIME, NearDuplicateIndex
+
+TEXT = (
+    "o ministerio da saude confirmou hoje que a vacina contra a gripe sera "
+    "distribuida em todos os postos a partir da proxima segunda feira para "
+    "idosos gestantes e criancas menores de cinco anos"
+)
+EDITED = TEXT.replace("hoje", "nesta terca") + " compartilhe"
+
+
+def key(n: int) -> str:
+    return hashlib.sha256(str(n).encode()).hexdigest()
+
+
+def test_signature_matches_reference_arithmetic():
+    index = NearDuplicateIndex(path=None)
+    words = [f"w{random.Random(1).randrange(500)}{i % 37}" for i in range(2000)]
+    text = " ".join(words)
+    hashes = index.shingles(text)
+
+    expected = [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+        for a, b in index._perms
+    ]
+    assert list(index.signature(text)) == expected
+
+
+def test_finds_lightly_edited_text_only_in_same_namespace():
+    index = NearDuplicateIndex(path=None, threshold=0.5)
+
+    async def scenario():
+        await index.add(TEXT, key(1), "pt")
+        return (
+            await index.find(EDITED, "pt"),
+            await index.find(EDITED, "en"),
+            await index.find("texto completamente diferente sobre futebol e eleicoes", "pt"),
+        )
+
+    same, other_namespace, unrelated = asyncio.run(scenario())
+    assert same is not None and same[0] == key(1)
+    assert other_namespace is None
+    assert unrelated is None
+
+
+def test_readding_a_key_does_not_grow_buckets():
+    index = NearDuplicateIndex(path=None)
+
+    async def scenario():
+        for _ in range(5):
+            await index.add(TEXT, key(1))
+
+    asyncio.run(scenario())
+    assert len(index) == 1
+    assert all(isinstance(ids, int) for buckets in index._buckets for ids in buckets.values())
+
+
+def test_evicts_oldest_entries_when_full():
+    index = NearDuplicateIndex(path=None, max_items=20)
+
+    async def scenario():
+        for n in range(45):
+            await index.add(f"{TEXT} versao numero {n} {n * 7} {n * 13}", key(n))
+
+    asyncio.run(scenario())
+    assert len(index) == 20
+    assert all(bytes.fromhex(key(n)) not in index._ids for n in range(25))
+    assert all(bytes.fromhex(key(n)) in index._ids for n in range(25, 45))
+    # Cada entrada viva aparece uma vez por banda; as descartadas saíram dos buckets
+    ids = [
+        entry_id
+        for buckets in index._buckets
+        for bucket in buckets.values()
+        for entry_id in ([bucket] if isinstance(bucket, int) else bucket)
+    ]
+    assert sorted(ids) == sorted(list(range(20)) * index.bands)
+    assert index.query_signature(index.signature(f"{TEXT} versao numero 44 308 572"), "")[0] == key(44)
+    evicted = index.query_signature(index.signature(f"{TEXT} versao numero 3 21 39"), "")
+    assert evicted is None or evicted[0] != key(3)
+
+
+def test_disabled_index_is_a_no_op(tmp_path):
+    path = tmp_path / "signatures.db"
+    index = NearDuplicateIndex(path=str(path), enabled=False)
+
+    async def scenario():
+        await index.add(TEXT, key(1))
+        return await index.find(TEXT)
+
+    assert asyncio.run(scenario()) is None
+    assert len(index) == 0
+    assert not path.exists()
+
+
+def test_signatures_survive_restart(tmp_path):
+    path = str(tmp_path / "signatures.db")
+
+    async def scenario():
+        await NearDuplicateIndex(path=path, threshold=0.5).add(TEXT, key(1), "pt")
+        return await NearDuplicateIndex(path=path, threshold=0.5).find(EDITED, "pt")
+
+    match = asyncio.run(scenario())
+    assert match is not None and match[0] == key(1)
+
+
+def test_reload_keeps_only_the_newest_entries(tmp_path):
+    path = str(tmp_path / "signatures.db")
+
+    async def scenario():
+        index = NearDuplicateIndex(path=path, max_items=10)
+        for n in range(15):
+            await index.add(f"{TEXT} versao numero {n} {n * 7} {n * 13}", key(n))
+        reloaded = NearDuplicateIndex(path=path, max_items=10)
+        await reloaded.find(TEXT)
+        # Cheio após a carga: a próxima entrada toma o lugar da mais antiga
+        await reloaded.add(f"{TEXT} nova", key(99))
+        return reloaded
+
+    reloaded = asyncio.run(scenario())
+    assert len(reloaded) == 10
+    assert bytes.fromhex(key(5)) not in reloaded._ids
+    assert {bytes.fromhex(key(n)) for n in range(6, 15)} | {bytes.fromhex(key(99))} == set(reloaded._ids)
+
+
+def test_persisted_signatures_are_replayed_off_the_event_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "signatures.db")
+    threads = []
+    replay = NearDuplicateIndex._load
+
+    def recording_load(self):
+        threads.append(threading.current_thread())
+        replay(self)
+
+    async def scenario():
+        await NearDuplicateIndex(path=path).add(TEXT, key(1))
+        monkeypatch.setattr(NearDuplicateIndex, "_load", recording_load)
+        return await NearDuplicateIndex(path=path).find(TEXT)
+
+    assert asyncio.run(scenario())[0] == key(1)
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,75 @@
+"""
+Testes da trie de domínios (sufixo mais específico e curingas)
+"""
+import pytest
+
+from app.utils.domain_trie import DomainTrie, host_labels
+
+
+@pytest.fixture
+def trie() -> DomainTrie:
+    trie = DomainTrie()
+    trie.insert("gov.br", "high")
+    trie.insert("bbc.com", "high")
+    trie.insert("*.blogspot.com", "low")
+    trie.insert("blogspot.com", "medium")
+    trie.insert("oficial.blogspot.com", "high")
+    return trie
+
+
+def test_host_labels_normalizes_urls():
+    assert host_labels("https://User@Saude.GOV.br.:443/caminho?q=1") == ["br", "gov", "saude"]
+    assert host_labels("bbc.com") == ["com", "bbc"]
+    assert host_labels("https://notícias.com.br") == ["br", "com", "xn--notcias-9ya"]
+    assert host_labels("") == []
+
+
+@pytest.mark.parametrize("host, expected", [
+    ("gov.br", "high"),
+    ("https://www.saude.gov.br/noticia", "high"),
+    ("www.bbc.com", "high"),
+    # Só rótulo a rótulo: um sufixo textual não basta
+    ("gov.br.exemplo.com", None),
+    ("notbbc.com", None),
+])
+def test_lookup_uses_most_specific_suffix(trie, host, expected):
+    assert trie.lookup(host) == expected
+
+
+@pytest.mark.parametrize("host, expected", [
+    # O curinga cobre os sites sob o sufixo, mas não o próprio sufixo
+    ("fulano.blogspot.com", "low"),
+    ("a.b.blogspot.com", "low"),
+    ("blogspot.com", "medium"),
+    # Domínio cadastrado vence o curinga, inclusive para os subdomínios dele
+    ("oficial.blogspot.com", "high"),
+    ("www.oficial.blogspot.com", "high"),
+])
+def test_wildcards(trie, host, expected):
+    assert trie.lookup(host) == expected
+
+
+def test_wildcard_without_base_entry():
+    trie = DomainTrie()
+    trie.insert("*.github.io", "low")
+    assert trie.lookup("projeto.github.io") == "low"
+    assert trie.lookup("github.io") is None
+
+
+def test_items_and_size_round_trip(trie):
+    assert len(trie) == 5
+    assert dict(trie.items()) == {
+        "gov.br": "high",
+        "bbc.com": "high",
+        "*.blogspot.com": "low",
+        "blogspot.com": "medium",
+        "oficial.blogspot.com": "high",
+    }
+    trie.insert("bbc.com", "medium")
+    assert len(trie) == 5
+    assert trie.lookup("bbc.com") == "medium"
+
+
+def test_rejects_invalid_domain():
+    with pytest.raises(ValueError):
+        DomainTrie().insert("", "high")
@@ -0,0 +1,75 @@
+"""
+Testes do índice de checagens publicadas (importação e busca BM25)
+"""
+import sqlite3
+
+from app.services.factcheck_index import FactCheckIndex
+
+
+def record(url: str, claim: str, rating: str = "Falso", language: str = "pt") -> dict:
+    return {
+        "url": url, "claim": claim, "title": None, "rating": rating,
+        "publisher": "Agência", "published_at": None, "language": language,
+    }
+
+
+def test_add_counts_only_indexed_records(tmp_path):
+    index = FactCheckIndex(path=str(tmp_path / "factchecks.db"), enabled=True)
+    added = index.add([
+        record("https://a.org/1", "Vacina contra covid contém chip de rastreamento"),
+        # Só stopwords: nada a indexar
+        record("https://a.org/2", "é o que isso"),
+        record("https://a.org/3", "Urna eletrônica foi fraudada nas eleições"),
+    ], batch_size=2)
+
+    assert added == 2
+    assert index.stats()["factchecks"] == 2
+
+
+def test_search_ranks_matching_factcheck_first(tmp_path):
+    index = FactCheckIndex(path=str(tmp_path / "factchecks.db"), enabled=True)
+    index.add([
+        record("https://a.org/1", "Vacina contra covid contém chip de rastreamento"),
+        record("https://a.org/2", "Urna eletrônica foi fraudada nas eleições"),
+    ])
+
+    matches = index.search_sync("as vacinas têm chip?")
+    assert matches
+    assert matches[0].url == "https://a.org/1"
+
+
+def test_search_keeps_only_factchecks_in_the_content_language(tmp_path):
+    index = FactCheckIndex(path=str(tmp_path / "factchecks.db"), enabled=True)
+    index.add([
+        record("https://a.org/en", "Vacina covid chip rastreamento", language="en"),
+        record("https://a.org/br", "Vacina covid chip rastreamento", language="pt-BR"),
+        record("https://a.org/none", "Vacina covid chip rastreamento", language=None),
+    ])
+
+    urls = {match.url for match in index.search_sync("vacina covid chip", language="pt")}
+    assert urls == {"https://a.org/br", "https://a.org/none"}
+    # Sem idioma na consulta, não há filtro
+    assert len(index.search_sync("vacina covid chip")) == 3
+
+
+def test_rebuild_keeps_serving_the_old_index_until_the_swap(tmp_path):
+    path = str(tmp_path / "factchecks.db")
+    index = FactCheckIndex(path=path, enabled=True)
+    index.add([record("https://a.org/old", "Urna eletrônica foi fraudada nas eleições")])
+
+    seen_during_rebuild = []
+
+    def records():
+        yield record("https://a.org/new", "Vacina contra covid contém chip de rastreamento")
+        seen_during_rebuild.extend(match.url for match in index.search_sync("urna fraudada"))
+
+    assert index.rebuild(records()) == 1
+    assert seen_during_rebuild == ["https://a.org/old"]
+    assert index.search_sync("urna fraudada") == []
+    assert index.search_sync("vacina chip")[0].url == "https://a.org/new"
+    assert index.stats()["factchecks"] == 1
+
+    conn = sqlite3.connect(path)
+    names = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'")}
+    conn.close()
+    assert names == {"factchecks", "postings", "postings_doc", "terms", "index_stats"}
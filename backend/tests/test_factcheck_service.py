@@ -0,0 +1,82 @@
+"""
+Testes do serviço de fact-checking (streaming e prazo da requisição)
+"""
+import asyncio
+
+from app.models import FactCheckRequest
+from app.services import factcheck_service as factcheck_module
+from app.services.factcheck_service import factcheck_service
+from app.utils.deadline import current_deadline
+
+
+def test_stream_runs_inside_request_deadline(monkeypatch):
+    seen = []
+
+    # Mesmo formato de ANALYSIS_SCHEMA (o que o Gemini devolve de fato)
+    claim = {
+        "text": "A vacina contém um chip de rastreamento",
+        "veracity": "falso",
+        "confidence": 0.9,
+        "explanation": "Não há tecnologia capaz de rastrear por meio de uma injeção.",
+    }
+    analysis = {
+        "credibility_score": 0.1,
+        "summary": "Boato recorrente sobre vacinas.",
+        "claims": [claim],
+        "red_flags": ["Alegação sem fonte"],
+        "recommendations": ["Consulte agências de checagem"],
+    }
+
+    async def analyze_content_stream(content, language):
+        seen.append(current_deadline())
+        yield "claim", claim
+        yield "analysis", analysis
+
+    monkeypatch.setattr(factcheck_module.gemini_service, "analyze_content_stream", analyze_content_stream)
+    request = FactCheckRequest(
+        content="A vacina contém um chip de rastreamento segundo um vídeo viral.",
+        check_sources=False,
+        deadline_ms=5000,
+    )
+
+    async def scenario():
+        events = [event async for event in factcheck_service.check_content_stream(request)]
+        return events, current_deadline()
+
+    events, after = asyncio.run(scenario())
+    assert events[-1]["event"] == "result"
+    result = events[-1]["data"]
+    assert result["summary"] == analysis["summary"]
+    assert [c["text"] for c in result["claims"]] == [claim["text"]]
+    assert "Alegação sem fonte" in result["red_flags"]
+    assert seen and seen[0] is not None
+    assert 0 < seen[0].remaining() <= 5.0
+    assert after is None
+
+
+def test_stream_result_matches_non_streaming_result(monkeypatch):
+    monkeypatch.setattr(factcheck_module.settings, "CLAIM_STORE_ENABLED", False)
+    monkeypatch.setattr(factcheck_module.settings, "CONSISTENCY_CHECK_ENABLED", True)
+    request = FactCheckRequest(
+        content="URGENTE!!! A vacina contém um chip de rastreamento, compartilhe antes que apaguem!",
+        check_sources=False,
+    )
+
+    async def scenario():
+        response = await factcheck_service.check_content(request)
+        events = [event async for event in factcheck_service.check_content_stream(request)]
+        return response, events
+
+    response, events = asyncio.run(scenario())
+    streamed = events[-1]["data"]
+    assert events[-1]["event"] == "result"
+    assert streamed["red_flags"] == response.red_flags
+    assert any(flag.startswith("Inconsistência") for flag in response.red_flags)
+    assert streamed["credibility_score"] == response.credibility_score
+    assert [claim["text"] for claim in streamed["claims"]] == [claim.text for claim in response.claims]
+
+    # Heurísticas e inconsistências chegam em eventos red_flags antes do resultado
+    emitted = [flag for event in events if event["event"] == "red_flags" for flag in event["data"]]
+    assert set(emitted) <= set(response.red_flags)
+    assert any(flag.startswith("Inconsistência") for flag in emitted)
+    assert sum(event["event"] == "claim" for event in events) == len(response.claims)
@@ -0,0 +1,94 @@
+"""
+Testes do transporte instrumentado do pool HTTP (ocupação e erros)
+"""
+import asyncio
+import socket
+
+import httpx
+import pytest
+
+from app.services.http_pool import InstrumentedTransport, environment_proxy_mounts
+
+BODY = b"x" * 4096
+
+
+async def serve_http(reader, writer):
+    """Servidor HTTP/1.1 mínimo: responde cada requisição com um corpo fixo"""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            if not head:
+                break
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(BODY) + BODY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def make_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+    return httpx.AsyncClient(transport=InstrumentedTransport(limits))
+
+
+def test_streamed_response_counts_as_active_until_closed():
+    async def scenario():
+        server = await asyncio.start_server(serve_http, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = make_client()
+        transport = client._transport
+        try:
+            async with client.stream("GET", f"http://127.0.0.1:{port}/") as response:
+                assert transport.usage.active == 1
+                body = b"".join([chunk async for chunk in response.aiter_bytes()])
+            assert body == BODY
+            assert transport.usage.active == 0
+
+            response = await client.get(f"http://127.0.0.1:{port}/")
+            assert response.content == BODY
+            assert transport.usage.active == 0
+        finally:
+            await client.aclose()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_connection_error_is_mapped_and_released():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    async def scenario():
+        client = make_client()
+        try:
+            with pytest.raises(httpx.ConnectError):
+                await client.get(f"http://127.0.0.1:{port}/")
+            assert client._transport.usage.active == 0
+        finally:
+            await client.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_environment_proxies_are_mounted(monkeypatch):
+    for name in ("http_proxy", "https_proxy", "all_proxy", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.upper(), raising=False)
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.interno:3128")
+    monkeypatch.setenv("NO_PROXY", "localhost,.interno.org,10.0.0.1")
+
+    mounts = environment_proxy_mounts(lambda proxy: proxy)
+    assert mounts == {
+        "https://": "http://proxy.interno:3128",
+        "all://localhost": None,
+        "all://*interno.org": None,
+        "all://10.0.0.1": None,
+    }
+
+    monkeypatch.setenv("NO_PROXY", "*")
+    assert environment_proxy_mounts(lambda proxy: proxy) == {}
@@ -0,0 +1,53 @@
+"""
+Testes do parser tolerante de JSON (reparo de respostas truncadas)
+"""
+import json
+
+import pytest
+
+from app.utils.json_parser import LLMResponseError, parse_llm_json, repair_json
+
+
+@pytest.mark.parametrize("truncated, expected", [
+    # Valor string cortado: a chave incompleta sai inteira
+    ('{"a": 1, "b": "tru', {"a": 1}),
+    # Número no fim do texto pode estar cortado ("3" de "30")
+    ('{"a": [1, 2, 3', {"a": [1, 2]}),
+    # Literal cortado dentro de objeto aninhado
+    ('{"a": {"b": true, "c": nul', {"a": {"b": True}}),
+    # Chave sem valor e vírgula pendente
+    ('{"a": 1, "b":', {"a": 1}),
+    ('{"a": 1,', {"a": 1}),
+    # Aspas escapadas e chaves dentro de strings não contam como estrutura
+    ('{"a": "q\\"}", "b": [', {"a": 'q"}', "b": []}),
+    ('[{"x": "y"}, {"x": "z', [{"x": "y"}, {}]),
+])
+def test_repair_truncated_json(truncated, expected):
+    assert json.loads(repair_json(truncated)) == expected
+
+
+def test_repair_keeps_complete_json():
+    text = '{"a": "ok", "b": [1, {"c": null}]}'
+    assert repair_json(text) == text
+
+
+def test_parse_strips_fences_and_prose():
+    assert parse_llm_json('```json\n{"a": 1}\n```', dict) == ({"a": 1}, False)
+    assert parse_llm_json('Aqui está o resultado: [1, 2] fim', list) == ([1, 2], False)
+
+
+def test_parse_reports_repair():
+    assert parse_llm_json('Resultado: {"claims": [{"text": "x"}, {"te', dict) == (
+        {"claims": [{"text": "x"}, {}]},
+        True,
+    )
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", dict),
+    ("sem json aqui", dict),
+    ('{"a": 1}', list),
+])
+def test_parse_rejects_unusable_responses(text, expected):
+    with pytest.raises(LLMResponseError):
+        parse_llm_json(text, expected)
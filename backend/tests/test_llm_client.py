@@ -0,0 +1,123 @@
+"""
+Testes do cliente de LLM (chamadas sem bloquear o event loop e circuit breaker)
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.services.llm_client import LLMClient, LLMUnavailableError
+from app.services.llm_providers import FakeProvider, LLMProvider
+from app.services.llm_scheduler import LLMScheduler
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.utils.deadline import Deadline, deadline_scope
+
+
+def make_client(**provider_options) -> LLMClient:
+    provider = FakeProvider(latency_ms=100, latency_distribution="fixed", **provider_options)
+    return LLMClient(provider=provider, scheduler=LLMScheduler(max_concurrency=8))
+
+
+def test_concurrent_calls_overlap():
+    client = make_client()
+
+    async def scenario():
+        started = time.monotonic()
+        await asyncio.gather(*[client.generate(f"prompt {i}") for i in range(5)])
+        return time.monotonic() - started
+
+    # Cinco chamadas de 100 ms em paralelo, não em série
+    assert asyncio.run(scenario()) < 0.3
+
+
+def test_event_loop_stays_responsive_during_call():
+    client = make_client()
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        await client.generate("prompt")
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(scenario()) >= 5
+
+
+def half_open_client(**provider_options) -> LLMClient:
+    """Cliente com o circuito já aberto e pronto para a chamada de teste"""
+    client = make_client(**provider_options)
+    client.breaker = CircuitBreaker("test", min_calls=1, reset_timeout=0.05)
+    client.breaker.record_failure()
+    assert client.breaker.state == OPEN
+    time.sleep(0.06)
+    assert client.breaker.state == HALF_OPEN
+    return client
+
+
+def test_half_open_allows_single_probe():
+    client = half_open_client()
+
+    async def scenario():
+        probe = asyncio.ensure_future(client.generate("probe"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(LLMUnavailableError):
+            await client.generate("rejected")
+        return await probe
+
+    assert asyncio.run(scenario())
+    assert client.breaker.state == CLOSED
+
+
+def test_failed_probe_reopens_circuit():
+    client = half_open_client(error_rate=1.0)
+
+    with pytest.raises(LLMUnavailableError):
+        asyncio.run(client.generate("probe"))
+    assert client.breaker.state == OPEN
+
+
+def test_cancelled_probe_releases_circuit():
+    client = half_open_client()
+
+    async def scenario():
+        probe = asyncio.ensure_future(client.generate("probe"))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        # A vaga de teste voltou: a próxima chamada passa e fecha o circuito
+        return await client.generate("next")
+
+    assert asyncio.run(scenario())
+    assert client.breaker.state == CLOSED
+
+
+def test_stream_deadline_does_not_count_as_service_failure():
+    client = half_open_client()
+
+    async def scenario():
+        with deadline_scope(Deadline(0.03)):
+            with pytest.raises(LLMUnavailableError):
+                async for _ in client.stream("prompt"):
+                    pass
+
+    asyncio.run(scenario())
+    # A chamada de teste foi devolvida sem reabrir o circuito
+    assert client.breaker.state == HALF_OPEN
+    assert not client.breaker._probe_in_flight
+
+
+def test_incomplete_provider_fails_on_creation():
+    class NoStream(LLMProvider):
+        async def generate(self, model_name, contents, generation_config=None):
+            return None
+
+    with pytest.raises(TypeError):
+        NoStream()
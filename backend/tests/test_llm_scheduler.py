@@ -0,0 +1,110 @@
+"""
+Testes do escalonador de chamadas ao LLM (prioridades e baldes de fichas)
+"""
+import asyncio
+
+import pytest
+
+from app.services import llm_scheduler as scheduler_module
+from app.services.llm_scheduler import LLMOverloadedError, LLMScheduler, Priority, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(scheduler_module.time, "monotonic", fake)
+    return fake
+
+
+def test_bucket_refills_continuously(clock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+
+    clock.now += 30
+    assert bucket.wait_time(30) == 0.0
+    assert bucket.wait_time(31) == pytest.approx(1.0)
+
+    clock.now += 3600
+    bucket.wait_time(1)
+    assert bucket.tokens == 60  # nunca passa da capacidade
+
+
+def test_bucket_refund_corrects_estimate(clock):
+    bucket = TokenBucket(per_minute=1000)
+    bucket.take(800)
+    bucket.refund(800 - 300)  # a chamada consumiu 300, não 800
+    assert bucket.tokens == pytest.approx(700)
+
+    bucket.refund(10_000)
+    assert bucket.tokens == 1000
+
+
+def test_oversized_request_waits_for_full_bucket(clock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(30)
+    assert bucket.wait_time(500) == pytest.approx(30.0)
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(per_minute=0)
+    bucket.take(10**9)
+    assert bucket.unlimited and bucket.wait_time(10**9) == 0.0
+
+
+def test_higher_priority_is_served_first():
+    scheduler = LLMScheduler(max_concurrency=1, requests_per_minute=0, tokens_per_minute=0)
+    order = []
+
+    async def call(name: str, priority: Priority):
+        async with scheduler.slot(10, priority):
+            order.append(name)
+
+    async def scenario():
+        async with scheduler.slot(10, Priority.DEFAULT):
+            waiting = [
+                asyncio.ensure_future(call("batch", Priority.BATCH)),
+                asyncio.ensure_future(call("default", Priority.DEFAULT)),
+                asyncio.ensure_future(call("interactive", Priority.INTERACTIVE)),
+            ]
+            await asyncio.sleep(0)
+        await asyncio.gather(*waiting)
+
+    asyncio.run(scenario())
+    assert order == ["interactive", "default", "batch"]
+
+
+def test_request_rate_limit_delays_dispatch():
+    # 600/min = uma ficha a cada 0,1 s depois de esvaziar o balde
+    scheduler = LLMScheduler(max_concurrency=10, requests_per_minute=600, tokens_per_minute=0)
+    scheduler.requests.take(600)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        async with scheduler.slot(10):
+            return loop.time() - started
+
+    assert 0.05 < asyncio.run(scenario()) < 0.5
+
+
+def test_full_queue_is_rejected():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue_size=1, requests_per_minute=0, tokens_per_minute=0)
+
+    async def scenario():
+        async with scheduler.slot(10):
+            queued = asyncio.ensure_future(scheduler._acquire(10, Priority.DEFAULT))
+            await asyncio.sleep(0)
+            with pytest.raises(LLMOverloadedError):
+                await scheduler._acquire(10, Priority.DEFAULT)
+            queued.cancel()
+
+    asyncio.run(scenario())
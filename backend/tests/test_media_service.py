@@ -0,0 +1,23 @@
+"""
+Testes do serviço de mídia (propagação dos erros de capacidade do LLM)
+"""
+import asyncio
+
+import pytest
+
+from app.services.llm_client import LLMUnavailableError
+from app.services.media_service import MediaService
+
+
+def test_unavailable_llm_propagates_from_image_analysis(monkeypatch):
+    service = MediaService()
+    service.vision_model = "vision"
+
+    async def unavailable(image_path, priority=None):
+        raise LLMUnavailableError("circuito aberto", retry_after=7)
+
+    monkeypatch.setattr(service, "_analyze_image_with_gemini", unavailable)
+
+    with pytest.raises(LLMUnavailableError) as error:
+        asyncio.run(service.analyze_image("/tmp/imagem.png"))
+    assert error.value.retry_after == 7
@@ -0,0 +1,60 @@
+"""
+Testes do cache de páginas (TTL, revalidação condicional e cópia stale)
+"""
+import asyncio
+
+import httpx
+
+from app.services.html_extractor import ExtractedPage
+from app.services.page_cache import PageCache
+from app.utils.metrics import metrics
+
+URL = "https://example.org/noticia"
+
+
+class Download:
+    """Download simulado: devolve uma resposta por chamada e guarda os cabeçalhos"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.headers = []
+
+    async def __call__(self, url, headers):
+        self.headers.append(headers)
+        response = self.responses[min(len(self.headers), len(self.responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        status, page = response
+        return httpx.Response(status, headers={"etag": '"v1"'}, request=httpx.Request("GET", url)), page
+
+
+def make_cache(tmp_path, ttl: float) -> PageCache:
+    return PageCache(path=str(tmp_path / "pages.db"), ttl=ttl, max_age=3600, max_items=10, enabled=True)
+
+
+def test_page_with_validators_is_served_without_request_within_ttl(tmp_path):
+    cache = make_cache(tmp_path, ttl=60)
+    download = Download((200, ExtractedPage(url=URL, text="corpo")))
+
+    async def scenario():
+        await cache.get_or_fetch(URL, download)
+        return await cache.get_or_fetch(URL, download)
+
+    page = asyncio.run(scenario())
+    assert page.text == "corpo"
+    assert len(download.headers) == 1
+
+
+def test_failed_revalidation_serves_stale_copy(tmp_path):
+    cache = make_cache(tmp_path, ttl=0)
+    download = Download((200, ExtractedPage(url=URL, text="corpo")), httpx.ConnectError("sem rede"))
+    stale_before = metrics.get_counter("page_cache_requests_total", result="stale")
+
+    async def scenario():
+        await cache.get_or_fetch(URL, download)
+        return await cache.get_or_fetch(URL, download)
+
+    page = asyncio.run(scenario())
+    assert page.text == "corpo"
+    assert download.headers[1] == {"If-None-Match": '"v1"'}
+    assert metrics.get_counter("page_cache_requests_total", result="stale") == stale_before + 1
@@ -0,0 +1,117 @@
+"""
+Testes do executor de pipelines em DAG (paralelismo e cancelamento)
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.utils.pipeline import Pipeline
+
+
+def sleeper(seconds, value, log=None, name=None):
+    async def stage(run):
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append(name)
+            raise
+        return value
+    return stage
+
+
+def test_independent_stages_run_in_parallel():
+    async def total(run):
+        return run.value("a") + run.value("b")
+
+    pipeline = (
+        Pipeline("test")
+        .add("a", sleeper(0.1, 1))
+        .add("b", sleeper(0.1, 2))
+        .add("total", total, depends_on=["a", "b"])
+    )
+
+    started = time.monotonic()
+    results = asyncio.run(pipeline.run())
+    assert results == {"a": 1, "b": 2, "total": 3}
+    assert time.monotonic() - started < 0.18
+
+
+def test_stage_can_cancel_speculative_stage():
+    cancelled = []
+
+    async def decide(run):
+        run.cancel("speculative")
+        return await run.result("speculative")
+
+    pipeline = (
+        Pipeline("test")
+        .add("speculative", sleeper(1.0, "late", cancelled, "speculative"))
+        .add("decide", decide)
+        .add("after", sleeper(0, "ok"), depends_on=["speculative"])
+    )
+
+    started = time.monotonic()
+    results = asyncio.run(pipeline.run())
+    assert results == {"speculative": None, "decide": None, "after": "ok"}
+    assert cancelled == ["speculative"]
+    assert time.monotonic() - started < 0.5
+
+
+def test_required_failure_cancels_other_stages():
+    cancelled = []
+
+    async def broken(run):
+        await asyncio.sleep(0.01)
+        raise ValueError("falhou")
+
+    pipeline = (
+        Pipeline("test")
+        .add("slow", sleeper(1.0, "x", cancelled, "slow"))
+        .add("broken", broken)
+    )
+
+    with pytest.raises(ValueError, match="falhou"):
+        asyncio.run(pipeline.run())
+    assert cancelled == ["slow"]
+
+
+def test_optional_failure_becomes_none():
+    async def broken(run):
+        raise ValueError("falhou")
+
+    pipeline = (
+        Pipeline("test")
+        .add("extra", broken, optional=True)
+        .add("main", sleeper(0, "ok"), depends_on=["extra"])
+    )
+
+    assert asyncio.run(pipeline.run()) == {"extra": None, "main": "ok"}
+
+
+def test_cancelling_the_run_cancels_every_stage():
+    cancelled = []
+    pipeline = (
+        Pipeline("test")
+        .add("a", sleeper(1.0, 1, cancelled, "a"))
+        .add("b", sleeper(1.0, 2, cancelled, "b"))
+    )
+
+    async def scenario():
+        task = asyncio.ensure_future(pipeline.run())
+        await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert sorted(cancelled) == ["a", "b"]
+
+
+def test_rejects_unknown_or_duplicate_stages():
+    pipeline = Pipeline("test").add("a", sleeper(0, 1))
+    with pytest.raises(ValueError):
+        pipeline.add("a", sleeper(0, 1))
+    with pytest.raises(ValueError):
+        pipeline.add("b", sleeper(0, 1), depends_on=["missing"])
@@ -0,0 +1,115 @@
+"""
+Testes do cache de buscas (stale-while-revalidate e cache negativo)
+"""
+import asyncio
+
+from app.models import Source
+from app.services.search_cache import SearchCache
+
+
+def source(title: str) -> Source:
+    return Source(title=title, url=f"https://example.org/{title}", credibility="alta", relevance=0.9)
+
+
+class Provider:
+    """Provedor simulado que devolve uma resposta por chamada"""
+
+    def __init__(self, *responses, delay: float = 0.0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        response = self.responses[min(self.calls, len(self.responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def make_cache(**options) -> SearchCache:
+    settings = {"ttl": 0.05, "stale_ttl": 1.0, "negative_ttl": 0.05, "max_items": 100, "enabled": True}
+    settings.update(options)
+    return SearchCache(**settings)
+
+
+def test_fresh_entry_is_served_without_calling_provider():
+    cache = make_cache(ttl=10)
+    fetch = Provider([source("a")])
+
+    async def scenario():
+        first = await cache.get_or_fetch("p", "Vacina  causa", "pt", 5, fetch)
+        second = await cache.get_or_fetch("p", "vacina causa", "pt", 5, fetch)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second
+    assert fetch.calls == 1
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    cache = make_cache()
+    fetch = Provider([source("old")], [source("new")], delay=0.02)
+
+    async def scenario():
+        await cache.get_or_fetch("p", "q", "pt", 5, fetch)
+        await asyncio.sleep(0.06)
+        # Velho: volta na hora, com uma única atualização em segundo plano
+        stale = await asyncio.gather(*[cache.get_or_fetch("p", "q", "pt", 5, fetch) for _ in range(3)])
+        await asyncio.sleep(0.05)
+        fresh = await cache.get_or_fetch("p", "q", "pt", 5, fetch)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(scenario())
+    assert all(result[0].title == "old" for result in stale)
+    assert fresh[0].title == "new"
+    assert fetch.calls == 2
+
+
+def test_failed_refresh_keeps_stale_entry():
+    cache = make_cache()
+    fetch = Provider([source("old")], RuntimeError("cota"))
+
+    async def scenario():
+        await cache.get_or_fetch("p", "q", "pt", 5, fetch)
+        await asyncio.sleep(0.06)
+        await cache.get_or_fetch("p", "q", "pt", 5, fetch)
+        await asyncio.sleep(0.01)
+        return await cache.get_or_fetch("p", "q", "pt", 5, fetch)
+
+    assert asyncio.run(scenario())[0].title == "old"
+
+
+def test_errors_and_empty_results_are_cached_briefly():
+    cache = make_cache()
+    fetch = Provider(RuntimeError("fora do ar"), [], [source("a")])
+
+    async def scenario():
+        failed = await cache.get_or_fetch("p", "q", "pt", 5, fetch)
+        repeated = await cache.get_or_fetch("p", "q", "pt", 5, fetch)
+        calls_while_negative = fetch.calls
+        await asyncio.sleep(0.06)
+        empty = await cache.get_or_fetch("p", "q", "pt", 5, fetch)
+        await asyncio.sleep(0.06)
+        # Entrada negativa expirada não é servida como velha: busca de novo
+        found = await cache.get_or_fetch("p", "q", "pt", 5, fetch)
+        return failed, repeated, calls_while_negative, empty, found
+
+    failed, repeated, calls_while_negative, empty, found = asyncio.run(scenario())
+    assert failed == repeated == empty == []
+    assert calls_while_negative == 1
+    assert [s.title for s in found] == ["a"]
+    assert fetch.calls == 3
+
+
+def test_larger_request_is_not_served_from_smaller_entry():
+    cache = make_cache(ttl=10)
+    fetch = Provider([source("a"), source("b")], [source("a"), source("b"), source("c")])
+
+    async def scenario():
+        await cache.get_or_fetch("p", "q", "pt", 2, fetch)
+        return await cache.get_or_fetch("p", "q", "pt", 3, fetch)
+
+    assert len(asyncio.run(scenario())) == 3
+    assert fetch.calls == 2
@@ -0,0 +1,14 @@
+"""
+Testes dos provedores de busca (interface)
+"""
+import pytest
+
+from app.services.search_providers import SearchProvider
+
+
+def test_incomplete_provider_fails_on_creation():
+    class NoSearch(SearchProvider):
+        name = "incompleto"
+
+    with pytest.raises(TypeError):
+        NoSearch()
@@ -0,0 +1,95 @@
+"""
+Testes do índice vetorial de afirmações (busca exata, IVF e persistência)
+"""
+import asyncio
+import hashlib
+
+import numpy as np
+import pytest
+
+from app.services.embeddings import EmbeddingBackend, HashingEmbedder
+from app.services.vector_index import VectorIndex
+
+CLAIMS = [
+    "A vacina contra covid contém um chip de rastreamento",
+    "As urnas eletrônicas foram fraudadas nas eleições de 2022",
+    "Beber água com limão cura o câncer",
+]
+
+
+def key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_index(tmp_path=None, embedder=None, **options) -> VectorIndex:
+    options.setdefault("ivf_min_vectors", 10 ** 9)
+    options.setdefault("threshold", 0.5)
+    return VectorIndex(
+        embedder or HashingEmbedder(dim=256),
+        path=str(tmp_path / "vectors.f32") if tmp_path else None,
+        db_path=str(tmp_path / "claims.db") if tmp_path else None,
+        **options
+    )
+
+
+def test_embedding_backend_is_abstract():
+    with pytest.raises(TypeError):
+        EmbeddingBackend()
+
+    vectors = HashingEmbedder(dim=64).embed(["vacina tem chip", ""])
+    assert vectors.shape == (2, 64)
+    assert np.linalg.norm(vectors[0]) == pytest.approx(1.0, abs=1e-5)
+    assert not vectors[1].any()
+
+
+def test_brute_force_matches_paraphrase_within_namespace():
+    index = make_index()
+
+    async def scenario():
+        await index.add_many([(key(text), text) for text in CLAIMS], "pt")
+        return (
+            await index.search_many(["chip nas vacinas contra a covid", "o céu é verde"], "pt"),
+            await index.search_many(["chip nas vacinas contra a covid"], "en"),
+        )
+
+    same_language, other_language = asyncio.run(scenario())
+    assert same_language[0][0] == key(CLAIMS[0])
+    assert same_language[1] is None
+    assert other_language == [None]
+
+
+def test_ivf_finds_the_same_entries_as_brute_force():
+    index = make_index(nprobe=4)
+    texts = [f"afirmação número {i} sobre o tema {i * 7919 % 1000} e o assunto {i * 104729 % 997}" for i in range(300)]
+
+    async def scenario():
+        await index.add_many([(key(text), text) for text in texts], "pt")
+        await asyncio.to_thread(index.train)
+        # Entradas depois do treino vão para as listas extras
+        await index.add_many([(key(text), text) for text in CLAIMS], "pt")
+        return await index.search_many(texts[:20] + CLAIMS, "pt")
+
+    matches = asyncio.run(scenario())
+    assert index._centroids is not None
+    assert [match[0] for match in matches] == [key(text) for text in texts[:20] + CLAIMS]
+
+
+def test_index_persists_and_resets_when_backend_changes(tmp_path):
+    async def add():
+        index = make_index(tmp_path)
+        await index.add_many([(key(text), text) for text in CLAIMS], "pt")
+
+    async def search(embedder=None):
+        index = make_index(tmp_path, embedder)
+        matches = await index.search_many(["chip nas vacinas contra a covid"], "pt")
+        return len(index), matches
+
+    asyncio.run(add())
+    count, matches = asyncio.run(search())
+    assert count == len(CLAIMS)
+    assert matches[0][0] == key(CLAIMS[0])
+
+    # Vetores de outro modelo não são comparáveis: o índice recomeça vazio
+    count, matches = asyncio.run(search(HashingEmbedder(dim=128)))
+    assert count == 0
+    assert matches == [None]
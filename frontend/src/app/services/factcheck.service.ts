@@ -1,5 +1,5 @@
 import { Injectable } from '@angular/core';
-import { HttpClient, HttpHeaders } from '@angular/common/http';
+import { HttpClient, HttpHeaders, HttpDownloadProgressEvent, HttpEventType } from '@angular/common/http';
 import { Observable } from 'rxjs';
 
 export interface FactCheckRequest {
@@ -7,6 +7,7 @@ export interface FactCheckRequest {
   content_type: 'text' | 'url' | 'image' | 'video';
   check_sources?: boolean;
   language?: string;
+  deadline_ms?: number;
 }
 
 export interface FactCheckResponse {
@@ -20,6 +21,16 @@ export interface FactCheckResponse {
   red_flags: string[];
   timestamp: string;
   processing_time: number;
+  cached?: boolean;
+  cache_age_seconds?: number | null;
+  cache_similarity?: number | null;
+  degraded?: boolean;
+  degraded_stages?: string[];
+}
+
+export interface FactCheckStreamEvent {
+  event: 'red_flags' | 'claim' | 'claim_verified' | 'source' | 'result' | 'error';
+  data: any;
 }
 
 export interface Claim {
@@ -62,6 +73,52 @@ export class FactCheckService {
     );
   }
 
+  /**
+   * Verificação com resultados progressivos (Server-Sent Events).
+   * Emite red flags, afirmações e fontes conforme chegam e, por último, o resultado completo.
+   */
+  checkFactsStream(request: FactCheckRequest): Observable<FactCheckStreamEvent> {
+    return new Observable<FactCheckStreamEvent>(subscriber => {
+      let consumed = 0;
+
+      const emitEvents = (text: string, final: boolean) => {
+        const pending = text.slice(consumed);
+        const blocks = pending.split('\n\n');
+        const complete = final ? blocks : blocks.slice(0, -1);
+
+        for (const block of complete) {
+          consumed += block.length + 2;
+          const eventLine = block.split('\n').find(line => line.startsWith('event: '));
+          const dataLine = block.split('\n').find(line => line.startsWith('data: '));
+          if (eventLine && dataLine) {
+            subscriber.next({
+              event: eventLine.slice(7) as FactCheckStreamEvent['event'],
+              data: JSON.parse(dataLine.slice(6))
+            });
+          }
+        }
+      };
+
+      const subscription = this.http.post(`${this.apiUrl}/factcheck/stream`, request, {
+        observe: 'events',
+        reportProgress: true,
+        responseType: 'text'
+      }).subscribe({
+        next: event => {
+          if (event.type === HttpEventType.DownloadProgress) {
+            emitEvents((event as HttpDownloadProgressEvent).partialText ?? '', false);
+          } else if (event.type === HttpEventType.Response) {
+            emitEvents(event.body ?? '', true);
+          }
+        },
+        error: err => subscriber.error(err),
+        complete: () => subscriber.complete()
+      });
+
+      return () => subscription.unsubscribe();
+    });
+  }
+
   uploadFile(file: File, checkSources: boolean = false, language: string = 'pt'): Observable<FactCheckResponse> {
     const formData = new FormData();
     formData.append('file', file);